@@ -3,16 +3,33 @@
 # ============================================
 import streamlit as st
 import pandas as pd
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 from components.whats_new import show_whats_new, show_version_badge
-from config.settings import ENABLE_WHATS_NEW, ENABLE_VERSION_BADGE
+from config.settings import (ENABLE_WHATS_NEW, ENABLE_VERSION_BADGE, ALLOWED_FILE_TYPES, DATA_FILE_TYPES,
+                             ENABLE_DTYPE_COMPACTION, MAX_FILE_SIZE_MB, LOAD_ROW_LIMIT, LOAD_ROW_STEP,
+                             ENABLE_DISK_DATASETS, MAX_DISK_FILE_SIZE_MB, DISK_FILE_TYPES,
+                             DISK_WORKING_ROWS, INGEST_POLL_SECONDS, SOURCE_FILE_COLUMN, SHOW_MEMORY_STATUS)
 from styles.custom_css import apply_custom_css
 from components.logo import display_logo
 from components.header import display_header
 from components.footer import display_footer
+from components.memory_status import display_memory_status, watch_idle_session
+from utils.data_loader import UploadInspection, detect_file_type
+from utils.ingestion import submit_job, ingest_upload, ingest_files
+from utils.dataset_history import DatasetHistory
+from utils.memory_governor import memory_governor, estimate_load_bytes, estimate_disk_load_bytes
+from utils.session_spill import wake_session
+from utils.dataset_profile import get_profile
+from utils.operations import apply_operation, describe_operation, export_log, load_log
 from pages import (data_explorer, data_cleaning, data_insights, 
                    visualizations, advanced_analytics, data_transformation,
                    outlier_detection, time_series_analysis, changelog)
 
+# Copy-on-write lets the working frame and its history share every column an edit did not touch
+# (it is always on from pandas 3)
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
 # Page configuration
 st.set_page_config(
     page_title="PrePify Pro Dashboard",
@@ -34,7 +51,107 @@ if 'original_df' not in st.session_state:
 if 'data_filtered' not in st.session_state:
     st.session_state.data_filtered = False
 if 'cleaning_history' not in st.session_state:
-    st.session_state.cleaning_history = []
+    st.session_state.cleaning_history = DatasetHistory()
+if 'compaction_report' not in st.session_state:
+    st.session_state.compaction_report = None
+if 'dataset_ref' not in st.session_state:
+    st.session_state.dataset_ref = None
+if 'dataset' not in st.session_state:
+    st.session_state.dataset = None
+if 'schema_report' not in st.session_state:
+    st.session_state.schema_report = None
+if 'ingest_job' not in st.session_state:
+    st.session_state.ingest_job = None
+if 'export_job' not in st.session_state:
+    st.session_state.export_job = None
+if 'upload_inspection' not in st.session_state:
+    st.session_state.upload_inspection = None
+if 'ingest_error' not in st.session_state:
+    st.session_state.ingest_error = None
+if 'session_spill' not in st.session_state:
+    st.session_state.session_spill = None
+if 'memory_usage' not in st.session_state:
+    # Accounted for in the server-wide memory budget until Streamlit drops this session
+    ctx = get_script_run_ctx()
+    st.session_state.memory_usage = memory_governor.register(ctx.session_id if ctx is not None else None)
+st.session_state.memory_usage.touch()
+
+# Reload the datasets spilled to disk while this session was idle
+if st.session_state.session_spill is not None:
+    with st.spinner('Restoring your dataset...'):
+        wake_session(st.session_state)
+
+def choose_storage(file_size_mb, file_type):
+    """Whether an upload is kept on disk: forced beyond the in-memory limit, otherwise the user's choice"""
+    disk_capable = ENABLE_DISK_DATASETS and file_type in DISK_FILE_TYPES
+    if file_size_mb > MAX_FILE_SIZE_MB:
+        if disk_capable and file_size_mb <= MAX_DISK_FILE_SIZE_MB:
+            st.info(f"💾 File size ({file_size_mb:.1f} MB) exceeds the {MAX_FILE_SIZE_MB} MB in-memory limit, "
+                    f"so it will be kept on disk and analyzed in windows")
+            return True
+        limit_mb = MAX_DISK_FILE_SIZE_MB if disk_capable else MAX_FILE_SIZE_MB
+        raise ValueError(f"File size ({file_size_mb:.1f} MB) exceeds {limit_mb} MB limit")
+    if disk_capable:
+        return st.checkbox(
+            "💾 Keep dataset on disk",
+            help="Analyze column and row windows of the file instead of loading all of it into memory"
+        )
+    return False
+
+@st.fragment(run_every=INGEST_POLL_SECONDS)
+def show_ingest_job():
+    """Poll the background load of this session and show its progress"""
+    job = st.session_state.ingest_job
+    if job.finished:
+        # Rerun the whole script so the finished job is swapped in
+        st.rerun()
+    
+    st.markdown(f"### ⏳ Loading {job.name}")
+    if job.rows_read:
+        st.progress(job.progress, text=f"{job.stage}: {job.rows_read:,} rows ({job.progress:.0%}) · {job.elapsed:.0f}s")
+    else:
+        st.progress(job.progress, text=f"{job.stage}... · {job.elapsed:.0f}s")
+    if job.preview is not None:
+        st.caption(f"👀 Preview of the first {len(job.preview)} rows while the rest loads")
+        st.dataframe(job.preview, use_container_width=True)
+    if st.button("✖ Cancel Loading"):
+        job.cancel()
+        st.info("Cancelling...")
+
+# Swap in the result of a finished background load
+job = st.session_state.ingest_job
+if job is not None and job.finished:
+    st.session_state.ingest_job = None
+    if job.status == 'done':
+        # Keep the parsed frame as the untouched original and work on a copy-on-write view of it
+        st.session_state.dataset = job.result['dataset']
+        # Identical uploads from other sessions share one read-only copy of the parsed data
+        st.session_state.dataset_ref = job.result['dataset_ref']
+        st.session_state.compaction_report = job.result['compaction_report']
+        st.session_state.schema_report = job.result['schema_report']
+        st.session_state.original_df = job.result['df']
+        st.session_state.df = job.result['df'].copy(deep=False)
+        st.session_state.cleaning_history.clear(base=job.result['df'])
+        # The loader holds its own handle on the upload it read
+        st.session_state.upload_inspection = None
+        # The loaded frames are measured below in place of the reservation
+        memory_governor.release(st.session_state.memory_usage)
+        # The session state now holds the only references to the loaded data
+        job.result = None
+        st.toast(f"✓ Successfully loaded: {job.name}")
+    elif job.status == 'failed':
+        st.session_state.ingest_error = str(job.error)
+    else:
+        st.toast(f"Loading {job.name} was cancelled")
+
+# Report what this session holds to the server-wide memory account
+st.session_state.memory_usage.track(
+    [st.session_state.df, st.session_state.original_df, st.session_state.cleaning_history.base],
+    st.session_state.cleaning_history
+)
+if SHOW_MEMORY_STATUS:
+    display_memory_status(st.session_state.memory_usage)
+watch_idle_session()
 
 # Display logo and header
 display_logo()
@@ -55,41 +172,163 @@ if st.session_state.df is None:
     with col2:
         st.markdown('<div class="upload-card">', unsafe_allow_html=True)
         st.markdown("### 📁 Upload Your Dataset")
-        st.markdown("Supports CSV, Excel (.xlsx, .xls), and JSON files")
+        st.markdown("Supports CSV, Excel (.xlsx, .xls), JSON, JSON Lines, Parquet, Feather and Arrow IPC files, "
+                    "optionally compressed as .gz, .bz2, .zst or .zip")
         
-        uploaded_file = st.file_uploader(
+        uploaded_files = st.file_uploader(
             "", 
-            type=['csv', 'xlsx', 'xls', 'json'], 
+            type=ALLOWED_FILE_TYPES, 
+            accept_multiple_files=True,
             label_visibility="collapsed"
         )
+        # A single file gets the full load options, several files are combined into one dataset
+        uploaded_file = uploaded_files[0] if len(uploaded_files) == 1 else None
+        combine_files = len(uploaded_files) > 1
         
-        # File size limit warning
+        compact_on_load = st.checkbox(
+            "🗜️ Optimize memory on load",
+            value=ENABLE_DTYPE_COMPACTION,
+            help="Downcast numeric columns and store low-cardinality text columns as categories"
+        )
+        
+        # File size limits - files too large for memory can still be explored from disk
+        use_disk = False
+        if combine_files:
+            total_size_mb = sum(f.size for f in uploaded_files) / (1024 * 1024)
+            if total_size_mb > MAX_FILE_SIZE_MB:
+                st.error(f"⚠️ Combined size ({total_size_mb:.1f} MB) exceeds {MAX_FILE_SIZE_MB} MB limit")
+                combine_files = False
+            elif any(detect_file_type(f.name)[1] == 'zip' for f in uploaded_files):
+                st.error("⚠️ Zip archives can only be loaded one at a time")
+                combine_files = False
         if uploaded_file is not None:
-            file_size_mb = uploaded_file.size / (1024 * 1024)
-            if file_size_mb > 200:
-                st.error(f"⚠️ File size ({file_size_mb:.1f} MB) exceeds 200 MB limit")
-                uploaded_file = None
+            inner_type, upload_compression = detect_file_type(uploaded_file.name)
+            # Zip archives are checked once a member is picked
+            if upload_compression != 'zip':
+                try:
+                    use_disk = choose_storage(uploaded_file.size / (1024 * 1024), inner_type)
+                except ValueError as e:
+                    st.error(f"⚠️ {e}")
+                    uploaded_file = None
         
         st.markdown('</div>', unsafe_allow_html=True)
         
-        if uploaded_file is not None:
+        if st.session_state.ingest_error is not None:
+            st.error(f"❌ Error loading file: {st.session_state.ingest_error}")
+            st.info("💡 Make sure your file is properly formatted")
+        
+        if st.session_state.ingest_job is not None:
+            show_ingest_job()
+        elif combine_files:
+            st.markdown(f"**{len(uploaded_files)} files** will be parsed in parallel and stacked into one dataset")
+            add_source_column = st.checkbox(
+                "🏷️ Add source file column",
+                value=True,
+                help=f"Adds a '{SOURCE_FILE_COLUMN}' column naming the file each row came from"
+            )
+            if st.button("📥 Combine & Load"):
+                needed_bytes = sum(estimate_load_bytes(f.size, detect_file_type(f.name)[1] is not None)
+                                   for f in uploaded_files)
+                if memory_governor.admit(needed_bytes):
+                    st.session_state.ingest_error = None
+                    st.session_state.ingest_job = submit_job(
+                        f"{len(uploaded_files)} files", ingest_files, uploaded_files,
+                        source_column=SOURCE_FILE_COLUMN if add_source_column else None, compact=compact_on_load,
+                        memory=(st.session_state.memory_usage, needed_bytes)
+                    )
+                    st.rerun()
+                else:
+                    st.error(f"⚠️ These files need about {needed_bytes / 1024**2:,.0f} MB, more than the server's "
+                             f"{memory_governor.max_bytes / 1024**2:,.0f} MB dataset budget")
+        elif uploaded_file is not None:
             try:
                 # Determine file type and read accordingly
-                file_extension = uploaded_file.name.split('.')[-1].lower()
+                file_extension, compression = detect_file_type(uploaded_file.name)
+                # Reruns of the form reuse what was already read from this upload
+                inspection = st.session_state.upload_inspection
+                if inspection is None or inspection.file_id != uploaded_file.file_id:
+                    if inspection is not None:
+                        inspection.close()
+                    inspection = st.session_state.upload_inspection = UploadInspection(uploaded_file)
+                
+                # Let the user pick which file of a zip archive to load
+                member = None
+                if compression == 'zip':
+                    members = inspection.members()
+                    if not members:
+                        raise ValueError("The archive contains no supported data files")
+                    member = st.selectbox("File in archive", members)
+                    file_extension = detect_file_type(member)[0]
+                    use_disk = choose_storage(uploaded_file.size / (1024 * 1024), file_extension)
+                elif compression is not None and file_extension not in DATA_FILE_TYPES:
+                    raise ValueError(f"Cannot tell the data format of {uploaded_file.name}")
                 
-                with st.spinner('Loading your data...'):
-                    if file_extension == 'csv':
-                        df = pd.read_csv(uploaded_file)
-                    elif file_extension in ['xlsx', 'xls']:
-                        df = pd.read_excel(uploaded_file)
-                    elif file_extension == 'json':
-                        df = pd.read_json(uploaded_file)
+                # Compressed uploads are decompressed as a stream while parsing
+                source = inspection.source(file_extension, compression, member)
+                
+                # Workbooks are listed without parsing and loaded one sheet at a time
+                sheet = None
+                if file_extension in ['xlsx', 'xls']:
+                    sheets = inspection.sheets(file_extension, member)
+                    if len(sheets) > 1:
+                        sheet = st.selectbox("Sheet", sheets)
+                
+                # Pick columns and rows from the header before anything is parsed
+                schema_columns = inspection.schema(file_extension, member, sheet)
+                load_columns = None
+                max_rows = None
+                row_step = 1
+                with st.expander("⚙️ Load Options", expanded=True):
+                    if schema_columns:
+                        load_columns = st.multiselect(
+                            "Columns to load",
+                            options=schema_columns,
+                            default=schema_columns,
+                            help="Only the selected columns are read from the file"
+                        )
+                    else:
+                        st.caption("The columns of this file are only known once it has been parsed")
                     
-                    # Store both original and working copy
-                    st.session_state.df = df
-                    st.session_state.original_df = df.copy()
-                    st.success(f"✓ Successfully loaded: {uploaded_file.name}")
-                    st.rerun()
+                    # Disk-backed datasets always keep every row, the working set is chosen later
+                    if not use_disk:
+                        row_mode = st.radio("Rows to load", ["All rows", "First N rows", "Every Nth row"],
+                                            horizontal=True)
+                        if row_mode == "First N rows":
+                            max_rows = int(st.number_input("Number of rows", min_value=1, value=LOAD_ROW_LIMIT,
+                                                           step=10_000))
+                        elif row_mode == "Every Nth row":
+                            row_step = int(st.number_input("Keep one row in every", min_value=2, value=LOAD_ROW_STEP,
+                                                           help="A systematic sample spread over the whole file"))
+                
+                if st.button("📥 Load Dataset", disabled=load_columns == []):
+                    # Loading every column is the same as not projecting at all
+                    if load_columns == schema_columns:
+                        load_columns = None
+                    # Disk-backed datasets hold the upload while it is written out, then only their working set
+                    if use_disk:
+                        needed_bytes = estimate_disk_load_bytes(uploaded_file.size,
+                                                                len(load_columns or schema_columns or ()),
+                                                                compression is not None)
+                    else:
+                        column_share = len(load_columns) / len(schema_columns) if load_columns else 1.0
+                        needed_bytes = estimate_load_bytes(uploaded_file.size, compression is not None,
+                                                           column_share / row_step)
+                    memory = (st.session_state.memory_usage, needed_bytes)
+                    if memory_governor.admit(memory[1]):
+                        # Parse on a background worker so this session stays responsive and can cancel
+                        st.session_state.ingest_error = None
+                        st.session_state.ingest_job = submit_job(
+                            uploaded_file.name, ingest_upload, uploaded_file, source, file_extension,
+                            load_columns=load_columns, member=member, sheet=sheet, max_rows=max_rows,
+                            row_step=row_step, use_disk=use_disk, compact=compact_on_load, memory=memory
+                        )
+                        st.rerun()
+                    else:
+                        suggest_disk = ENABLE_DISK_DATASETS and file_extension in DISK_FILE_TYPES and not use_disk
+                        st.error(f"⚠️ This file needs about {memory[1] / 1024**2:,.0f} MB, more than the server's "
+                                 f"{memory_governor.max_bytes / 1024**2:,.0f} MB dataset budget. "
+                                 f"Load fewer columns{' or rows' if not use_disk else ''}"
+                                 f"{', or keep it on disk' if suggest_disk else ''}.")
             except Exception as e:
                 st.error(f"❌ Error loading file: {str(e)}")
                 st.info("💡 Make sure your file is properly formatted")
@@ -136,51 +375,164 @@ if st.session_state.df is None:
 else:
     # Data loaded - show enhanced dashboard
     df = st.session_state.df
+    dataset = st.session_state.dataset
+    # Computed once per dataset version and shared with every tab
+    profile = get_profile(df)
     
     # Top controls with enhanced features
-    col1, col2, col3, col4 = st.columns([3, 1, 1, 1])
+    col1, col2, col3, col4, col5 = st.columns([3, 1, 1, 1, 1])
     with col1:
-        st.markdown(f'<p style="font-size: 1.2rem; color: #666; margin-top: 1rem;">📄 Dataset: <strong>{len(df):,} rows × {len(df.columns)} columns</strong> | Size: <strong>{df.memory_usage(deep=True).sum() / 1024**2:.2f} MB</strong></p>', unsafe_allow_html=True)
+        st.markdown(f'<p style="font-size: 1.2rem; color: #666; margin-top: 1rem;">📄 Dataset: <strong>{len(df):,} rows × {len(df.columns)} columns</strong> | Size: <strong>{profile.memory_bytes / 1024**2:.2f} MB</strong>{f" | 💾 Working set of <strong>{dataset.num_rows:,}</strong> rows on disk" if dataset is not None else ""}</p>', unsafe_allow_html=True)
+        history_stats = st.session_state.cleaning_history.stats()
+        if history_stats['steps'] or history_stats['redo']:
+            history_note = (f"↩️ Undo history: {history_stats['steps']} steps, {history_stats['checkpoints']} checkpoints, "
+                            f"{history_stats['memory_bytes'] / 1024**2:.1f} MB in memory")
+            if history_stats['spilled']:
+                history_note += (f", {history_stats['spilled']} spilled to disk "
+                                 f"({history_stats['disk_bytes'] / 1024**2:.1f} MB)")
+            if history_stats['redo']:
+                history_note += f", {history_stats['redo']} to redo"
+            if history_stats['evicted']:
+                history_note += f", {history_stats['evicted']} oldest dropped"
+            st.caption(history_note)
     with col2:
         if st.button("🔄 Reset Data"):
             if st.session_state.original_df is not None:
-                st.session_state.df = st.session_state.original_df.copy()
+                st.session_state.df = st.session_state.original_df.copy(deep=False)
                 st.session_state.data_filtered = False
-                st.session_state.cleaning_history = []
+                st.session_state.cleaning_history.clear(base=st.session_state.original_df)
                 st.success("✓ Data reset to original")
                 st.rerun()
     with col3:
         if st.session_state.cleaning_history:
             if st.button("↩️ Undo Last"):
-                if len(st.session_state.cleaning_history) > 0:
-                    st.session_state.cleaning_history.pop()
-                    if st.session_state.cleaning_history:
-                        st.session_state.df = st.session_state.cleaning_history[-1].copy()
-                    else:
-                        st.session_state.df = st.session_state.original_df.copy()
-                    st.rerun()
+                # Rebuilt by replaying the log from the nearest checkpoint
+                with st.spinner('Rebuilding previous version...'):
+                    st.session_state.df = st.session_state.cleaning_history.undo()
+                st.rerun()
     with col4:
+        if st.session_state.cleaning_history.can_redo:
+            if st.button("↪️ Redo"):
+                with st.spinner('Re-applying operation...'):
+                    st.session_state.df = st.session_state.cleaning_history.redo(st.session_state.df)
+                st.rerun()
+    with col5:
         if st.button("📤 New File"):
-            for key in ['df', 'cleaned_df', 'original_df', 'data_filtered', 'cleaning_history']:
+            if st.session_state.dataset is not None:
+                st.session_state.dataset.delete()
+            for key in ['df', 'cleaned_df', 'original_df', 'data_filtered', 'cleaning_history',
+                        'compaction_report', 'schema_report', 'dataset', 'dataset_ref', 'export_job']:
                 if key in st.session_state:
                     del st.session_state[key]
             st.rerun()
     
+    # Working set controls for disk-backed datasets
+    if dataset is not None:
+        with st.expander(f"💾 Disk-backed dataset: {dataset.num_rows:,} rows × {len(dataset.columns)} columns "
+                         f"({dataset.nbytes / 1024**2:.1f} MB on disk)"):
+            st.caption("All tabs analyze the working set held in memory. Choose which columns and rows it contains.")
+            working_cols = st.multiselect(
+                "Columns",
+                options=dataset.columns,
+                default=[col for col in df.columns if col in dataset.columns],
+                key="working_columns"
+            )
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                window_mode = st.radio("Rows", ["Row range", "Random sample"], horizontal=True, key="working_mode")
+            with col2:
+                start_row = st.number_input("Start row", min_value=0, max_value=max(dataset.num_rows - 1, 0),
+                                            value=0, step=DISK_WORKING_ROWS, key="working_start",
+                                            disabled=window_mode != "Row range")
+            with col3:
+                window_rows = st.number_input("Rows to load", min_value=1, max_value=max(dataset.num_rows, 1),
+                                              value=min(DISK_WORKING_ROWS, max(dataset.num_rows, 1)),
+                                              key="working_rows")
+            
+            if st.button("📥 Load Working Set", disabled=not working_cols):
+                with st.spinner('Reading working set from disk...'):
+                    if window_mode == "Row range":
+                        working_df = dataset.read(working_cols, start_row, start_row + window_rows)
+                    else:
+                        working_df = dataset.sample(window_rows, working_cols)
+                st.session_state.original_df = working_df
+                st.session_state.dataset_ref = None
+                st.session_state.df = working_df.copy(deep=False)
+                st.session_state.cleaning_history.clear(base=working_df)
+                st.session_state.data_filtered = False
+                st.rerun()
+    
+    # Operation log - export the steps or re-apply a saved log to this dataset in one batch
+    history = st.session_state.cleaning_history
+    with st.expander(f"📜 Operation Log ({len(history)} steps)"):
+        if history.operations:
+            for i, operation in enumerate(history.operations):
+                label = describe_operation(operation)
+                st.markdown(f"{i + 1}. {label}" if i < history.position else f"{i + 1}. ~~{label}~~ *(undone)*")
+            st.download_button(
+                label="📥 Download Log",
+                data=export_log(history.operations[:history.position]),
+                file_name="prepify_operations.json",
+                mime="application/json",
+                disabled=not history.position
+            )
+        else:
+            st.caption("Conversions, encodings, scaling, filters and outlier handling are recorded here")
+        
+        log_file = st.file_uploader("Apply a saved log to this dataset", type=['json'], key="operation_log_file")
+        if log_file is not None and st.button("▶️ Apply Log"):
+            try:
+                operations = load_log(log_file.getvalue())
+                replayed_df = st.session_state.df
+                steps = []
+                with st.spinner(f'Applying {len(operations)} operations...'):
+                    for operation in operations:
+                        replayed_df = apply_operation(replayed_df, operation)
+                        steps.append((replayed_df, operation))
+                # Recorded only once every operation has run, so a failing log leaves the history untouched
+                for step_df, operation in steps:
+                    history.push(step_df, operation)
+                st.session_state.df = replayed_df
+                st.rerun()
+            except Exception as e:
+                st.error(f"❌ Could not apply log: {str(e)}")
+    
+    # Column alignment report for datasets combined from several files
+    if st.session_state.schema_report is not None:
+        schema = st.session_state.schema_report
+        with st.expander(f"🧩 Combined Files Report ({(schema['Status'] != 'OK').sum()} columns reconciled)"):
+            st.dataframe(schema, use_container_width=True, hide_index=True)
+    
+    # Memory optimization report from the load step
+    report = st.session_state.compaction_report
+    if report is not None:
+        with st.expander("🗜️ Memory Optimization Report"):
+            before_mb = report['Before (MB)'].sum()
+            after_mb = report['After (MB)'].sum()
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Before", f"{before_mb:.2f} MB")
+            with col2:
+                st.metric("After", f"{after_mb:.2f} MB")
+            with col3:
+                st.metric("Reduction", f"{before_mb / after_mb:.1f}x" if after_mb > 0 else "-")
+            st.dataframe(report, use_container_width=True, hide_index=True)
+    
     # Enhanced Quick Stats
     st.markdown('<h2 class="section-header">📊 Quick Statistics</h2>', unsafe_allow_html=True)
     
     col1, col2, col3, col4, col5, col6 = st.columns(6)
     
-    numeric_cols = df.select_dtypes(include=['number']).columns
-    categorical_cols = df.select_dtypes(include=['object']).columns
+    numeric_cols = profile.numeric_columns
+    categorical_cols = profile.categorical_columns
     
     stats = [
         ("📝", "Total Rows", f"{len(df):,}"),
         ("📋", "Columns", f"{len(df.columns)}"),
         ("🔢", "Numeric", f"{len(numeric_cols)}"),
         ("🏷️", "Categorical", f"{len(categorical_cols)}"),
-        ("❌", "Missing", f"{df.isnull().sum().sum():,}"),
-        ("🔁", "Duplicates", f"{df.duplicated().sum():,}")
+        ("❌", "Missing", f"{profile.total_nulls:,}"),
+        ("🔁", "Duplicates", f"{profile.duplicate_count:,}")
     ]
     
     for col, (icon, label, value) in zip([col1, col2, col3, col4, col5, col6], stats):
@@ -196,44 +548,25 @@ else:
     st.markdown("<br>", unsafe_allow_html=True)
     
     # Enhanced Tabs
-    tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9 = st.tabs([
-    "📋 Data Explorer", 
-    "🔄 Transformation",
-    "🎯 Outlier Detection",
-    "🔍 Data Insights", 
-    "📈 Visualizations", 
-    "📊 Advanced Analytics",
-    "⏱️ Time Series",
-    "🧹 Data Cleaning",
-    "📋 Changelog"  # ← ADD THIS
-])
-    
-    with tab1:
-        data_explorer.render(df)
-    
-    with tab2:
-        data_transformation.render(df)
-    
-    with tab3:
-        outlier_detection.render(df)
-    
-    with tab4:
-        data_insights.render(df)
-    
-    with tab5:
-        visualizations.render(df)
-    
-    with tab6:
-        advanced_analytics.render(df)
-    
-    with tab7:
-        time_series_analysis.render(df)
-
-    with tab8:
-        data_cleaning.render(df)
+    pages = [
+        ("📋 Data Explorer", data_explorer.render),
+        ("🔄 Transformation", data_transformation.render),
+        ("🎯 Outlier Detection", outlier_detection.render),
+        ("🔍 Data Insights", data_insights.render),
+        ("📈 Visualizations", visualizations.render),
+        ("📊 Advanced Analytics", advanced_analytics.render),
+        ("⏱️ Time Series", time_series_analysis.render),
+        ("🧹 Data Cleaning", data_cleaning.render),
+        ("📋 Changelog", lambda df: changelog.render())
+    ]
+    # Switching tabs reruns the app and only the open tab's page is rendered;
+    # page widgets persist their values while their tab is closed
+    tabs = st.tabs([label for label, _ in pages], key="active_tab", on_change="rerun")
     
-    with tab9:
-        changelog.render()
+    for tab, (_, render_page) in zip(tabs, pages):
+        with tab:
+            if tab.open:
+                render_page(df)
 
 # Display footer
 display_footer()
\ No newline at end of file
@@ -0,0 +1,64 @@
+# ============================================
+# FILE: components/memory_status.py (NEW)
+# ============================================
+import streamlit as st
+import pandas as pd
+from config.settings import SESSION_HIBERNATE_SECONDS, SESSION_IDLE_CHECK_SECONDS
+from utils.memory_governor import memory_governor
+from utils.dataset_pool import dataset_pool
+from utils.session_spill import hibernate_session
+
+# Defined outside app.py so the stored fragment does not keep the last script run's variables alive
+@st.fragment(run_every=SESSION_IDLE_CHECK_SECONDS)
+def watch_idle_session():
+    """Spill this session's datasets to disk once it has been idle for a while or memory runs short"""
+    usage = st.session_state.memory_usage
+    if st.session_state.session_spill is not None or st.session_state.ingest_job is not None:
+        return
+    if st.session_state.export_job is not None and not st.session_state.export_job.finished:
+        return
+    if usage.hibernate_requested or usage.idle_seconds >= SESSION_HIBERNATE_SECONDS:
+        freed_bytes = usage.data_bytes
+        if hibernate_session(st.session_state) is not None:
+            usage.hibernated(freed_bytes)
+
+def session_dataset():
+    """Working dataset of this session for a fragment rerun"""
+    if st.session_state.session_spill is not None:
+        # The session was spilled while idle; a full rerun reloads it and accounts for it again
+        st.rerun()
+    st.session_state.memory_usage.touch()
+    return st.session_state.df
+
+def display_memory_status(current=None):
+    """Sidebar panel showing the server-wide dataset memory for operators"""
+    stats = memory_governor.stats()
+    used_mb = stats['used_bytes'] / 1024**2
+    max_mb = stats['max_bytes'] / 1024**2
+
+    with st.sidebar:
+        st.markdown("### 🖥️ Server Memory")
+        st.progress(min(used_mb / max_mb, 1.0) if max_mb else 0.0,
+                    text=f"Datasets: {used_mb:,.0f} of {max_mb:,.0f} MB")
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("Sessions", stats['sessions'])
+            st.metric("Spilled", f"{stats['spilled_bytes'] / 1024**2:,.0f} MB")
+        with col2:
+            st.metric("Reserved", f"{stats['reserved_bytes'] / 1024**2:,.0f} MB")
+            st.metric("Refused", stats['refused'])
+        pool = dataset_pool.stats()
+        if pool['datasets']:
+            st.caption(f"Shared datasets: {pool['datasets']} held by {pool['references']} sessions, "
+                       f"saving {pool['saved_bytes'] / 1024**2:,.0f} MB")
+        if stats['rss_bytes'] is not None:
+            st.caption(f"Process resident memory: {stats['rss_bytes'] / 1024**2:,.0f} MB")
+
+        sessions = sorted(memory_governor.sessions(), key=lambda usage: usage.data_bytes, reverse=True)
+        if sessions:
+            st.dataframe(pd.DataFrame([{
+                'Session': usage.session_id[:8] + (' (you)' if usage is current else ''),
+                'Data (MB)': round(sum(usage.buffers.values()) / 1024**2, 1),
+                'Undo (MB)': round(usage.history_bytes / 1024**2, 1),
+                'Idle (min)': round(usage.idle_seconds / 60, 1)
+            } for usage in sessions]), use_container_width=True, hide_index=True)
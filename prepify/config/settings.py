@@ -39,9 +39,95 @@ PROJECT_INFO = {
 }
 
 # File upload settings
-ALLOWED_FILE_TYPES = ['csv', 'xlsx', 'xls', 'json']
+DATA_FILE_TYPES = ['csv', 'xlsx', 'xls', 'json', 'jsonl', 'parquet', 'feather', 'arrow']
+COMPRESSED_FILE_TYPES = {'gz': 'gzip', 'bz2': 'bz2', 'zst': 'zstd', 'zip': 'zip'}
+ALLOWED_FILE_TYPES = DATA_FILE_TYPES + list(COMPRESSED_FILE_TYPES)
+STREAMABLE_FILE_TYPES = ['csv', 'json', 'jsonl']  # Parsed straight from a decompressing stream
+SPOOL_MAX_MB = 64  # Other formats are decompressed to a temp file that spills to disk beyond this size
+COLUMNAR_FILE_TYPES = ['parquet', 'feather', 'arrow']  # Support column projection on load
 MAX_FILE_SIZE_MB = 200
 
+# Disk-backed datasets for uploads too large to hold in memory
+# MAX_DISK_FILE_SIZE_MB must not exceed server.maxUploadSize in .streamlit/config.toml
+ENABLE_DISK_DATASETS = True
+MAX_DISK_FILE_SIZE_MB = 5120
+DISK_FILE_TYPES = ['csv', 'jsonl', 'parquet', 'feather', 'arrow']
+DISK_DATASET_DIR = None  # None uses the system temp directory
+DISK_WORKING_ROWS = 500_000  # Rows materialized in memory from a disk-backed dataset at a time
+DISK_CELL_BYTES = 32  # Memory assumed per working-set cell when reserving for a disk-backed load
+
+# Ingestion settings
+CSV_CHUNK_SIZE = 100_000  # Rows parsed per chunk for CSV uploads
+PREVIEW_ROWS = 20  # Rows shown while the rest of the file is loading
+LOAD_ROW_LIMIT = 100_000  # Default for the "first N rows" load option
+LOAD_ROW_STEP = 10  # Default for the "every Nth row" load option
+PARSE_PROCESSES = 4  # Worker processes parsing the files of a multi-file upload in parallel
+SOURCE_FILE_COLUMN = 'source_file'  # Column naming the file each row came from
+INGEST_WORKERS = 2  # Background threads parsing uploads, shared by all sessions
+INGEST_POLL_SECONDS = 0.5  # How often a loading session refreshes its progress
+
+# Parsing engine: 'pyarrow' (multi-threaded Arrow readers) or 'pandas' (default C/Python parsers)
+# The pandas parsers are always used as a fallback when pyarrow is not installed
+PARSER_ENGINE = 'pyarrow'
+ARROW_STRING_DTYPE = True  # Keep text columns as Arrow strings instead of NumPy objects
+ARROW_BLOCK_SIZE_MB = 16  # Bytes of CSV handed to the Arrow reader per block
+
+# Parsed dataset cache, shared by all sessions and keyed by file content + parser options
+ENABLE_DATASET_CACHE = True
+DATASET_CACHE_MAX_MB = 1024  # Memory budget, least recently used datasets are evicted first
+# Set to a directory (e.g. '.cache/datasets') to keep datasets across restarts. The files are pickles, which
+# run code when loaded, so the directory must not be shared with or writable by untrusted users
+DATASET_CACHE_DIR = None
+DATASET_CACHE_DISK_MAX_MB = 4096
+
+# Undo history, per session
+HISTORY_MAX_MB = 512  # Memory for undo checkpoints beyond the working data, older ones spill to disk
+HISTORY_MAX_DEPTH = 50  # Oldest steps are dropped beyond this many undo levels
+HISTORY_CHECKPOINT_EVERY = 5  # Undo replays at most this many operations from the last checkpoint
+HISTORY_SPILL_DIR = None  # None uses the system temp directory
+
+# Server-wide memory budget for the datasets held by all sessions (deduplicated across sessions,
+# the dataset cache has its own budget above)
+SERVER_MEMORY_MAX_MB = 4096
+LOAD_MEMORY_FACTOR = 3  # Memory reserved for a load, as a multiple of the upload size
+COMPRESSED_LOAD_FACTOR = 5  # Extra multiple for compressed uploads
+IDLE_SESSION_SECONDS = 600  # Sessions idle this long are spilled to disk first when memory runs short
+MEMORY_WAIT_SECONDS = 1  # How often a queued load checks for free memory
+# Uploads are held in memory while a disk-backed load writes them out, so leave room for one of
+# MAX_DISK_FILE_SIZE_MB in SERVER_MEMORY_MAX_MB
+SHOW_MEMORY_STATUS = False  # Server memory panel in the sidebar; it lists every session, so only for operators
+
+# Idle sessions, e.g. browser tabs left open, have their datasets spilled to disk until they return
+SESSION_HIBERNATE_SECONDS = 3600
+SESSION_IDLE_CHECK_SECONDS = 60  # How often an open session checks whether it has gone idle
+SESSION_SPILL_DIR = None  # None uses the system temp directory
+
+# Distinct counts in column profiles: exact, or estimated with a HyperLogLog sketch within a relative error
+DISTINCT_COUNT_ERRORS = [0.005, 0.01, 0.02, 0.05]  # Error bounds offered next to the exact count
+DISTINCT_COUNT_DEFAULT = 0.01  # Preselected error bound, None preselects the exact count
+DISTINCT_CHUNK_ROWS = 1_000_000  # Rows hashed per chunk while building a sketch
+
+# Memory optimization settings
+ENABLE_DTYPE_COMPACTION = True  # Default for the "compact dtypes on load" option
+CATEGORY_MAX_RATIO = 0.5  # Text columns with at most this share of distinct values become categories
+
+# Data Explorer grid: only the visible page is sliced and sent to the browser
+GRID_PAGE_SIZES = [25, 50, 100, 250, 500]  # Rows per page offered
+GRID_DEFAULT_PAGE_SIZE = 50
+
+# Export settings
+EXPORT_COMPRESSION = {
+    'CSV': ['none', 'gzip', 'zstd', 'zip'],
+    'JSON': ['none', 'gzip', 'zstd', 'zip'],
+    'JSON Lines': ['none', 'gzip', 'zstd', 'zip'],
+    'Parquet': ['snappy', 'zstd', 'gzip', 'none'],
+    'Feather': ['zstd', 'lz4', 'uncompressed']
+}
+EXPORT_BATCH_ROWS = 100_000  # Rows converted to text at a time by the CSV/JSON writers
+EXPORT_SPOOL_MB = 64  # Exports are built in memory up to this size, then in a temp file
+EXPORT_CACHE_MAX_MB = 512  # Finished exports kept for re-download, least recently used evicted first
+EXPORT_WORKERS = 2  # Background threads writing exports, separate from the ones loading uploads
+
 # Visualization settings
 DEFAULT_COLOR_SCHEME = 'Plotly'
 CHART_HEIGHT = 550
@@ -7,6 +7,8 @@ import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import numpy as np
+from utils.dataset_profile import get_profile
+from components.distinct_counts import select_distinct_error
 
 # Import scipy.stats at the top level
 try:
@@ -19,8 +21,9 @@ except ImportError:
 def render(df):
     st.markdown('<div class="card-container">', unsafe_allow_html=True)
     
-    numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
-    categorical_cols = df.select_dtypes(include=['object']).columns.tolist()
+    profile = get_profile(df)
+    numeric_cols = profile.numeric_columns
+    categorical_cols = profile.categorical_columns
     
     # Statistical Summary Section
     if numeric_cols:
@@ -44,13 +47,13 @@ def render(df):
         
         with col1:
             # Select column for detailed analysis
-            analysis_col = st.selectbox("Select column for detailed analysis", numeric_cols)
+            analysis_col = st.selectbox("Select column for detailed analysis", numeric_cols, key="analytics_analysis_col", persist_state="session")
         
         with col2:
             if SCIPY_AVAILABLE:
-                dist_type = st.selectbox("Distribution view", ["Histogram", "KDE", "Both"])
+                dist_type = st.selectbox("Distribution view", ["Histogram", "KDE", "Both"], key="analytics_dist_type", persist_state="session")
             else:
-                dist_type = st.selectbox("Distribution view", ["Histogram"])
+                dist_type = st.selectbox("Distribution view", ["Histogram"], key="analytics_dist_type", persist_state="session")
                 st.info("Install scipy for KDE plots: pip install scipy")
         
         # Create distribution plots
@@ -209,7 +212,9 @@ def render(df):
             selected_features = st.multiselect(
                 "Select features to compare (max 4 recommended)",
                 numeric_cols,
-                default=numeric_cols[:min(3, len(numeric_cols))]
+                default=numeric_cols[:min(3, len(numeric_cols))],
+                key="analytics_selected_features",
+                persist_state="session"
             )
             
             if selected_features and len(selected_features) >= 2:
@@ -240,7 +245,7 @@ def render(df):
         st.markdown("---")
         st.markdown("### 🏷️ Categorical Variable Analysis")
         
-        selected_cat = st.selectbox("Select categorical variable", categorical_cols)
+        selected_cat = st.selectbox("Select categorical variable", categorical_cols, key="analytics_selected_cat", persist_state="session")
         
         col1, col2 = st.columns(2)
         
@@ -276,9 +281,9 @@ def render(df):
             
             col1, col2 = st.columns(2)
             with col1:
-                cat1 = st.selectbox("First categorical variable", categorical_cols, key="cat1")
+                cat1 = st.selectbox("First categorical variable", categorical_cols, key="cat1", persist_state="session")
             with col2:
-                cat2 = st.selectbox("Second categorical variable", categorical_cols, key="cat2")
+                cat2 = st.selectbox("Second categorical variable", categorical_cols, key="cat2", persist_state="session")
             
             if cat1 != cat2:
                 try:
@@ -307,14 +312,7 @@ def render(df):
     
     with col1:
         st.markdown("**Missing Data Analysis**")
-        missing_data = df.isnull().sum()
-        missing_pct = (missing_data / len(df) * 100).round(2)
-        missing_df = pd.DataFrame({
-            'Column': missing_data.index,
-            'Missing': missing_data.values,
-            'Percentage': missing_pct.values
-        })
-        missing_df = missing_df[missing_df['Missing'] > 0].sort_values('Missing', ascending=False)
+        missing_df = profile.missing_summary()
         
         if len(missing_df) > 0:
             st.dataframe(missing_df, use_container_width=True, hide_index=True)
@@ -323,18 +321,19 @@ def render(df):
     
     with col2:
         st.markdown("**Duplicate Analysis**")
-        dup_count = df.duplicated().sum()
+        dup_count = profile.duplicate_count
         st.metric("Duplicate Rows", dup_count)
         
         if dup_count > 0:
-            dup_pct = (dup_count / len(df) * 100).round(2)
+            dup_pct = round(dup_count / len(df) * 100, 2)
             st.warning(f"⚠️ {dup_pct}% of data is duplicated")
         else:
             st.success("✓ No duplicates found!")
     
     with col3:
         st.markdown("**Cardinality Analysis**")
-        high_card_cols = [col for col in df.columns if df[col].nunique() > len(df) * 0.9]
+        distinct = profile.distinct_counts(select_distinct_error('analytics_distinct_error'))
+        high_card_cols = distinct.index[distinct > len(df) * 0.9].tolist()
         st.metric("High Cardinality Columns", len(high_card_cols))
         
         if high_card_cols:
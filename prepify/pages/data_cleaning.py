@@ -5,6 +5,7 @@ import streamlit as st
 import pandas as pd
 from utils.data_processing import remove_missing_values, fill_missing_values, remove_duplicates, clean_all
 from utils.file_handlers import convert_df_to_csv
+from utils.dataset_profile import get_profile
 
 def render(df):
     st.markdown('<div class="card-container">', unsafe_allow_html=True)
@@ -16,7 +17,7 @@ def render(df):
     with col1:
         # Missing Values Section
         st.markdown("#### ❌ Handle Missing Values")
-        missing_count = df.isnull().sum().sum()
+        missing_count = get_profile(df).total_nulls
         
         if missing_count > 0:
             st.warning(f"⚠️ Found {missing_count} missing values in your dataset")
@@ -68,17 +69,38 @@ def render(df):
         
         # Duplicates Section
         st.markdown("#### 🔁 Handle Duplicate Rows")
-        duplicate_count = df.duplicated().sum()
+        col_a, col_b = st.columns([2, 1])
+        with col_a:
+            dup_subset = st.multiselect(
+                "Columns that identify a duplicate",
+                options=df.columns.tolist(),
+                help="Leave empty to compare whole rows",
+                key="duplicate_subset",
+                persist_state="session"
+            )
+        with col_b:
+            keep_options = {"First occurrence": 'first', "Last occurrence": 'last', "No copies": False}
+            keep_label = st.selectbox("Keep", list(keep_options), key="duplicate_keep", persist_state="session")
+        # Whole-row duplicates feed the summary; the selected subset and keep rule drive removal
+        duplicate_count = get_profile(df).duplicate_count
+        duplicates = get_profile(df).duplicates(dup_subset or None)
+        keep = keep_options[keep_label]
+        selected_count = duplicates.count(keep)
         
-        if duplicate_count > 0:
-            st.warning(f"⚠️ Found {duplicate_count} duplicate rows in your dataset")
+        if selected_count > 0:
+            st.warning(f"⚠️ Found {selected_count} duplicate rows in your dataset")
+            
+            with st.expander("👀 Duplicate Groups"):
+                groups = duplicates.groups()
+                st.caption(f"{groups['group'].max():,} groups, {len(groups):,} rows; the first 1,000 rows are shown")
+                st.dataframe(groups.head(1000), use_container_width=True)
             
             st.markdown('<div class="cleaning-card">', unsafe_allow_html=True)
             st.markdown("**🗑️ Remove Duplicate Rows**")
-            st.caption("Keep only the first occurrence of each duplicate row")
+            st.caption(f"Keep the {keep_label.lower()} of each duplicate row" if keep else "Drop every copy of a duplicated row")
             
             if st.button("🧹 Remove Duplicates", key="remove_duplicates"):
-                cleaned_df = remove_duplicates(df)
+                cleaned_df = remove_duplicates(df, dup_subset or None, keep)
                 removed_rows = len(df) - len(cleaned_df)
                 st.success(f"✓ Removed {removed_rows} duplicate rows")
                 
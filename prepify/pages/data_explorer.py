@@ -3,47 +3,54 @@
 # ============================================
 import streamlit as st
 import pandas as pd
-from utils.file_handlers import convert_df_to_csv, convert_df_to_excel, convert_df_to_json
+from utils.file_handlers import EXPORT_FORMATS, export_file_name, export_mime
+from utils.export_jobs import export_key, export_cache, submit_export, finished_export
+from utils.operations import make_operation, apply_operation
+from utils.dataset_profile import get_profile
+from utils.data_grid import sample_positions, view_positions, page_count, page_frame
+from components.memory_status import session_dataset
+from config.settings import EXPORT_COMPRESSION, GRID_PAGE_SIZES, GRID_DEFAULT_PAGE_SIZE, INGEST_POLL_SECONDS
 
 def render(df):
+    profile = get_profile(df)
     st.markdown('<div class="card-container">', unsafe_allow_html=True)
     
     # Header with export options
-    col1, col2, col3 = st.columns([2, 1, 1])
+    col1, col2 = st.columns([3, 1])
     with col1:
         st.markdown('<h3 style="color: #2d3748;">📊 Data Preview & Exploration</h3>', unsafe_allow_html=True)
     with col2:
-        n_rows = st.number_input("Rows to display", min_value=5, max_value=500, value=10, step=5)
-    with col3:
-        export_format = st.selectbox("Export as", ["CSV", "Excel", "JSON"])
+        export_format = st.selectbox("Export as", list(EXPORT_FORMATS), key="explorer_export_format", persist_state="session")
+        if export_format in EXPORT_COMPRESSION:
+            export_compression = st.selectbox("Compression", EXPORT_COMPRESSION[export_format], key="explorer_export_compression", persist_state="session")
     
     # Data sampling option
     col1, col2 = st.columns([3, 1])
     with col1:
         st.markdown("#### 🎲 Data Sampling")
     with col2:
-        use_sampling = st.checkbox("Enable sampling", value=False)
+        use_sampling = st.checkbox("Enable sampling", value=False, key="explorer_use_sampling", persist_state="session")
     
-    display_df = df
+    sample = None
     if use_sampling:
         col1, col2, col3 = st.columns(3)
         with col1:
-            sample_method = st.selectbox("Method", ["Random", "First N", "Last N"])
+            sample_method = st.selectbox("Method", ["Random", "First N", "Last N"], key="explorer_sample_method", persist_state="session")
         with col2:
-            sample_size = st.number_input("Sample size", min_value=1, max_value=len(df), value=min(1000, len(df)))
+            _forget_out_of_bounds("explorer_sample_size", 1, len(df))
+            sample_size = st.number_input("Sample size", min_value=1, max_value=len(df), value=min(1000, len(df)), key="explorer_sample_size", persist_state="session")
         with col3:
             if sample_method == "Random":
-                random_seed = st.number_input("Random seed", value=42)
+                random_seed = st.number_input("Random seed", value=42, key="explorer_random_seed", persist_state="session")
         
+        # The sample is kept as row positions, the rows themselves are only read a page at a time
+        sample = (sample_method, sample_size, random_seed if sample_method == "Random" else None)
         if sample_method == "Random":
-            display_df = df.sample(n=min(sample_size, len(df)), random_state=random_seed)
-            st.info(f"📊 Showing random sample of {len(display_df)} rows")
+            st.info(f"📊 Showing random sample of {min(sample_size, len(df))} rows")
         elif sample_method == "First N":
-            display_df = df.head(sample_size)
-            st.info(f"📊 Showing first {len(display_df)} rows")
+            st.info(f"📊 Showing first {min(sample_size, len(df))} rows")
         else:
-            display_df = df.tail(sample_size)
-            st.info(f"📊 Showing last {len(display_df)} rows")
+            st.info(f"📊 Showing last {min(sample_size, len(df))} rows")
     
     # Column selector
     with st.expander("🔽 Select Columns to Display"):
@@ -52,42 +59,18 @@ def render(df):
             "Choose columns",
             options=all_cols,
             default=all_cols,
-            help="Select specific columns to view"
+            help="Select specific columns to view",
+            key="explorer_selected_cols",
+            persist_state="session"
         )
-        
-        if selected_cols:
-            display_df = display_df[selected_cols]
     
-    # Display dataframe
-    st.dataframe(display_df.head(n_rows), use_container_width=True, height=400)
+    # Paginated grid
+    _data_grid(sample, selected_cols)
     
-    # Export button
-    col1, col2, col3 = st.columns([1, 1, 2])
-    with col1:
-        if export_format == "CSV":
-            csv_data = convert_df_to_csv(display_df)
-            st.download_button(
-                label="📥 Download CSV",
-                data=csv_data,
-                file_name="exported_data.csv",
-                mime="text/csv"
-            )
-        elif export_format == "Excel":
-            excel_data = convert_df_to_excel(display_df)
-            st.download_button(
-                label="📥 Download Excel",
-                data=excel_data,
-                file_name="exported_data.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            )
-        else:
-            json_data = convert_df_to_json(display_df)
-            st.download_button(
-                label="📥 Download JSON",
-                data=json_data,
-                file_name="exported_data.json",
-                mime="application/json"
-            )
+    # Export, built only when asked for and cached per dataset version
+    compression = export_compression if export_format in EXPORT_COMPRESSION else None
+    columns = selected_cols if selected_cols and selected_cols != all_cols else None
+    _export_panel(df, profile, export_key(export_format, compression, columns, sample))
     
     # Enhanced column details
     with st.expander("🔽 Detailed Column Information"):
@@ -95,7 +78,7 @@ def render(df):
         
         with col1:
             st.markdown("**📊 Numeric Columns:**")
-            numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
+            numeric_cols = profile.numeric_columns
             if numeric_cols:
                 for col in numeric_cols:
                     st.write(f"• {col} ({df[col].dtype})")
@@ -104,16 +87,16 @@ def render(df):
         
         with col2:
             st.markdown("**🏷️ Categorical Columns:**")
-            cat_cols = df.select_dtypes(include=['object']).columns.tolist()
+            cat_cols = profile.categorical_columns
             if cat_cols:
                 for col in cat_cols:
-                    st.write(f"• {col} (unique: {df[col].nunique()})")
+                    st.write(f"• {col} (unique: {profile.unique_counts[col]})")
             else:
                 st.write("None")
         
         with col3:
             st.markdown("**📅 Datetime Columns:**")
-            date_cols = df.select_dtypes(include=['datetime64']).columns.tolist()
+            date_cols = profile.datetime_columns
             if date_cols:
                 for col in date_cols:
                     st.write(f"• {col}")
@@ -124,24 +107,30 @@ def render(df):
     with st.expander("🔍 Filter Data"):
         st.markdown("**Apply filters to your dataset**")
         
-        filter_col = st.selectbox("Select column to filter", df.columns.tolist())
+        filter_col = st.selectbox("Select column to filter", df.columns.tolist(), key="explorer_filter_col", persist_state="session")
         
         if filter_col:
-            if df[filter_col].dtype in ['int64', 'float64']:
+            if pd.api.types.is_numeric_dtype(df[filter_col]) and not pd.api.types.is_bool_dtype(df[filter_col]):
                 # Numeric filtering
                 min_val = float(df[filter_col].min())
                 max_val = float(df[filter_col].max())
+                _forget_out_of_bounds("explorer_filter_range", min_val, max_val)
                 
                 filter_range = st.slider(
                     f"Range for {filter_col}",
                     min_value=min_val,
                     max_value=max_val,
-                    value=(min_val, max_val)
+                    value=(min_val, max_val),
+                    key="explorer_filter_range",
+                    persist_state="session"
                 )
                 
                 if st.button("Apply Numeric Filter"):
-                    filtered_df = df[(df[filter_col] >= filter_range[0]) & (df[filter_col] <= filter_range[1])]
+                    operation = make_operation('filter_range', column=filter_col,
+                                               low=filter_range[0], high=filter_range[1])
+                    filtered_df = apply_operation(df, operation)
                     st.session_state.df = filtered_df
+                    st.session_state.cleaning_history.push(filtered_df, operation)
                     st.session_state.data_filtered = True
                     st.success(f"✓ Filtered to {len(filtered_df)} rows")
                     st.rerun()
@@ -151,23 +140,27 @@ def render(df):
                 selected_vals = st.multiselect(
                     f"Select values for {filter_col}",
                     options=unique_vals,
-                    default=unique_vals[:min(5, len(unique_vals))]
+                    default=unique_vals[:min(5, len(unique_vals))],
+                    key="explorer_selected_vals",
+                    persist_state="session"
                 )
                 
                 if st.button("Apply Categorical Filter"):
-                    filtered_df = df[df[filter_col].isin(selected_vals)]
+                    operation = make_operation('filter_values', column=filter_col, values=selected_vals)
+                    filtered_df = apply_operation(df, operation)
                     st.session_state.df = filtered_df
+                    st.session_state.cleaning_history.push(filtered_df, operation)
                     st.session_state.data_filtered = True
                     st.success(f"✓ Filtered to {len(filtered_df)} rows")
                     st.rerun()
     
     # Search functionality
     with st.expander("🔎 Search Data"):
-        search_col = st.selectbox("Search in column", df.columns.tolist(), key="search_col")
-        search_term = st.text_input("Enter search term")
+        search_col = st.selectbox("Search in column", df.columns.tolist(), key="search_col", persist_state="session")
+        search_term = st.text_input("Enter search term", key="explorer_search_term", persist_state="session")
         
         if search_term:
-            if df[search_col].dtype == 'object':
+            if df[search_col].dtype in ['object', 'string', 'category']:
                 search_results = df[df[search_col].str.contains(search_term, case=False, na=False)]
             else:
                 try:
@@ -179,4 +172,112 @@ def render(df):
             if len(search_results) > 0:
                 st.dataframe(search_results, use_container_width=True)
     
-    st.markdown('</div>', unsafe_allow_html=True)
\ No newline at end of file
+    st.markdown('</div>', unsafe_allow_html=True)
+
+
+def _first_page():
+    st.session_state.explorer_page = 1
+
+def _turn_page(step, n_pages):
+    st.session_state.explorer_page = min(max(st.session_state.get('explorer_page', 1) + step, 1), n_pages)
+
+def _jump_to_row(page_size):
+    row = st.session_state.explorer_jump_row
+    if row is not None:
+        st.session_state.explorer_page = (row - 1) // page_size + 1
+
+def _forget_out_of_bounds(key, low, high):
+    """Drop a remembered widget value that no longer fits the data, so the widget starts from its default"""
+    value = st.session_state.get(key)
+    values = value if isinstance(value, tuple) else (value,)
+    if value is not None and any(v < low or v > high for v in values):
+        del st.session_state[key]
+
+@st.fragment
+def _data_grid(sample, columns):
+    """One page of the dataset at a time; paging, sorting and jumping rerun the grid only"""
+    df = session_dataset()
+    profile = get_profile(df)
+    rows = sample_positions(len(df), *sample) if sample else None
+    n_rows = len(df) if rows is None else len(rows)
+    
+    col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
+    with col1:
+        sort_col = st.selectbox("Sort by", ['None'] + df.columns.tolist(), key="explorer_sort_col", on_change=_first_page, persist_state="session")
+    with col2:
+        sort_order = st.selectbox("Order", ["Ascending", "Descending"], key="explorer_sort_order", on_change=_first_page, persist_state="session")
+    with col3:
+        page_size = st.selectbox("Rows per page", GRID_PAGE_SIZES, index=GRID_PAGE_SIZES.index(GRID_DEFAULT_PAGE_SIZE),
+                                 key="explorer_page_size", persist_state="session")
+    n_pages = page_count(n_rows, page_size)
+    with col4:
+        st.number_input("Jump to row", min_value=1, max_value=max(n_rows, 1), value=None, placeholder="Row number",
+                        key="explorer_jump_row", on_change=_jump_to_row, args=(page_size,))
+    
+    # A smaller view or larger pages can leave the remembered page past the end
+    if st.session_state.get('explorer_page', 1) > n_pages:
+        st.session_state.explorer_page = n_pages
+    
+    col1, col2, col3, col4 = st.columns([1, 1, 1, 3])
+    with col1:
+        st.button("◀ Previous", on_click=_turn_page, args=(-1, n_pages), use_container_width=True)
+    with col2:
+        page = st.number_input("Page", min_value=1, max_value=n_pages, key="explorer_page",
+                               label_visibility="collapsed", persist_state="session")
+    with col3:
+        st.button("Next ▶", on_click=_turn_page, args=(1, n_pages), use_container_width=True)
+    
+    # Only the rows of this page are sliced from the frame and sent to the browser
+    positions = view_positions(df, profile, rows, None if sort_col == 'None' else sort_col, sort_order == "Ascending")
+    page_df = page_frame(df, positions, page, page_size, columns)
+    first_row = (page - 1) * page_size + 1
+    with col4:
+        st.caption(f"Rows {first_row:,}–{first_row + len(page_df) - 1:,} of {n_rows:,} · page {page:,} of {n_pages:,}")
+    
+    st.dataframe(page_df, use_container_width=True, height=min(35 * (len(page_df) + 1) + 3, 600))
+
+def _export_panel(df, profile, key):
+    """Download button for a built export, or progress while it is built, or a button to build it"""
+    export_format, compression = key[0], key[1]
+    job = st.session_state.export_job
+    export = export_cache.get(profile, key)
+    if export is None:
+        # Exports larger than the cache are still held by the session's last job
+        export = finished_export(job, profile, key)
+    
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        if export is not None:
+            # The file is only read when the button is clicked, not on every rerun
+            st.download_button(
+                label=f"📥 Download {export_format}",
+                data=export.read_bytes,
+                file_name=export_file_name("exported_data", export_format, compression),
+                mime=export_mime(export_format, compression),
+                on_click="ignore"
+            )
+        elif job is not None and not job.finished and job.export_key == key:
+            _export_progress()
+        elif st.button(f"⚙️ Prepare {export_format} Export"):
+            if job is not None:
+                job.cancel()
+            st.session_state.export_job = submit_export(df, profile, key)
+            st.rerun()
+    with col2:
+        if export is not None:
+            st.caption(f"✓ Ready: {export_file_name('exported_data', export_format, compression)} "
+                       f"({export.size / 1024:,.0f} KB)")
+        elif job is not None and job.status == 'failed' and job.export_key == key:
+            st.error(f"❌ Export failed: {job.error}")
+
+@st.fragment(run_every=INGEST_POLL_SECONDS)
+def _export_progress():
+    """Poll the export job of this session and show its progress"""
+    job = st.session_state.export_job
+    if job is None or job.finished:
+        # Rerun the whole script so the finished export is offered for download
+        st.rerun()
+    st.progress(job.progress, text=f"{job.stage}... · {job.elapsed:.0f}s")
+    if st.button("✖ Cancel Export"):
+        job.cancel()
+        st.info("Cancelling...")
@@ -4,31 +4,30 @@
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
+from utils.dataset_profile import get_profile
+from components.distinct_counts import select_distinct_error
 
 def render(df):
+    profile = get_profile(df)
     st.markdown('<div class="card-container">', unsafe_allow_html=True)
     
     col1, col2 = st.columns(2)
     
     with col1:
         st.markdown("### 📋 Column Information")
+        distinct_error = select_distinct_error('insights_distinct_error')
         dtype_df = pd.DataFrame({
             'Column': df.columns,
-            'Type': df.dtypes.astype(str).values,
-            'Non-Null': df.count().values,
-            'Null': df.isnull().sum().values,
-            'Unique': [df[col].nunique() for col in df.columns]
+            'Type': profile.dtypes.astype(str).values,
+            'Non-Null': profile.non_null_counts.values,
+            'Null': profile.null_counts.values,
+            'Unique': profile.distinct_counts(distinct_error).values
         })
         st.dataframe(dtype_df, use_container_width=True, height=400)
     
     with col2:
         st.markdown("### ⚠️ Missing Values Analysis")
-        missing_df = pd.DataFrame({
-            'Column': df.columns,
-            'Missing': df.isnull().sum().values,
-            'Percentage': (df.isnull().sum().values / len(df) * 100).round(2)
-        })
-        missing_df = missing_df[missing_df['Missing'] > 0].sort_values('Missing', ascending=False)
+        missing_df = profile.missing_summary()
         
         if len(missing_df) > 0:
             st.dataframe(missing_df, use_container_width=True)
@@ -3,10 +3,11 @@
 # ============================================
 import streamlit as st
 import pandas as pd
-from utils.data_processing import (encode_categorical, normalize_data, 
-                                   standardize_data, convert_column_type)
+from utils.operations import make_operation, apply_operation
+from utils.dataset_profile import get_profile
 
 def render(df):
+    profile = get_profile(df)
     st.markdown('<div class="card-container">', unsafe_allow_html=True)
     st.markdown("### 🔄 Data Transformation Tools")
     
@@ -17,21 +18,23 @@ def render(df):
         st.markdown("#### 🔀 Column Type Conversion")
         st.markdown('<div class="cleaning-card">', unsafe_allow_html=True)
         
-        col_to_convert = st.selectbox("Select column", df.columns.tolist(), key="convert_col")
+        col_to_convert = st.selectbox("Select column", df.columns.tolist(), key="convert_col", persist_state="session")
         current_type = str(df[col_to_convert].dtype)
         st.write(f"Current type: `{current_type}`")
         
         new_type = st.selectbox(
             "Convert to",
             ["int", "float", "str", "datetime", "category"],
-            key="new_type"
+            key="new_type",
+            persist_state="session"
         )
         
         if st.button("🔄 Convert Type"):
             try:
-                converted_df = convert_column_type(df, col_to_convert, new_type)
+                operation = make_operation('convert_type', column=col_to_convert, new_type=new_type)
+                converted_df = apply_operation(df, operation)
                 st.session_state.df = converted_df
-                st.session_state.cleaning_history.append(converted_df.copy())
+                st.session_state.cleaning_history.push(converted_df, operation)
                 st.success(f"✓ Converted {col_to_convert} to {new_type}")
                 st.rerun()
             except Exception as e:
@@ -43,21 +46,23 @@ def render(df):
         st.markdown("#### 🏷️ Categorical Encoding")
         st.markdown('<div class="cleaning-card">', unsafe_allow_html=True)
         
-        cat_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
+        cat_cols = profile.categorical_columns
         
         if cat_cols:
-            col_to_encode = st.selectbox("Select categorical column", cat_cols, key="encode_col")
+            col_to_encode = st.selectbox("Select categorical column", cat_cols, key="encode_col", persist_state="session")
             encoding_method = st.selectbox(
                 "Encoding method",
                 ["Label Encoding", "One-Hot Encoding"],
-                key="encoding_method"
+                key="encoding_method",
+                persist_state="session"
             )
             
             if st.button("🔢 Encode Column"):
                 try:
-                    encoded_df = encode_categorical(df, col_to_encode, encoding_method)
+                    operation = make_operation('encode', column=col_to_encode, method=encoding_method)
+                    encoded_df = apply_operation(df, operation)
                     st.session_state.df = encoded_df
-                    st.session_state.cleaning_history.append(encoded_df.copy())
+                    st.session_state.cleaning_history.push(encoded_df, operation)
                     st.success(f"✓ Encoded {col_to_encode} using {encoding_method}")
                     st.rerun()
                 except Exception as e:
@@ -71,32 +76,31 @@ def render(df):
         st.markdown("#### 📏 Feature Scaling")
         st.markdown('<div class="cleaning-card">', unsafe_allow_html=True)
         
-        numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
+        numeric_cols = profile.numeric_columns
         
         if numeric_cols:
             cols_to_scale = st.multiselect(
                 "Select columns to scale",
                 numeric_cols,
-                key="scale_cols"
+                key="scale_cols",
+                persist_state="session"
             )
             
             scaling_method = st.selectbox(
                 "Scaling method",
                 ["Min-Max Normalization (0-1)", "Z-Score Standardization"],
-                key="scaling_method"
+                key="scaling_method",
+                persist_state="session"
             )
             
             if cols_to_scale and st.button("📊 Apply Scaling"):
                 try:
-                    if "Normalization" in scaling_method:
-                        scaled_df = normalize_data(df, cols_to_scale)
-                        method_name = "normalized"
-                    else:
-                        scaled_df = standardize_data(df, cols_to_scale)
-                        method_name = "standardized"
+                    operation = make_operation('scale', columns=cols_to_scale, method=scaling_method)
+                    scaled_df = apply_operation(df, operation)
+                    method_name = "normalized" if "Normalization" in scaling_method else "standardized"
                     
                     st.session_state.df = scaled_df
-                    st.session_state.cleaning_history.append(scaled_df.copy())
+                    st.session_state.cleaning_history.push(scaled_df, operation)
                     st.success(f"✓ Successfully {method_name} {len(cols_to_scale)} columns")
                     st.rerun()
                 except Exception as e:
@@ -112,11 +116,11 @@ def render(df):
         summary_data = {
             "Category": ["Data Types", "Numeric", "Categorical", "Datetime", "Boolean"],
             "Count": [
-                len(df.dtypes.unique()),
-                len(df.select_dtypes(include=['number']).columns),
-                len(df.select_dtypes(include=['object', 'category']).columns),
-                len(df.select_dtypes(include=['datetime64']).columns),
-                len(df.select_dtypes(include=['bool']).columns)
+                len(profile.dtypes.unique()),
+                len(profile.numeric_columns),
+                len(profile.categorical_columns),
+                len(profile.datetime_columns),
+                len(profile.bool_columns)
             ]
         }
         
@@ -5,13 +5,23 @@ import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
-from utils.data_processing import detect_outliers_zscore, detect_outliers_iqr, remove_outliers
+from utils.data_processing import detect_outliers_zscore, detect_outliers_iqr
+from utils.operations import make_operation, apply_operation
+from utils.dataset_profile import get_profile
+from components.memory_status import session_dataset
 
 def render(df):
+    # A fragment, so a control change reruns the analysis only, not the whole app
+    _outlier_panel()
+
+@st.fragment
+def _outlier_panel():
+    """Column and method controls with the charts and statistics they drive"""
+    df = session_dataset()
     st.markdown('<div class="card-container">', unsafe_allow_html=True)
     st.markdown("### 🎯 Outlier Detection & Handling")
     
-    numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
+    numeric_cols = get_profile(df).numeric_columns
     
     if not numeric_cols:
         st.warning("⚠️ No numeric columns found for outlier detection")
@@ -24,13 +34,15 @@ def render(df):
         st.markdown("#### 🔍 Detect Outliers")
         
         # Column selection
-        selected_col = st.selectbox("Select column for analysis", numeric_cols)
+        selected_col = st.selectbox("Select column for analysis", numeric_cols, key="outlier_selected_col", persist_state="session")
         
         # Method selection
         method = st.selectbox(
             "Detection method",
             ["Z-Score (3σ)", "IQR (Interquartile Range)", "Both Methods"],
-            help="Z-Score: values beyond 3 standard deviations | IQR: values beyond 1.5 * IQR"
+            help="Z-Score: values beyond 3 standard deviations | IQR: values beyond 1.5 * IQR",
+            key="outlier_method",
+            persist_state="session"
         )
         
         # Detect outliers
@@ -139,30 +151,28 @@ def render(df):
                 
                 with col_a:
                     if st.button("🗑️ Remove Outliers"):
-                        cleaned_df = remove_outliers(df, selected_col, method)
+                        operation = make_operation('remove_outliers', column=selected_col, method=method)
+                        cleaned_df = apply_operation(df, operation)
                         st.session_state.df = cleaned_df
-                        st.session_state.cleaning_history.append(cleaned_df.copy())
+                        st.session_state.cleaning_history.push(cleaned_df, operation)
                         st.success(f"✓ Removed {len(outlier_indices)} outlier rows")
                         st.rerun()
                 
                 with col_b:
                     if st.button("📊 Cap at Percentiles"):
-                        capped_df = df.copy()
-                        lower = capped_df[selected_col].quantile(0.01)
-                        upper = capped_df[selected_col].quantile(0.99)
-                        capped_df[selected_col] = capped_df[selected_col].clip(lower, upper)
+                        operation = make_operation('cap_outliers', column=selected_col)
+                        capped_df = apply_operation(df, operation)
                         st.session_state.df = capped_df
-                        st.session_state.cleaning_history.append(capped_df.copy())
+                        st.session_state.cleaning_history.push(capped_df, operation)
                         st.success(f"✓ Capped values at 1st and 99th percentiles")
                         st.rerun()
                 
                 with col_c:
                     if st.button("🔄 Replace with Median"):
-                        replaced_df = df.copy()
-                        median_val = replaced_df[selected_col].median()
-                        replaced_df.loc[outlier_indices, selected_col] = median_val
+                        operation = make_operation('replace_outliers', column=selected_col, method=method)
+                        replaced_df = apply_operation(df, operation)
                         st.session_state.df = replaced_df
-                        st.session_state.cleaning_history.append(replaced_df.copy())
+                        st.session_state.cleaning_history.push(replaced_df, operation)
                         st.success(f"✓ Replaced {len(outlier_indices)} outliers with median")
                         st.rerun()
     
@@ -5,18 +5,27 @@ import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
+from utils.dataset_profile import get_profile
+from components.memory_status import session_dataset
 
 def render(df):
+    # A fragment, so a control change reruns the analysis only, not the whole app
+    _time_series_panel()
+
+@st.fragment
+def _time_series_panel():
+    """Date and value column controls with the charts and statistics they drive"""
+    df = session_dataset()
     st.markdown('<div class="card-container">', unsafe_allow_html=True)
     st.markdown("### ⏱️ Time Series Analysis")
     
     # Check for datetime columns
-    datetime_cols = df.select_dtypes(include=['datetime64']).columns.tolist()
+    datetime_cols = get_profile(df).datetime_columns
     
     # Try to identify potential date columns
     potential_date_cols = []
     for col in df.columns:
-        if df[col].dtype == 'object':
+        if df[col].dtype in ['object', 'string']:
             try:
                 pd.to_datetime(df[col].head(10))
                 potential_date_cols.append(col)
@@ -29,7 +38,7 @@ def render(df):
         
         # Show columns that might be dates
         st.markdown("#### 🔍 Potential Date Columns")
-        text_cols = df.select_dtypes(include=['object']).columns.tolist()
+        text_cols = get_profile(df).categorical_columns
         if text_cols:
             st.write("Columns that might contain dates:", ", ".join(text_cols[:5]))
         
@@ -45,7 +54,7 @@ def render(df):
         st.markdown("#### 📅 Select Time Series Data")
         
         # Date column selection
-        date_col = st.selectbox("Select date column", all_date_cols)
+        date_col = st.selectbox("Select date column", all_date_cols, key="ts_date_col", persist_state="session")
         
         # Convert if needed
         if date_col in potential_date_cols:
@@ -58,17 +67,17 @@ def render(df):
                 return
         
         # Value column selection
-        numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
+        numeric_cols = get_profile(df).numeric_columns
         
         if not numeric_cols:
             st.warning("No numeric columns found for time series analysis")
             st.markdown('</div>', unsafe_allow_html=True)
             return
         
-        value_col = st.selectbox("Select value column", numeric_cols)
+        value_col = st.selectbox("Select value column", numeric_cols, key="ts_value_col", persist_state="session")
         
-        # Sort by date
-        df_sorted = df.sort_values(date_col)
+        # Sort by date, carrying only the two columns the charts use
+        df_sorted = _sorted_values(date_col, value_col)
         
         # Basic time series plot
         st.markdown("#### 📈 Time Series Visualization")
@@ -95,109 +104,9 @@ def render(df):
         
         st.plotly_chart(fig, use_container_width=True)
         
-        # Aggregation options
-        st.markdown("#### 📊 Time-Based Aggregation")
-        
-        col_a, col_b = st.columns(2)
-        
-        with col_a:
-            agg_period = st.selectbox(
-                "Aggregation period",
-                ["Daily", "Weekly", "Monthly", "Quarterly", "Yearly"]
-            )
-        
-        with col_b:
-            agg_method = st.selectbox(
-                "Aggregation method",
-                ["Mean", "Sum", "Count", "Min", "Max", "Median"]
-            )
-        
-        # Perform aggregation
-        df_agg = df_sorted.copy()
-        df_agg.set_index(date_col, inplace=True)
-        
-        period_map = {
-            "Daily": "D",
-            "Weekly": "W",
-            "Monthly": "M",
-            "Quarterly": "Q",
-            "Yearly": "Y"
-        }
-        
-        method_map = {
-            "Mean": "mean",
-            "Sum": "sum",
-            "Count": "count",
-            "Min": "min",
-            "Max": "max",
-            "Median": "median"
-        }
-        
-        try:
-            aggregated = df_agg[value_col].resample(period_map[agg_period]).agg(method_map[agg_method])
-            
-            fig2 = go.Figure()
-            
-            fig2.add_trace(go.Bar(
-                x=aggregated.index,
-                y=aggregated.values,
-                name=f'{agg_method} by {agg_period}',
-                marker_color='#48bb78'
-            ))
-            
-            fig2.update_layout(
-                title=f'{agg_method} of {value_col} by {agg_period}',
-                xaxis_title='Date',
-                yaxis_title=value_col,
-                template='plotly_white',
-                height=400
-            )
-            
-            st.plotly_chart(fig2, use_container_width=True)
-            
-        except Exception as e:
-            st.error(f"❌ Aggregation failed: {str(e)}")
-        
-        # Moving average
-        st.markdown("#### 📉 Moving Average")
-        
-        window_size = st.slider("Window size (periods)", min_value=2, max_value=30, value=7)
-        
-        try:
-            df_sorted['Moving_Avg'] = df_sorted[value_col].rolling(window=window_size).mean()
-            
-            fig3 = go.Figure()
-            
-            fig3.add_trace(go.Scatter(
-                x=df_sorted[date_col],
-                y=df_sorted[value_col],
-                mode='lines',
-                name='Original',
-                line=dict(color='lightgray', width=1),
-                opacity=0.5
-            ))
-            
-            fig3.add_trace(go.Scatter(
-                x=df_sorted[date_col],
-                y=df_sorted['Moving_Avg'],
-                mode='lines',
-                name=f'{window_size}-Period MA',
-                line=dict(color='#667eea', width=3)
-            ))
-            
-            fig3.update_layout(
-                title=f'{value_col} with {window_size}-Period Moving Average',
-                xaxis_title='Date',
-                yaxis_title=value_col,
-                template='plotly_white',
-                height=400,
-                hovermode='x unified'
-            )
-            
-            st.plotly_chart(fig3, use_container_width=True)
-            
-        except Exception as e:
-            st.error(f"❌ Moving average calculation failed: {str(e)}")
+        # Each chart below reruns on its own when its controls change
+        _aggregation_chart(date_col, value_col)
+        _moving_average_chart(date_col, value_col)
     
     with col2:
         st.markdown("#### 📊 Time Series Statistics")
@@ -233,4 +142,124 @@ def render(df):
         - Consider different aggregation periods
         """)
     
-    st.markdown('</div>', unsafe_allow_html=True)
\ No newline at end of file
+    st.markdown('</div>', unsafe_allow_html=True)
+
+def _sorted_values(date_col, value_col):
+    """Date and value columns of the session's dataset in date order"""
+    df = session_dataset()
+    # The date order is computed once per dataset version, so the panel and each chart only gather rows
+    return df[[date_col, value_col]].take(get_profile(df).sort_order(date_col))
+
+@st.fragment
+def _aggregation_chart(date_col, value_col):
+    """Resampled values for the chosen period and method"""
+    df_sorted = _sorted_values(date_col, value_col)
+    st.markdown("#### 📊 Time-Based Aggregation")
+    
+    col_a, col_b = st.columns(2)
+    
+    with col_a:
+        agg_period = st.selectbox(
+            "Aggregation period",
+            ["Daily", "Weekly", "Monthly", "Quarterly", "Yearly"],
+            key="ts_agg_period",
+            persist_state="session"
+        )
+    
+    with col_b:
+        agg_method = st.selectbox(
+            "Aggregation method",
+            ["Mean", "Sum", "Count", "Min", "Max", "Median"],
+            key="ts_agg_method",
+            persist_state="session"
+        )
+    
+    # Perform aggregation
+    df_agg = df_sorted.set_index(date_col)
+    
+    period_map = {
+        "Daily": "D",
+        "Weekly": "W",
+        "Monthly": "M",
+        "Quarterly": "Q",
+        "Yearly": "Y"
+    }
+    
+    method_map = {
+        "Mean": "mean",
+        "Sum": "sum",
+        "Count": "count",
+        "Min": "min",
+        "Max": "max",
+        "Median": "median"
+    }
+    
+    try:
+        aggregated = df_agg[value_col].resample(period_map[agg_period]).agg(method_map[agg_method])
+        
+        fig2 = go.Figure()
+        
+        fig2.add_trace(go.Bar(
+            x=aggregated.index,
+            y=aggregated.values,
+            name=f'{agg_method} by {agg_period}',
+            marker_color='#48bb78'
+        ))
+        
+        fig2.update_layout(
+            title=f'{agg_method} of {value_col} by {agg_period}',
+            xaxis_title='Date',
+            yaxis_title=value_col,
+            template='plotly_white',
+            height=400
+        )
+        
+        st.plotly_chart(fig2, use_container_width=True)
+        
+    except Exception as e:
+        st.error(f"❌ Aggregation failed: {str(e)}")
+
+@st.fragment
+def _moving_average_chart(date_col, value_col):
+    """Values smoothed with a moving average over the chosen window"""
+    df_sorted = _sorted_values(date_col, value_col)
+    st.markdown("#### 📉 Moving Average")
+    
+    window_size = st.slider("Window size (periods)", min_value=2, max_value=30, value=7, key="ts_window_size", persist_state="session")
+    
+    try:
+        moving_avg = df_sorted[value_col].rolling(window=window_size).mean()
+        
+        fig3 = go.Figure()
+        
+        fig3.add_trace(go.Scatter(
+            x=df_sorted[date_col],
+            y=df_sorted[value_col],
+            mode='lines',
+            name='Original',
+            line=dict(color='lightgray', width=1),
+            opacity=0.5
+        ))
+        
+        fig3.add_trace(go.Scatter(
+            x=df_sorted[date_col],
+            y=moving_avg,
+            mode='lines',
+            name=f'{window_size}-Period MA',
+            line=dict(color='#667eea', width=3)
+        ))
+        
+        fig3.update_layout(
+            title=f'{value_col} with {window_size}-Period Moving Average',
+            xaxis_title='Date',
+            yaxis_title=value_col,
+            template='plotly_white',
+            height=400,
+            hovermode='x unified'
+        )
+        
+        st.plotly_chart(fig3, use_container_width=True)
+        
+    except Exception as e:
+        st.error(f"❌ Moving average calculation failed: {str(e)}")
+
@@ -2,10 +2,22 @@
 # FILE: pages/visualizations.py (FIXED - Colorscale Error)
 # ============================================
 import streamlit as st
+import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+from utils.dataset_profile import get_profile
+from components.memory_status import session_dataset
 
 def render(df):
+    # A fragment, so a control change reruns the studio only, not the whole app
+    _studio()
+
+@st.fragment
+def _studio():
+    """Chart controls and the chart they drive"""
+    # Read from the session on every rerun rather than held by the fragment
+    df = session_dataset()
+    profile = get_profile(df)
     st.markdown('<div class="card-container">', unsafe_allow_html=True)
     
     st.markdown("### 🎨 Advanced Visualization Studio")
@@ -14,18 +26,18 @@ def render(df):
     col1, col2, col3, col4, col5 = st.columns([2, 2, 2, 1, 1])
     
     with col1:
-        x_axis = st.selectbox("📊 X-Axis", options=['None'] + df.columns.tolist())
+        x_axis = st.selectbox("📊 X-Axis", options=['None'] + df.columns.tolist(), key="viz_x_axis", persist_state="session")
     with col2:
-        y_axis = st.selectbox("📈 Y-Axis", options=['None'] + df.columns.tolist())
+        y_axis = st.selectbox("📈 Y-Axis", options=['None'] + df.columns.tolist(), key="viz_y_axis", persist_state="session")
     with col3:
         chart_type = st.selectbox("📉 Chart Type", 
                                  options=['Scatter', 'Line', 'Bar', 'Box', 'Histogram', 
                                          'Violin', 'Heatmap', 'Pie', 'Area', 'Funnel', 
-                                         'Treemap', 'Sunburst', '3D Scatter'])
+                                         'Treemap', 'Sunburst', '3D Scatter'], key="viz_chart_type", persist_state="session")
     with col4:
-        color_by = st.selectbox("🎨 Color By", options=['None'] + df.columns.tolist())
+        color_by = st.selectbox("🎨 Color By", options=['None'] + df.columns.tolist(), key="viz_color_by", persist_state="session")
     with col5:
-        size_by = st.selectbox("📏 Size By", options=['None'] + df.select_dtypes(include=['number']).columns.tolist())
+        size_by = st.selectbox("📏 Size By", options=['None'] + profile.numeric_columns, key="viz_size_by", persist_state="session")
     
     # Advanced options
     with st.expander("⚙️ Advanced Options"):
@@ -34,13 +46,13 @@ def render(df):
         with col1:
             color_scheme = st.selectbox("Color Scheme", 
                                        options=['Plotly', 'Viridis', 'Cividis', 'Blues', 
-                                               'Reds', 'Greens', 'Purples', 'Rainbow'])
+                                               'Reds', 'Greens', 'Purples', 'Rainbow'], key="viz_color_scheme", persist_state="session")
         with col2:
-            chart_height = st.slider("Chart Height", 400, 800, 550)
+            chart_height = st.slider("Chart Height", 400, 800, 550, key="viz_chart_height", persist_state="session")
         with col3:
-            show_grid = st.checkbox("Show Grid", value=True)
+            show_grid = st.checkbox("Show Grid", value=True, key="viz_show_grid", persist_state="session")
         with col4:
-            show_legend = st.checkbox("Show Legend", value=True)
+            show_legend = st.checkbox("Show Legend", value=True, key="viz_show_legend", persist_state="session")
     
     st.markdown("---")
     
@@ -144,7 +156,7 @@ def render(df):
                 return
         
         elif chart_type == 'Heatmap':
-            numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
+            numeric_cols = profile.numeric_columns
             if len(numeric_cols) >= 2:
                 corr_matrix = df[numeric_cols].corr()
                 fig = px.imshow(corr_matrix, 
@@ -194,7 +206,7 @@ def render(df):
         elif chart_type == 'Treemap':
             if x_axis != 'None' and y_axis != 'None':
                 # Check if y_axis is numeric
-                if df[y_axis].dtype in ['int64', 'float64']:
+                if pd.api.types.is_numeric_dtype(df[y_axis]):
                     fig = px.treemap(df, path=[x_axis], values=y_axis,
                                    title=f'Treemap: {y_axis} by {x_axis}',
                                    color_discrete_sequence=discrete_color_map[color_scheme])
@@ -210,7 +222,7 @@ def render(df):
         elif chart_type == 'Sunburst':
             if x_axis != 'None' and y_axis != 'None':
                 # Check if y_axis is numeric
-                if df[y_axis].dtype in ['int64', 'float64']:
+                if pd.api.types.is_numeric_dtype(df[y_axis]):
                     fig = px.sunburst(df, path=[x_axis], values=y_axis,
                                     title=f'Sunburst: {y_axis} by {x_axis}',
                                     color_discrete_sequence=discrete_color_map[color_scheme])
@@ -224,9 +236,9 @@ def render(df):
                 return
         
         elif chart_type == '3D Scatter':
-            numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
+            numeric_cols = profile.numeric_columns
             if len(numeric_cols) >= 3:
-                z_axis = st.selectbox("📊 Z-Axis", options=numeric_cols)
+                z_axis = st.selectbox("📊 Z-Axis", options=numeric_cols, key="viz_z_axis", persist_state="session")
                 if x_axis != 'None' and y_axis != 'None':
                     fig = px.scatter_3d(df, x=x_axis, y=y_axis, z=z_axis,
                                       color=color_param,
@@ -284,8 +296,8 @@ def render(df):
     
     col1, col2, col3, col4 = st.columns(4)
     
-    numeric_cols = df.select_dtypes(include=['number']).columns.tolist()
-    categorical_cols = df.select_dtypes(include=['object']).columns.tolist()
+    numeric_cols = profile.numeric_columns
+    categorical_cols = profile.categorical_columns
     
     suggestions = []
     
@@ -0,0 +1,8 @@
+# ============================================
+# FILE: tests/conftest.py (NEW)
+# ============================================
+import pandas as pd
+
+# The app runs pandas with copy-on-write (always on from pandas 3), so the tests do as well
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
@@ -0,0 +1,70 @@
+# ============================================
+# FILE: tests/test_cardinality.py (NEW)
+# ============================================
+import numpy as np
+import pandas as pd
+import pytest
+from utils.cardinality import HyperLogLog, precision_for_error, column_sketch, approximate_distinct_counts
+
+def _hashes(n, seed):
+    return np.random.default_rng(seed).integers(0, 2**64 - 1, n, dtype=np.uint64, endpoint=True)
+
+def test_precision_grows_with_accuracy():
+    precisions = [precision_for_error(error) for error in [0.05, 0.02, 0.01, 0.005]]
+    assert precisions == sorted(precisions)
+    assert all(4 <= p <= 18 for p in precisions)
+
+@pytest.mark.parametrize('error', [0.01, 0.05])
+@pytest.mark.parametrize('n', [500, 50_000, 150_000, 1_000_000])
+def test_estimates_stay_within_the_error_bound(error, n):
+    # The bound is sized to hold about 19 times in 20, so most of a handful of sketches must land inside it
+    precision = precision_for_error(error)
+    errors = [abs(HyperLogLog(precision).add_hashes(_hashes(n, seed)).count() / n - 1) for seed in range(10)]
+    assert sum(e <= error for e in errors) >= 8
+    assert max(errors) <= 2 * error
+
+def test_repeated_values_are_counted_once():
+    sketch = HyperLogLog(14).add_hashes(np.tile(_hashes(5000, 1), 20))
+    assert abs(sketch.count() / 5000 - 1) < 0.02
+
+def test_merged_chunks_equal_one_sketch():
+    hashes = _hashes(200_000, 2)
+    whole = HyperLogLog(12).add_hashes(hashes)
+    merged = HyperLogLog(12).add_hashes(hashes[:50_000]).merge(HyperLogLog(12).add_hashes(hashes[50_000:]))
+    np.testing.assert_array_equal(whole.registers, merged.registers)
+    assert whole.count() == merged.count()
+
+def test_merge_needs_the_same_precision():
+    with pytest.raises(ValueError):
+        HyperLogLog(12).merge(HyperLogLog(14))
+
+def test_empty_sketch_counts_zero():
+    assert HyperLogLog(12).count() == 0
+    assert HyperLogLog(12).add_hashes(np.array([], dtype=np.uint64)).count() == 0
+
+def test_column_sketch_ignores_chunking_and_missing_values():
+    series = pd.Series(np.r_[np.arange(30_000, dtype=float), [np.nan] * 100])
+    chunked = column_sketch(series, 14, chunk_rows=7_000)
+    assert chunked.count() == column_sketch(series, 14, chunk_rows=1_000_000).count()
+    assert abs(chunked.count() / 30_000 - 1) < 0.03
+
+def test_approximate_counts_per_column():
+    df = pd.DataFrame({
+        'ids': np.arange(20_000),
+        'text': pd.Series(np.arange(20_000) % 300).astype(str),
+        'cat': pd.Categorical(['a', 'b'] * 10_000, categories=['a', 'b', 'unused']),
+        'flag': [True, False] * 10_000,
+    })
+    counts = approximate_distinct_counts(df, 0.01)
+    exact = df.nunique()
+    assert counts['cat'] == 2 and counts['flag'] == 2
+    assert abs(counts['ids'] / exact['ids'] - 1) <= 0.01
+    # Text is cheaper to count exactly than to hash into a sketch
+    assert counts['text'] == exact['text']
+
+@pytest.mark.parametrize('dtype', [object, 'string[pyarrow]'])
+def test_text_columns_counted_exactly(dtype):
+    pytest.importorskip('pyarrow')
+    series = pd.Series(np.arange(50_000).astype(str), dtype=dtype)
+    counts = approximate_distinct_counts(series.to_frame('text'), 0.05)
+    assert counts['text'] == 50_000
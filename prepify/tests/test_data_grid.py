@@ -0,0 +1,29 @@
+# ============================================
+# FILE: tests/test_data_grid.py (NEW)
+# ============================================
+import numpy as np
+import pandas as pd
+from utils.data_grid import sort_positions, sample_positions, page_count, page_frame
+
+def test_sort_positions_put_missing_values_last():
+    series = pd.Series([3.0, np.nan, 1.0, 2.0], index=[10, 11, 12, 13])
+    assert sort_positions(series).tolist() == [2, 3, 0, 1]
+    assert sort_positions(series, ascending=False).tolist() == [0, 3, 2, 1]
+
+def test_sort_positions_of_mixed_types_use_their_text():
+    series = pd.Series([3, 'b', 1, None, 'a', 2.5], dtype=object)
+    assert series.iloc[sort_positions(series)].tolist() == [1, 2.5, 3, 'a', 'b', None]
+
+def test_sample_positions():
+    assert sample_positions(10, "First N", 3).tolist() == [0, 1, 2]
+    assert sample_positions(10, "Last N", 3).tolist() == [7, 8, 9]
+    random = sample_positions(10, "Random", 20, seed=1)
+    assert sorted(random.tolist()) == list(range(10))
+    assert sample_positions(10, "Random", 4, seed=1).tolist() == sample_positions(10, "Random", 4, seed=1).tolist()
+
+def test_pages_slice_only_their_rows():
+    df = pd.DataFrame({'a': range(10), 'b': range(10, 20)})
+    assert page_count(10, 4) == 3 and page_count(0, 4) == 1
+    assert page_frame(df, None, 3, 4)['a'].tolist() == [8, 9]
+    positions = np.arange(10)[::-1]
+    assert page_frame(df, positions, 1, 4, columns=['b']).to_dict('list') == {'b': [19, 18, 17, 16]}
@@ -0,0 +1,55 @@
+# ============================================
+# FILE: tests/test_data_loader.py (NEW)
+# ============================================
+import io
+import pandas as pd
+import pytest
+from utils.data_loader import _load_xlsx_streaming, load_csv_chunked, read_schema
+
+def _workbook(*rows):
+    openpyxl = pytest.importorskip('openpyxl')
+    workbook = openpyxl.Workbook()
+    for row in rows:
+        workbook.active.append(row)
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+@pytest.mark.parametrize('header', [['a', 'a', 'a.1', None, 'a'], [None, 'Unnamed: 0', 'b', 'b', 'b.1']])
+def test_streaming_reader_names_columns_like_pandas(header):
+    values = list(range(len(header)))
+    df = _load_xlsx_streaming(_workbook(header, values), None, None, None, 1, None)
+    expected = pd.read_excel(_workbook(header, values))
+    assert df.columns.tolist() == expected.columns.tolist()
+    assert df.iloc[0].tolist() == values
+
+def test_streaming_reader_selects_repeated_columns_by_position():
+    df = _load_xlsx_streaming(_workbook(['a', 'b', 'a'], [1, 2, 3]), None, ['a.1', 'a'], None, 1, None)
+    assert df.columns.tolist() == ['a.1', 'a']
+    assert df.iloc[0].tolist() == [3, 1]
+
+REPEATED_HEADER_CSV = b"a,a,b,\n1,2,3,4\n5,6,7,8\n"
+
+@pytest.mark.parametrize('engine', ['pyarrow', 'pandas'])
+def test_csv_repeated_and_blank_headers_named_like_pandas(engine):
+    if engine == 'pyarrow':
+        pytest.importorskip('pyarrow')
+    df = load_csv_chunked(io.BytesIO(REPEATED_HEADER_CSV), engine=engine)
+    assert df.columns.tolist() == ['a', 'a.1', 'b', 'Unnamed: 3']
+    assert df['a.1'].tolist() == [2, 6]
+
+@pytest.mark.parametrize('engine', ['pyarrow', 'pandas'])
+def test_csv_renamed_column_offered_by_schema_can_be_selected(engine):
+    if engine == 'pyarrow':
+        pytest.importorskip('pyarrow')
+    file = io.BytesIO(REPEATED_HEADER_CSV)
+    assert read_schema(file, 'csv') == ['a', 'a.1', 'b', 'Unnamed: 3']
+    df = load_csv_chunked(file, engine=engine, columns=['a.1', 'Unnamed: 3'])
+    assert df.columns.tolist() == ['a.1', 'Unnamed: 3']
+    assert df.values.tolist() == [[2, 4], [6, 8]]
+
+def test_csv_unknown_column_fails_like_the_pandas_parser():
+    pytest.importorskip('pyarrow')
+    with pytest.raises(ValueError, match='Usecols'):
+        load_csv_chunked(io.BytesIO(REPEATED_HEADER_CSV), engine='pyarrow', columns=['missing'])
@@ -0,0 +1,37 @@
+# ============================================
+# FILE: tests/test_dataset_cache.py (NEW)
+# ============================================
+import os
+import pandas as pd
+from utils.dataset_cache import DatasetCache
+
+def _frame(n):
+    return pd.DataFrame({'v': range(n)})
+
+def test_disk_entries_survive_a_memory_eviction(tmp_path):
+    cache = DatasetCache(max_bytes=0, disk_dir=str(tmp_path), disk_max_bytes=10**9)
+    cache.put('k', _frame(10))
+    pd.testing.assert_frame_equal(cache.get('k'), _frame(10))
+
+def test_eviction_ignores_files_removed_by_another_session(tmp_path, monkeypatch):
+    cache = DatasetCache(max_bytes=0, disk_dir=str(tmp_path), disk_max_bytes=1)
+    cache.put('a', _frame(10))
+    real_remove = os.remove
+
+    def remove_twice(path):
+        # Another session evicts the same file first
+        real_remove(path)
+        real_remove(path)
+    monkeypatch.setattr(os, 'remove', remove_twice)
+    cache.put('b', _frame(10))
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.pkl')]
+
+def test_failed_disk_write_keeps_the_memory_entry(tmp_path, monkeypatch):
+    cache = DatasetCache(max_bytes=10**9, disk_dir=str(tmp_path), disk_max_bytes=10**9)
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+    monkeypatch.setattr(pd.DataFrame, 'to_pickle', fail)
+    cache.put('k', _frame(10))
+    pd.testing.assert_frame_equal(cache.get('k'), _frame(10))
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,101 @@
+# ============================================
+# FILE: tests/test_dataset_history.py (NEW)
+# ============================================
+import numpy as np
+import pandas as pd
+import pytest
+import utils.dataset_history as dataset_history
+from utils.dataset_history import DatasetHistory
+from utils.operations import make_operation, apply_operation, replay, export_log, load_log, describe_operation
+
+@pytest.fixture(autouse=True)
+def spill_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(dataset_history, 'HISTORY_SPILL_DIR', str(tmp_path))
+    return tmp_path
+
+@pytest.fixture
+def base():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'x': rng.normal(size=200),
+        'y': rng.integers(0, 100, 200).astype(float),
+        'kind': rng.choice(['a', 'b', 'c'], 200)
+    })
+
+OPERATIONS = [
+    make_operation('filter_range', column='y', low=5.0, high=95.0),
+    make_operation('scale', columns=['x'], method="Min-Max Normalization (0-1)"),
+    make_operation('encode', column='kind', method="Label Encoding"),
+    make_operation('filter_values', column='kind', values=[0, 1]),
+    make_operation('convert_type', column='y', new_type='int'),
+    make_operation('scale', columns=['y'], method="Z-Score Standardization"),
+    make_operation('filter_range', column='x', low=0.1, high=0.9),
+]
+
+def _states(base, operations):
+    """The dataset after each number of operations, applied one at a time"""
+    states = [base]
+    for operation in operations:
+        states.append(apply_operation(states[-1], operation))
+    return states
+
+def _history(base, operations, **options):
+    history = DatasetHistory(base=base, **options)
+    df = base
+    for operation in operations:
+        df = apply_operation(df, operation)
+        history.push(df, operation)
+    return history, df
+
+def test_log_round_trip():
+    operations = load_log(export_log(OPERATIONS))
+    assert operations == load_log(export_log(operations))
+    assert [describe_operation(operation) for operation in operations][0] == "Filter y to 5.0 - 95.0"
+
+@pytest.mark.parametrize('text', ['[]', '{"operations": [{"op": "drop_table", "params": {}}]}'])
+def test_log_rejects_unknown_content(text):
+    with pytest.raises(ValueError):
+        load_log(text)
+
+def test_replay_matches_step_by_step(base):
+    pd.testing.assert_frame_equal(replay(base, OPERATIONS), _states(base, OPERATIONS)[-1])
+
+@pytest.mark.parametrize('checkpoint_every', [1, 3, 100])
+def test_undo_and_redo_across_checkpoints(base, checkpoint_every):
+    states = _states(base, OPERATIONS)
+    history, df = _history(base, OPERATIONS, checkpoint_every=checkpoint_every)
+    for position in range(len(OPERATIONS) - 1, -1, -1):
+        df = history.undo()
+        assert len(history) == position
+        pd.testing.assert_frame_equal(df, states[position])
+    for position in range(1, len(OPERATIONS) + 1):
+        df = history.redo(df)
+        pd.testing.assert_frame_equal(df, states[position])
+    assert not history.can_redo
+
+def test_new_operation_replaces_redo_steps(base):
+    history, _ = _history(base, OPERATIONS, checkpoint_every=2)
+    for _ in range(3):
+        df = history.undo()
+    operation = make_operation('remove_missing')
+    history.push(apply_operation(df, operation), operation)
+    assert len(history.operations) == len(OPERATIONS) - 2
+    assert not history.can_redo
+    pd.testing.assert_frame_equal(history.undo(), _states(base, OPERATIONS)[len(OPERATIONS) - 3])
+
+def test_oldest_steps_fold_into_the_base(base):
+    states = _states(base, OPERATIONS)
+    history, _ = _history(base, OPERATIONS, max_depth=3, checkpoint_every=2)
+    assert len(history) == 3 and history.evicted == len(OPERATIONS) - 3
+    pd.testing.assert_frame_equal(history.base, states[len(OPERATIONS) - 3])
+    for _ in range(3):
+        df = history.undo()
+    pd.testing.assert_frame_equal(df, states[len(OPERATIONS) - 3])
+
+def test_spilled_checkpoints_rebuild_the_same_states(base, spill_dir):
+    states = _states(base, OPERATIONS)
+    history, _ = _history(base, OPERATIONS, max_bytes=0, checkpoint_every=2)
+    assert history.stats()['spilled'] > 0
+    assert any(spill_dir.iterdir())
+    for position in range(len(OPERATIONS) - 1, -1, -1):
+        pd.testing.assert_frame_equal(history.undo(), states[position])
@@ -0,0 +1,62 @@
+# ============================================
+# FILE: tests/test_duplicates.py (NEW)
+# ============================================
+import numpy as np
+import pandas as pd
+import pytest
+from utils.duplicates import DuplicateIndex
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    n = 2000
+    return pd.DataFrame({
+        'num': rng.integers(0, 20, n).astype(float),
+        'signed': rng.choice([0.0, -0.0, 1.5, np.nan], n),
+        'text': rng.choice(['a', 'b', None], n).astype(object),
+        'mixed': pd.Series(rng.choice([1, 1.0, 'x'], n), dtype=object),
+        'cat': pd.Categorical(rng.choice(['p', 'q'], n)),
+    })
+
+@pytest.mark.parametrize('keep', ['first', 'last', False])
+def test_mask_matches_pandas(frame, keep):
+    index = DuplicateIndex(frame)
+    assert index.hashes is not None
+    np.testing.assert_array_equal(index.mask(keep), frame.duplicated(keep=keep).to_numpy())
+
+@pytest.mark.parametrize('subset', [['num'], ['signed'], ['signed', 'mixed'], ['text', 'cat']])
+def test_subset_matches_pandas(frame, subset):
+    index = DuplicateIndex(frame, subset)
+    assert index.count() == frame.duplicated(subset=subset).sum()
+
+def test_signed_zero_and_nan_are_duplicates():
+    df = pd.DataFrame({'a': [0.0, -0.0, 1.0, 1.0, np.nan, np.nan]})
+    assert DuplicateIndex(df).count() == df.duplicated().sum() == 3
+
+def test_unhashable_values_fall_back_to_pandas():
+    df = pd.DataFrame({'a': pd.Series([[1], [1], [2]], dtype=object)})
+    index = DuplicateIndex(df)
+    assert index.hashes is None
+    assert index.count() == 1
+
+def test_restrict_matches_pandas_on_remaining_rows(frame):
+    index = DuplicateIndex(frame)
+    subset = frame[frame['num'] > 5]
+    restricted = index.restrict(subset)
+    assert restricted is not None
+    np.testing.assert_array_equal(restricted.hashes, DuplicateIndex(subset).hashes)
+    np.testing.assert_array_equal(restricted.mask(), subset.duplicated().to_numpy())
+
+def test_restrict_needs_rows_of_the_parent(frame):
+    index = DuplicateIndex(frame)
+    assert index.restrict(frame.set_axis(range(1, len(frame) + 1))) is None
+
+def test_groups_label_every_copy():
+    df = pd.DataFrame({'a': [1, 2, 1, 3, 2, 1], 'b': ['x', 'y', 'x', 'z', 'y', 'x']})
+    index = DuplicateIndex(df)
+    groups = index.groups()
+    assert len(groups) == 5
+    assert sorted(groups['copies'].tolist()) == [2, 2, 3, 3, 3]
+    assert groups['group'].nunique() == 2
+    # Computed once per index, not on every rerun of the page
+    assert index.groups() is groups
@@ -0,0 +1,103 @@
+# ============================================
+# FILE: tests/test_file_handlers.py (NEW)
+# ============================================
+import io
+import gzip
+import json
+import zipfile
+import numpy as np
+import pandas as pd
+import pytest
+import utils.file_handlers as file_handlers
+from utils.file_handlers import export_dataframe, export_file_name, export_mime
+
+@pytest.fixture(autouse=True)
+def small_batches(monkeypatch):
+    # Several batches even for a small frame, so the joins between batches are exercised
+    monkeypatch.setattr(file_handlers, 'EXPORT_BATCH_ROWS', 7)
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({
+        'id': np.arange(30),
+        'value': np.linspace(0, 1, 30),
+        'text': [f"row {i}, \"quoted\"" if i % 5 else None for i in range(30)]
+    })
+
+def _pandas_text(df, export_format):
+    if export_format == 'CSV':
+        return df.to_csv(index=False)
+    if export_format == 'JSON':
+        return df.to_json(orient='records')
+    return df.to_json(orient='records', lines=True)
+
+@pytest.mark.parametrize('export_format', ['CSV', 'JSON', 'JSON Lines'])
+@pytest.mark.parametrize('rows', [0, 1, 7, 30])
+def test_text_exports_match_pandas(frame, export_format, rows):
+    df = frame.head(rows)
+    export = export_dataframe(df, export_format)
+    # An empty JSON Lines export holds no lines at all, where pandas writes one empty line
+    expected = '' if export_format == 'JSON Lines' and not rows else _pandas_text(df, export_format)
+    assert export.read_bytes().decode('utf-8') == expected
+    assert export.size == len(export.read_bytes())
+
+def test_json_export_is_one_array(frame):
+    records = json.loads(export_dataframe(frame, 'JSON').read_bytes())
+    assert len(records) == len(frame) and records[3]['id'] == 3
+
+def _decompress(data, compression, member_name):
+    if compression == 'gzip':
+        return gzip.decompress(data)
+    if compression == 'zip':
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            assert archive.namelist() == [member_name]
+            return archive.read(member_name)
+    zstandard = pytest.importorskip('zstandard')
+    return zstandard.ZstdDecompressor().stream_reader(io.BytesIO(data)).read()
+
+@pytest.mark.parametrize('compression', ['gzip', 'zip', 'zstd'])
+@pytest.mark.parametrize('export_format', ['CSV', 'JSON Lines'])
+def test_compressed_exports_round_trip(frame, export_format, compression):
+    if compression == 'zstd':
+        pytest.importorskip('zstandard')
+    data = export_dataframe(frame, export_format, compression).read_bytes()
+    member_name = export_file_name('exported_data', export_format)
+    assert _decompress(data, compression, member_name).decode('utf-8') == _pandas_text(frame, export_format)
+
+def test_progress_reaches_every_row(frame):
+    updates = []
+    export_dataframe(frame, 'CSV', on_progress=lambda fraction, rows: updates.append((fraction, rows)))
+    assert len(updates) == 5
+    assert updates[-1] == (1.0, len(frame))
+    assert [rows for _, rows in updates] == sorted(rows for _, rows in updates)
+
+@pytest.mark.parametrize('export_format, compression', [('Parquet', 'snappy'), ('Parquet', 'none'), ('Feather', 'zstd')])
+def test_binary_exports_round_trip(frame, export_format, compression):
+    pytest.importorskip('pyarrow')
+    data = io.BytesIO(export_dataframe(frame, export_format, compression).read_bytes())
+    df = pd.read_parquet(data) if export_format == 'Parquet' else pd.read_feather(data)
+    pd.testing.assert_frame_equal(df, frame)
+
+def test_excel_export_round_trips(frame):
+    pytest.importorskip('openpyxl')
+    df = pd.read_excel(io.BytesIO(export_dataframe(frame, 'Excel').read_bytes()))
+    # Empty cells come back as NaN
+    pd.testing.assert_frame_equal(df, frame.assign(text=frame['text'].where(frame['text'].notna(), np.nan)))
+
+@pytest.mark.parametrize('convert', ['convert_df_to_csv', 'convert_df_to_json', 'convert_df_to_parquet'])
+def test_download_helpers_close_their_export_files(frame, convert, monkeypatch):
+    exports = []
+    export = file_handlers.export_dataframe
+    monkeypatch.setattr(file_handlers, 'export_dataframe', lambda *args: exports.append(export(*args)) or exports[-1])
+    data = getattr(file_handlers, convert)(frame)
+    assert data and exports[0].file.closed
+
+def test_file_names_and_mime_types():
+    assert export_file_name('data', 'CSV') == 'data.csv'
+    assert export_file_name('data', 'CSV', 'gzip') == 'data.csv.gz'
+    assert export_file_name('data', 'JSON Lines', 'zstd') == 'data.jsonl.zst'
+    assert export_file_name('data', 'JSON', 'zip') == 'data.zip'
+    # Parquet compression is inside the file, not around it
+    assert export_file_name('data', 'Parquet', 'zstd') == 'data.parquet'
+    assert export_mime('CSV', 'gzip') == 'application/gzip'
+    assert export_mime('CSV', 'none') == 'text/csv'
@@ -0,0 +1,55 @@
+# ============================================
+# FILE: tests/test_multi_file.py (NEW)
+# ============================================
+import numpy as np
+import pandas as pd
+from utils.multi_file import combine_frames
+
+def test_numeric_columns_widen():
+    a = pd.DataFrame({'x': np.array([1, 2], dtype='int8')})
+    b = pd.DataFrame({'x': np.array([2.5], dtype='float32')})
+    df, report = combine_frames(['a', 'b'], [a, b])
+    assert df['x'].dtype == np.result_type(np.int8, np.float32)
+    assert df['x'].tolist() == [1.0, 2.0, 2.5]
+    assert report.loc[report['Column'] == 'x', 'Status'].item() == 'Types differ'
+
+def test_missing_integer_column_becomes_float():
+    a = pd.DataFrame({'x': [1, 2], 'y': [10, 20]})
+    b = pd.DataFrame({'x': [3]})
+    df, _ = combine_frames(['a', 'b'], [a, b])
+    assert df['y'].dtype == np.float64
+    assert df['y'].isna().tolist() == [False, False, True]
+
+def test_mixed_kinds_become_text():
+    a = pd.DataFrame({'x': [1, 2]})
+    b = pd.DataFrame({'x': ['three']})
+    df, _ = combine_frames(['a', 'b'], [a, b])
+    assert pd.api.types.is_string_dtype(df['x'].dtype) or df['x'].dtype == object
+    assert df['x'].astype(str).tolist() == ['1', '2', 'three']
+
+def test_empty_column_takes_the_type_of_the_others():
+    a = pd.DataFrame({'x': [1.5, 2.5]})
+    b = pd.DataFrame({'x': pd.Series([None], dtype=object)})
+    df, _ = combine_frames(['a', 'b'], [a, b])
+    assert df['x'].dtype == np.float64
+
+def test_naive_and_aware_timestamps_combine_in_utc():
+    a = pd.DataFrame({'t': pd.to_datetime(['2024-01-01 10:00']).tz_localize('Europe/Berlin')})
+    b = pd.DataFrame({'t': pd.to_datetime(['2024-01-02 00:00'])})
+    df, _ = combine_frames(['a', 'b'], [a, b])
+    assert df['t'].dtype == pd.DatetimeTZDtype('ns', 'UTC')
+    assert df['t'].tolist() == [pd.Timestamp('2024-01-01 09:00', tz='UTC'), pd.Timestamp('2024-01-02', tz='UTC')]
+
+def test_aware_timestamps_missing_in_a_file():
+    a = pd.DataFrame({'t': pd.to_datetime(['2024-01-01']).tz_localize('UTC'), 'x': [1]})
+    b = pd.DataFrame({'x': [2]})
+    df, _ = combine_frames(['a', 'b'], [a, b])
+    assert df['t'].dtype == pd.DatetimeTZDtype('ns', 'UTC')
+    assert df['t'].isna().tolist() == [False, True]
+
+def test_source_column_names_each_file():
+    a = pd.DataFrame({'x': [1, 2]})
+    b = pd.DataFrame({'x': [3]})
+    df, _ = combine_frames(['a.csv', 'a.csv'], [a, b], source_column='source_file')
+    assert df.columns[0] == 'source_file'
+    assert df['source_file'].tolist() == ['1: a.csv', '1: a.csv', '2: a.csv']
@@ -0,0 +1,95 @@
+# ============================================
+# FILE: tests/test_session_spill.py (NEW)
+# ============================================
+import numpy as np
+import pandas as pd
+import pytest
+import utils.dataset_history as dataset_history
+import utils.session_spill as session_spill
+from utils.dataset_history import DatasetHistory, frame_buffers
+from utils.operations import make_operation, apply_operation
+from utils.session_spill import SpilledFrame, hibernate_session, wake_session
+
+@pytest.fixture(autouse=True)
+def spill_dirs(tmp_path, monkeypatch):
+    monkeypatch.setattr(session_spill, 'SESSION_SPILL_DIR', str(tmp_path / 'sessions'))
+    monkeypatch.setattr(dataset_history, 'HISTORY_SPILL_DIR', str(tmp_path / 'history'))
+    return tmp_path
+
+@pytest.fixture
+def original():
+    rng = np.random.default_rng(0)
+    n = 500
+    return pd.DataFrame({
+        'x': rng.normal(size=n),
+        'n': rng.integers(0, 50, n),
+        'kind': pd.Categorical(rng.choice(['a', 'b'], n)),
+        'text': rng.choice(['p', 'q', None], n).astype(object),
+        'when': pd.date_range('2024-01-01', periods=n, freq='h', tz='UTC'),
+        'mixed': pd.Series([1, 'one', 2.5, None] * (n // 4), dtype=object),
+        'maybe': pd.array(rng.integers(0, 3, n), dtype='Int64'),
+    })
+
+def _session(original):
+    history = DatasetHistory(base=original, checkpoint_every=1)
+    df = original.copy(deep=False)
+    for operation in [make_operation('filter_range', column='n', low=5, high=40),
+                      make_operation('scale', columns=['x'], method="Z-Score Standardization")]:
+        df = apply_operation(df, operation)
+        history.push(df, operation)
+    return {'original_df': original, 'df': df, 'cleaning_history': history, 'dataset_ref': None}
+
+def test_hibernate_and_wake_restore_every_frame(original):
+    state = _session(original)
+    df = state['df']
+    expected_undo = state['cleaning_history']._state_at(1)
+
+    spill = hibernate_session(state)
+    assert spill is not None and spill.disk_bytes > 0
+    assert isinstance(state['df'], SpilledFrame) and isinstance(state['original_df'], SpilledFrame)
+    assert state['cleaning_history'].base is None
+
+    assert wake_session(state)
+    assert state['session_spill'] is None
+    pd.testing.assert_frame_equal(state['original_df'], original)
+    pd.testing.assert_frame_equal(state['df'], df)
+    pd.testing.assert_frame_equal(state['cleaning_history'].base, original)
+    pd.testing.assert_frame_equal(state['cleaning_history'].undo(), expected_undo)
+
+@pytest.mark.parametrize('dtype', ['string[pyarrow]', 'int64'])
+def test_slices_of_one_column_are_not_confused(dtype):
+    pytest.importorskip('pyarrow')
+    values = pd.DataFrame({'v': pd.Series(list('abcdefghij'), dtype=dtype) if dtype != 'int64' else np.arange(10)})
+    # Same-length views into the same buffers, at different offsets and strides
+    state = {'original_df': values.iloc[:5], 'df': values.iloc[5:], 'cleaned_df': values.iloc[::2]}
+    expected = {key: frame.copy() for key, frame in state.items()}
+    hibernate_session(state)
+    wake_session(state)
+    for key, frame in expected.items():
+        pd.testing.assert_frame_equal(state[key], frame)
+
+def test_columns_shared_before_are_shared_after(original):
+    operation = make_operation('scale', columns=['x'], method="Z-Score Standardization")
+    state = {'original_df': original, 'df': apply_operation(original.copy(deep=False), operation)}
+    def shared_bytes():
+        working = frame_buffers(state['df'])
+        return sum(working[key] for key in working.keys() & frame_buffers(state['original_df']).keys())
+
+    # Only 'x' was edited, so the working frame and the original still hold one copy of other columns
+    before = shared_bytes()
+    assert before > 0
+    hibernate_session(state)
+    wake_session(state)
+    assert shared_bytes() == before
+
+def test_spill_files_are_removed_after_wake(original, spill_dirs):
+    state = _session(original)
+    hibernate_session(state)
+    assert any((spill_dirs / 'sessions').iterdir())
+    wake_session(state)
+    assert not any((spill_dirs / 'sessions').iterdir())
+
+def test_session_without_data_is_not_spilled():
+    state = {'df': None, 'original_df': None, 'cleaning_history': DatasetHistory()}
+    assert hibernate_session(state) is None
+    assert not wake_session(state)
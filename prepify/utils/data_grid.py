@@ -0,0 +1,45 @@
+# ============================================
+# FILE: utils/data_grid.py (NEW)
+# ============================================
+import math
+import numpy as np
+
+def sort_positions(series, ascending=True):
+    """Row positions that put a column in order, missing values last"""
+    series = series.reset_index(drop=True)
+    try:
+        ordered = series.sort_values(ascending=ascending, kind='stable', na_position='last')
+    except TypeError:
+        # Values of mixed types, e.g. numbers and text, cannot be compared, so they are ordered by their text
+        ordered = series.map(str, na_action='ignore').sort_values(ascending=ascending, kind='stable',
+                                                                  na_position='last')
+    return ordered.index.to_numpy()
+
+def sample_positions(n_rows, method, size, seed=None):
+    """Row positions of a sample: random, the first or the last rows"""
+    size = min(size, n_rows)
+    if method == "Random":
+        return np.random.default_rng(seed).choice(n_rows, size=size, replace=False)
+    if method == "First N":
+        return np.arange(size)
+    return np.arange(n_rows - size, n_rows)
+
+def view_positions(df, profile, rows=None, sort_col=None, ascending=True):
+    """Row positions of a view in display order, or None for every row in frame order"""
+    if sort_col is None:
+        return rows
+    if rows is None:
+        # Sorting the whole frame reuses the permutation cached for this dataset version
+        return profile.sort_order(sort_col, ascending)
+    # A sample is small, so it is sorted on its own
+    return rows[sort_positions(df[sort_col].iloc[rows], ascending)]
+
+def page_count(n_rows, page_size):
+    return max(math.ceil(n_rows / page_size), 1)
+
+def page_frame(df, positions, page, page_size, columns=None):
+    """Rows and columns of one page of a view, sliced without touching the rest of the frame"""
+    start = (page - 1) * page_size
+    rows = slice(start, start + page_size) if positions is None else positions[start:start + page_size]
+    cols = slice(None) if not columns else [df.columns.get_loc(col) for col in columns]
+    return df.iloc[rows, cols]
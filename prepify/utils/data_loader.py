@@ -0,0 +1,538 @@
+# ============================================
+# FILE: utils/data_loader.py (NEW)
+# ============================================
+import io
+import os
+import bz2
+import gzip
+import shutil
+import zipfile
+import tempfile
+import numpy as np
+import pandas as pd
+from config.settings import (CSV_CHUNK_SIZE, PREVIEW_ROWS, PARSER_ENGINE, ARROW_STRING_DTYPE,
+                             ARROW_BLOCK_SIZE_MB, COLUMNAR_FILE_TYPES, DATA_FILE_TYPES,
+                             COMPRESSED_FILE_TYPES, STREAMABLE_FILE_TYPES, SPOOL_MAX_MB)
+
+# Arrow is optional - fall back to the pandas parsers when it is missing
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.json as pa_json
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+# zstandard is optional and only needed for .zst uploads
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# python-calamine (Rust) reads Excel files many times faster than openpyxl when installed
+try:
+    import python_calamine
+except ImportError:
+    python_calamine = None
+
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+EXCEL_PROGRESS_ROWS = 10_000
+
+def arrow_available():
+    """Check whether the Arrow parsing engine can be used"""
+    return pa is not None
+
+def _use_arrow(engine):
+    """Resolve whether a load should go through the Arrow engine"""
+    return engine == 'pyarrow' and arrow_available()
+
+def read_fraction(file):
+    """Return how much of an uploaded file has been consumed (0-1)"""
+    if isinstance(file, DecompressedUpload):
+        return file.fraction_read()
+    total = getattr(file, 'size', None)
+    if not total:
+        return 0.0
+    try:
+        return min(file.tell() / total, 1.0)
+    except (OSError, ValueError):
+        return 0.0
+
+def detect_file_type(name):
+    """Split an upload name into its data format and compression, e.g. 'sales.csv.gz' -> ('csv', 'gzip')"""
+    parts = name.lower().split('.')
+    extension = parts[-1]
+    if extension in COMPRESSED_FILE_TYPES:
+        # Zip archives are typed by the member the user picks
+        inner_extension = parts[-2] if len(parts) > 2 else None
+        return inner_extension, COMPRESSED_FILE_TYPES[extension]
+    return extension, None
+
+def list_archive_members(file):
+    """List the data files inside a zip upload"""
+    with zipfile.ZipFile(file) as archive:
+        members = [info.filename for info in archive.infolist()
+                   if not info.is_dir() and detect_file_type(info.filename)[0] in DATA_FILE_TYPES]
+    file.seek(0)
+    return members
+
+class DecompressedUpload(io.RawIOBase):
+    """Read-only stream that decompresses an upload on the fly"""
+
+    def __init__(self, source, compression, member=None):
+        super().__init__()
+        self._source = source
+        self._compression = compression
+        self._member = member
+        self._archive = None
+        self._stream = None
+        self._position = 0
+        self.size = getattr(source, 'size', None)
+        self.name = member or os.path.splitext(getattr(source, 'name', ''))[0]
+        self._open()
+
+    def _open(self):
+        self._source.seek(0)
+        self._position = 0
+        if self._compression == 'gzip':
+            self._stream = gzip.GzipFile(fileobj=self._source, mode='rb')
+        elif self._compression == 'bz2':
+            self._stream = bz2.BZ2File(self._source, mode='rb')
+        elif self._compression == 'zstd':
+            if zstandard is None:
+                raise RuntimeError("Reading .zst files requires the zstandard package (pip install zstandard)")
+            self._stream = zstandard.ZstdDecompressor().stream_reader(self._source, closefd=False)
+        elif self._compression == 'zip':
+            self._archive = zipfile.ZipFile(self._source)
+            self._stream = self._archive.open(self._member)
+        else:
+            raise ValueError(f"Unsupported compression: {self._compression}")
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self._stream.read(len(buffer))
+        buffer[:len(data)] = data
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        """Only rewinding is supported, by restarting the decompression"""
+        if offset != 0 or whence != io.SEEK_SET:
+            raise io.UnsupportedOperation("Compressed uploads can only be rewound to the start")
+        self._close_stream()
+        self._open()
+        return 0
+
+    def fraction_read(self):
+        """Share of the compressed upload consumed so far (0-1)"""
+        if not self.size:
+            return 0.0
+        return min(self._source.tell() / self.size, 1.0)
+
+    def _close_stream(self):
+        if self._stream is not None:
+            self._stream.close()
+        if self._archive is not None:
+            self._archive.close()
+            self._archive = None
+
+    def close(self):
+        self._close_stream()
+        super().close()
+
+def open_upload(file, file_extension, compression=None, member=None):
+    """Give parsers a decompressed view of an upload without holding the decompressed payload"""
+    if compression is None:
+        return file
+    stream = DecompressedUpload(file, compression, member)
+    if file_extension in STREAMABLE_FILE_TYPES:
+        return stream
+
+    # Formats that need random access go through a temp file that spills to disk when large
+    spooled = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MB * 1024 * 1024)
+    shutil.copyfileobj(stream, spooled, 1024 * 1024)
+    stream.close()
+    spooled.seek(0)
+    return spooled
+
+class UploadInspection:
+    """Archive members, decompressed source, sheets and columns of one upload, each worked out once"""
+
+    def __init__(self, file):
+        self.file_id = getattr(file, 'file_id', None)
+        self._file = file
+        self._members = None
+        # Only the source of the member picked last is kept open
+        self._source_key = None
+        self._source = None
+        # member -> sheet names, (member, sheet) -> column names
+        self._sheets = {}
+        self._schemas = {}
+
+    def members(self):
+        if self._members is None:
+            self._members = list_archive_members(self._file)
+        return self._members
+
+    def source(self, file_extension, compression=None, member=None):
+        """Decompressed view of the upload, only decompressed again when another member is picked"""
+        if (file_extension, member) != self._source_key:
+            self.close()
+            self._source = open_upload(self._file, file_extension, compression, member)
+            self._source_key = (file_extension, member)
+        self._source.seek(0)
+        return self._source
+
+    def sheets(self, file_extension, member=None):
+        if member not in self._sheets:
+            self._sheets[member] = list_excel_sheets(self._source, file_extension)
+        return self._sheets[member]
+
+    def schema(self, file_extension, member=None, sheet=None):
+        if (member, sheet) not in self._schemas:
+            self._schemas[(member, sheet)] = read_schema(self._source, file_extension, sheet)
+        return self._schemas[(member, sheet)]
+
+    def close(self):
+        """Release the decompressed copy of the current member"""
+        if self._source is not None and self._source is not self._file:
+            self._source.close()
+        self._source = None
+        self._source_key = None
+
+def arrow_to_pandas(table, arrow_strings=ARROW_STRING_DTYPE, self_destruct=True):
+    """Convert an Arrow table to pandas, optionally releasing Arrow buffers as columns are converted"""
+    types_mapper = None
+    if arrow_strings:
+        string_dtype = pd.StringDtype('pyarrow')
+        types_mapper = {pa.string(): string_dtype, pa.large_string(): string_dtype}.get
+    return table.to_pandas(types_mapper=types_mapper, date_as_object=False,
+                           split_blocks=True, self_destruct=self_destruct)
+
+def to_arrow_strings(df):
+    """Store text columns as Arrow-backed strings instead of NumPy objects"""
+    if not arrow_available():
+        return df
+    for col in df.select_dtypes(include=['object']).columns:
+        if pd.api.types.infer_dtype(df[col], skipna=True) == 'string':
+            df[col] = df[col].astype(pd.StringDtype('pyarrow'))
+    return df
+
+def _row_sampler(row_step):
+    """Skip-rows callable keeping the header and every row_step-th data row"""
+    if row_step <= 1:
+        return None
+    return lambda i: i > 0 and (i - 1) % row_step != 0
+
+def _sample_batches(batches, max_rows=None, row_step=1):
+    """Yield Arrow batches keeping every row_step-th row and stopping after max_rows rows"""
+    rows_seen = 0
+    rows_kept = 0
+    for batch in batches:
+        if row_step > 1:
+            # Continue the stride across batch boundaries
+            first = (-rows_seen) % row_step
+            rows_seen += batch.num_rows
+            batch = batch.take(pa.array(np.arange(first, batch.num_rows, row_step)))
+        if max_rows is not None and rows_kept + batch.num_rows >= max_rows:
+            # Returning here stops the reader, so the rest of the file is never parsed
+            yield batch.slice(0, max_rows - rows_kept)
+            return
+        rows_kept += batch.num_rows
+        yield batch
+
+def limit_frame(df, columns=None, max_rows=None, row_step=1):
+    """Apply a column selection and row sample to a frame that had to be parsed in full"""
+    if columns:
+        df = df[columns]
+    if row_step > 1:
+        df = df.iloc[::row_step]
+    if max_rows is not None:
+        df = df.iloc[:max_rows]
+    return df.reset_index(drop=True) if row_step > 1 else df
+
+def iter_csv_chunks(file, chunksize=CSV_CHUNK_SIZE, **read_kwargs):
+    """Yield (chunk, fraction_read) pairs while parsing a CSV upload"""
+    with pd.read_csv(file, chunksize=chunksize, **read_kwargs) as reader:
+        for chunk in reader:
+            yield chunk, read_fraction(file)
+
+def _load_csv_pandas(file, chunksize, on_progress, on_preview, **read_kwargs):
+    """Parse a CSV upload in chunks with the pandas C parser"""
+    chunks = []
+    rows_read = 0
+
+    # Parse straight from the upload stream so the raw bytes are never copied
+    for chunk, fraction in iter_csv_chunks(file, chunksize, **read_kwargs):
+        if not chunks and on_preview is not None:
+            on_preview(chunk)
+        chunks.append(chunk)
+        rows_read += len(chunk)
+        if on_progress is not None:
+            on_progress(fraction, rows_read)
+
+    if not chunks:
+        return pd.DataFrame()
+
+    # Hand the chunks over to concat and drop our references right away
+    df = pd.concat(chunks, ignore_index=True, copy=False)
+    chunks.clear()
+    return df
+
+def read_csv_header(file):
+    """Column names of a CSV upload as the pandas parser names them, or None for an empty file"""
+    try:
+        header = pd.read_csv(file, header=None, nrows=1, dtype=str, keep_default_na=False).iloc[0]
+    except pd.errors.EmptyDataError:
+        return None
+    finally:
+        file.seek(0)
+    return _header_names([name if name else None for name in header])
+
+def _load_csv_arrow(file, on_progress, on_preview, arrow_strings, columns=None, max_rows=None, row_step=1):
+    """Parse a CSV upload with the multi-threaded Arrow reader"""
+    # The Arrow reader keeps blank and repeated header names as they are, so name the columns like pandas
+    header = read_csv_header(file)
+    read_options = pa_csv.ReadOptions(use_threads=True, block_size=ARROW_BLOCK_SIZE_MB * 1024 * 1024,
+                                      column_names=header, skip_rows=1 if header is not None else 0)
+    # Treat empty text fields as missing, matching the pandas parser
+    convert_options = pa_csv.ConvertOptions(strings_can_be_null=True, include_columns=columns)
+    batches = []
+    rows_read = 0
+
+    try:
+        reader = pa_csv.open_csv(file, read_options=read_options, convert_options=convert_options)
+        for batch in _sample_batches(reader, max_rows, row_step):
+            if not batches and on_preview is not None:
+                on_preview(batch.slice(0, PREVIEW_ROWS).to_pandas())
+            batches.append(batch)
+            rows_read += batch.num_rows
+            if on_progress is not None:
+                on_progress(read_fraction(file), rows_read)
+        table = pa.Table.from_batches(batches, schema=reader.schema)
+    except pa.ArrowInvalid:
+        # The streaming reader infers types from the first block only; when a later
+        # block disagrees, re-read the whole file so types are unified across blocks
+        batches = []
+        file.seek(0)
+        table = pa_csv.read_csv(file, read_options=read_options, convert_options=convert_options)
+        if max_rows is not None or row_step > 1:
+            table = pa.Table.from_batches(list(_sample_batches(table.to_batches(), max_rows, row_step)),
+                                          schema=table.schema)
+
+    batches.clear()
+    return arrow_to_pandas(table, arrow_strings)
+
+def load_csv_chunked(file, chunksize=CSV_CHUNK_SIZE, on_progress=None, on_preview=None,
+                     engine=PARSER_ENGINE, arrow_strings=ARROW_STRING_DTYPE,
+                     columns=None, max_rows=None, row_step=1, **read_kwargs):
+    """Parse a CSV upload incrementally, reporting progress and an early preview"""
+    df = None
+    if _use_arrow(engine) and not read_kwargs:
+        try:
+            df = _load_csv_arrow(file, on_progress, on_preview, arrow_strings, columns, max_rows, row_step)
+        except pa.ArrowKeyError:
+            # A selected column the Arrow reader did not find; the pandas parser matches names its own way
+            file.seek(0)
+    if df is None:
+        df = _load_csv_pandas(file, chunksize, on_progress, on_preview, usecols=columns,
+                              nrows=max_rows, skiprows=_row_sampler(row_step), **read_kwargs)
+
+    if on_progress is not None:
+        on_progress(1.0, len(df))
+    return df
+
+def load_json(file, lines=False, engine=PARSER_ENGINE, arrow_strings=ARROW_STRING_DTYPE,
+              columns=None, max_rows=None, row_step=1):
+    """Parse a JSON or JSON Lines upload"""
+    # Arrow only reads newline-delimited records; plain JSON documents go through pandas
+    if lines and max_rows is None and _use_arrow(engine):
+        table = pa_json.read_json(file, read_options=pa_json.ReadOptions(use_threads=True))
+        if columns:
+            table = table.select(columns)
+        df = arrow_to_pandas(table, arrow_strings)
+        return limit_frame(df, row_step=row_step)
+
+    # JSON Lines can stop after the records needed; a JSON document has to be parsed whole
+    nrows = max_rows * row_step if lines and max_rows is not None else None
+    df = limit_frame(pd.read_json(file, lines=lines, nrows=nrows), columns, max_rows, row_step)
+    if _use_arrow(engine) and arrow_strings:
+        df = to_arrow_strings(df)
+    return df
+
+def _open_arrow_ipc(file):
+    """Open an Arrow IPC upload written in either the file or the stream format"""
+    try:
+        return pa.ipc.open_file(file)
+    except pa.ArrowInvalid:
+        file.seek(0)
+        return pa.ipc.open_stream(file)
+
+def read_columnar_schema(file, file_extension):
+    """List the columns of a Parquet, Feather or Arrow IPC upload without reading any data"""
+    if not arrow_available():
+        return []
+    if file_extension == 'parquet':
+        names = pq.ParquetFile(file).schema_arrow.names
+    else:
+        names = _open_arrow_ipc(file).schema.names
+    file.seek(0)
+    # Skip the index columns pandas adds when writing Parquet
+    return [name for name in names if not name.startswith('__index_level_')]
+
+def load_columnar(file, file_extension, columns=None, arrow_strings=ARROW_STRING_DTYPE,
+                  max_rows=None, row_step=1):
+    """Load a Parquet, Feather or Arrow IPC upload, reading only the requested columns"""
+    if not arrow_available():
+        if file_extension == 'parquet':
+            df = pd.read_parquet(file, columns=columns)
+        else:
+            df = pd.read_feather(file, columns=columns)
+        return limit_frame(df, max_rows=max_rows, row_step=row_step)
+
+    sampled = max_rows is not None or row_step > 1
+    if file_extension == 'parquet':
+        if sampled:
+            # Read batch by batch so reading stops once the row limit is reached
+            parquet_file = pq.ParquetFile(file)
+            batches = parquet_file.iter_batches(columns=columns)
+            schema = parquet_file.schema_arrow
+            if columns:
+                schema = pa.schema([schema.field(name) for name in columns])
+            table = pa.Table.from_batches(list(_sample_batches(batches, max_rows, row_step)), schema=schema)
+        else:
+            table = pq.read_table(file, columns=columns, use_threads=True)
+    else:
+        reader = _open_arrow_ipc(file)
+        if sampled:
+            batches = (reader.get_batch(i) for i in range(reader.num_record_batches)) \
+                if isinstance(reader, pa.ipc.RecordBatchFileReader) else reader
+            table = pa.Table.from_batches(list(_sample_batches(batches, max_rows, row_step)), schema=reader.schema)
+        else:
+            table = reader.read_all()
+        if columns:
+            table = table.select(columns)
+    return arrow_to_pandas(table, arrow_strings)
+
+def list_excel_sheets(file, file_extension):
+    """List the sheet names of an Excel upload without parsing any cells"""
+    if python_calamine is not None:
+        names = python_calamine.CalamineWorkbook.from_filelike(file).sheet_names
+    elif file_extension == 'xlsx' and openpyxl is not None:
+        # Read-only mode only parses the workbook index, not the worksheets
+        workbook = openpyxl.load_workbook(file, read_only=True)
+        names = workbook.sheetnames
+        workbook.close()
+    else:
+        names = pd.ExcelFile(file).sheet_names
+    file.seek(0)
+    return names
+
+def _header_names(header):
+    """Name blank and repeated header cells the way pandas does: 'Unnamed: 2', and 'a', 'a.1' for a repeated 'a'"""
+    names = [f"Unnamed: {i}" if name is None else name for i, name in enumerate(header)]
+    counts = {}
+    # Given names are deduplicated before generated ones, as in pandas' parsers
+    named = [i for i, name in enumerate(header) if name is not None]
+    for i in named + [i for i, name in enumerate(header) if name is None]:
+        name = names[i]
+        count = counts.get(name, 0)
+        suffixed = name
+        while count:
+            counts[name] = count + 1
+            suffixed = f"{name}.{count}"
+            # Skip suffixes that are already names of their own in the header
+            count = count + 1 if suffixed in names else counts.get(suffixed, 0)
+        names[i] = suffixed
+        counts[suffixed] = count + 1
+    return names
+
+def _load_xlsx_streaming(file, sheet, columns, max_rows, row_step, on_progress):
+    """Stream the cell values of one worksheet with openpyxl's read-only reader"""
+    workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
+    data = []
+    try:
+        worksheet = workbook[sheet] if sheet else workbook.worksheets[0]
+        total_rows = worksheet.max_row or 0
+        rows = worksheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return pd.DataFrame()
+        header = _header_names(header)
+        # Header names are unique once deduplicated, so each selected name maps to one position
+        position_of = {name: pos for pos, name in enumerate(header)}
+        positions = [position_of[col] for col in columns] if columns else list(range(len(header)))
+
+        for i, row in enumerate(rows):
+            if i % row_step:
+                continue
+            data.append([row[pos] if pos < len(row) else None for pos in positions])
+            if len(data) == max_rows:
+                break
+            if on_progress is not None and len(data) % EXCEL_PROGRESS_ROWS == 0:
+                on_progress(min(i / total_rows, 1.0) if total_rows else 0.0, len(data))
+    finally:
+        workbook.close()
+
+    # Worksheets often carry formatted but empty rows at the bottom
+    while data and all(value is None for value in data[-1]):
+        data.pop()
+    return pd.DataFrame(data, columns=[header[pos] for pos in positions])
+
+def load_excel(file, file_extension, sheet=None, columns=None, max_rows=None, row_step=1,
+               on_progress=None, engine=PARSER_ENGINE, arrow_strings=ARROW_STRING_DTYPE):
+    """Parse one sheet of an Excel upload with the fastest available reader"""
+    if file_extension == 'xlsx' and python_calamine is None and openpyxl is not None:
+        df = _load_xlsx_streaming(file, sheet, columns, max_rows, row_step, on_progress)
+    else:
+        # The Excel reader counts nrows before skipping, so only pass it for plain row limits
+        df = pd.read_excel(file, sheet_name=sheet or 0, usecols=columns, skiprows=_row_sampler(row_step),
+                           nrows=max_rows if row_step <= 1 else None,
+                           engine='calamine' if python_calamine is not None else None)
+        df = limit_frame(df, max_rows=max_rows)
+
+    if on_progress is not None:
+        on_progress(1.0, len(df))
+    if _use_arrow(engine) and arrow_strings:
+        df = to_arrow_strings(df)
+    return df
+
+def read_schema(file, file_extension, sheet=None):
+    """List the columns of an upload from its header alone, or None when that needs a full parse"""
+    if file_extension in COLUMNAR_FILE_TYPES:
+        return read_columnar_schema(file, file_extension)
+    if file_extension == 'csv':
+        # Same names the Arrow reader is given, so every column offered can be selected
+        columns = read_csv_header(file) or []
+    elif file_extension == 'jsonl':
+        columns = pd.read_json(file, lines=True, nrows=PREVIEW_ROWS).columns
+    elif file_extension in ['xlsx', 'xls']:
+        columns = load_excel(file, file_extension, sheet, max_rows=1).columns
+    else:
+        return None
+    file.seek(0)
+    return list(columns)
+
+def load_upload(file, file_extension, columns=None, on_progress=None, on_preview=None,
+                max_rows=None, row_step=1, sheet=None):
+    """Parse an uploaded file with the loader matching its extension"""
+    if file_extension == 'csv':
+        return load_csv_chunked(file, on_progress=on_progress, on_preview=on_preview,
+                                columns=columns, max_rows=max_rows, row_step=row_step)
+    if file_extension in COLUMNAR_FILE_TYPES:
+        return load_columnar(file, file_extension, columns, max_rows=max_rows, row_step=row_step)
+    if file_extension in ['xlsx', 'xls']:
+        return load_excel(file, file_extension, sheet, columns, max_rows, row_step, on_progress)
+    if file_extension in ['json', 'jsonl']:
+        return load_json(file, lines=file_extension == 'jsonl', columns=columns,
+                         max_rows=max_rows, row_step=row_step)
+    raise ValueError(f"Unsupported file type: .{file_extension}")
@@ -4,6 +4,7 @@
 import pandas as pd
 import numpy as np
 from sklearn.preprocessing import LabelEncoder, StandardScaler, MinMaxScaler
+from utils.dataset_profile import get_profile
 
 def remove_missing_values(df):
     """Remove all rows with missing values"""
@@ -11,28 +12,29 @@ def remove_missing_values(df):
 
 def fill_missing_values(df):
     """Fill missing values intelligently"""
-    cleaned_df = df.copy()
+    cleaned_df = df.copy(deep=False)
     
     # Fill categorical columns with mode
-    cat_cols = cleaned_df.select_dtypes(include=['object']).columns
+    cat_cols = cleaned_df.select_dtypes(include=['object', 'string', 'category']).columns
     for col in cat_cols:
         if cleaned_df[col].isnull().sum() > 0:
             mode_value = cleaned_df[col].mode()
             if len(mode_value) > 0:
-                cleaned_df[col].fillna(mode_value[0], inplace=True)
+                cleaned_df[col] = cleaned_df[col].fillna(mode_value[0])
     
     # Interpolate numerical columns
     num_cols = cleaned_df.select_dtypes(include=['number']).columns
     for col in num_cols:
         if cleaned_df[col].isnull().sum() > 0:
-            cleaned_df[col].interpolate(method='linear', inplace=True)
-            cleaned_df[col].fillna(cleaned_df[col].mean(), inplace=True)
+            filled = cleaned_df[col].interpolate(method='linear')
+            cleaned_df[col] = filled.fillna(filled.mean())
     
     return cleaned_df
 
-def remove_duplicates(df):
+def remove_duplicates(df, subset=None, keep='first'):
     """Remove duplicate rows"""
-    return df.drop_duplicates()
+    # Reuses the row hashes the profile already computed to count the duplicates
+    return df[~get_profile(df).duplicates(subset).mask(keep)]
 
 def clean_all(df):
     """Apply all cleaning operations"""
@@ -42,7 +44,7 @@ def clean_all(df):
 
 def encode_categorical(df, column, method):
     """Encode categorical variables"""
-    encoded_df = df.copy()
+    encoded_df = df.copy(deep=False)
     
     if method == "Label Encoding":
         le = LabelEncoder()
@@ -54,7 +56,7 @@ def encode_categorical(df, column, method):
 
 def normalize_data(df, columns):
     """Normalize numeric columns to 0-1 range"""
-    normalized_df = df.copy()
+    normalized_df = df.copy(deep=False)
     scaler = MinMaxScaler()
     
     normalized_df[columns] = scaler.fit_transform(normalized_df[columns])
@@ -63,7 +65,7 @@ def normalize_data(df, columns):
 
 def standardize_data(df, columns):
     """Standardize numeric columns (z-score)"""
-    standardized_df = df.copy()
+    standardized_df = df.copy(deep=False)
     scaler = StandardScaler()
     
     standardized_df[columns] = scaler.fit_transform(standardized_df[columns])
@@ -72,7 +74,7 @@ def standardize_data(df, columns):
 
 def convert_column_type(df, column, new_type):
     """Convert column to specified type"""
-    converted_df = df.copy()
+    converted_df = df.copy(deep=False)
     
     if new_type == "int":
         converted_df[column] = pd.to_numeric(converted_df[column], errors='coerce').astype('Int64')
@@ -107,15 +109,81 @@ def detect_outliers_iqr(df, column, multiplier=1.5):
     outlier_indices = col_data[(col_data < lower_bound) | (col_data > upper_bound)].index.tolist()
     return outlier_indices
 
-def remove_outliers(df, column, method):
-    """Remove outliers from dataframe"""
+def detect_outliers(df, column, method):
+    """Detect outliers with the Z-score method, the IQR method or both"""
     if "Z-Score" in method:
-        outlier_indices = detect_outliers_zscore(df, column)
+        return detect_outliers_zscore(df, column)
     elif "IQR" in method:
-        outlier_indices = detect_outliers_iqr(df, column)
+        return detect_outliers_iqr(df, column)
     else:  # Both methods
         zscore_outliers = detect_outliers_zscore(df, column)
         iqr_outliers = detect_outliers_iqr(df, column)
-        outlier_indices = list(set(zscore_outliers) | set(iqr_outliers))
+        return list(set(zscore_outliers) | set(iqr_outliers))
+
+def remove_outliers(df, column, method):
+    """Remove outliers from dataframe"""
+    return df.drop(detect_outliers(df, column, method))
+
+def cap_outliers(df, column, lower_quantile=0.01, upper_quantile=0.99):
+    """Clip a column to its lower and upper percentiles"""
+    capped_df = df.copy(deep=False)
+    lower = capped_df[column].quantile(lower_quantile)
+    upper = capped_df[column].quantile(upper_quantile)
+    capped_df[column] = capped_df[column].clip(lower, upper)
+    return capped_df
+
+def replace_outliers_with_median(df, column, method):
+    """Replace outliers in a column with the column median"""
+    replaced_df = df.copy(deep=False)
+    outlier_indices = detect_outliers(df, column, method)
+    # Replace the whole column so the other columns stay shared with earlier versions
+    replaced_df[column] = replaced_df[column].mask(replaced_df.index.isin(outlier_indices),
+                                                   replaced_df[column].median())
+    return replaced_df
+
+def filter_range(df, column, low, high):
+    """Keep rows whose value in a column lies within [low, high]"""
+    return df[(df[column] >= low) & (df[column] <= high)]
+
+def filter_values(df, column, values):
+    """Keep rows whose value in a column is one of the given values"""
+    return df[df[column].isin(values)]
+
+def compact_dtypes(df, category_ratio=0.5):
+    """Downcast numeric columns and store low-cardinality text columns as categories"""
+    # Every compacted column changes dtype, so the untouched columns can stay shared
+    compact_df = df.copy(deep=False)
+    
+    # Integers always fit losslessly in the smallest width that holds their range
+    for col in compact_df.select_dtypes(include=['integer']).columns:
+        compact_df[col] = pd.to_numeric(compact_df[col], downcast='integer')
+    
+    # Floats only drop to float32 when every value survives the round trip exactly
+    for col in compact_df.select_dtypes(include=['float64']).columns:
+        values = compact_df[col].to_numpy()
+        downcast = values.astype('float32')
+        if np.array_equal(downcast.astype('float64'), values, equal_nan=True):
+            compact_df[col] = downcast
+    
+    # Repeated text values are stored once per category instead of once per row
+    if len(compact_df) > 0:
+        for col in compact_df.select_dtypes(include=['object', 'string']).columns:
+            if compact_df[col].nunique(dropna=True) / len(compact_df) <= category_ratio:
+                compact_df[col] = compact_df[col].astype('category')
+    
+    return compact_df
+
+def memory_report(before_df, after_df):
+    """Compare per-column memory usage before and after an optimization"""
+    before = before_df.memory_usage(deep=True, index=False)
+    after = after_df.memory_usage(deep=True, index=False).reindex(before.index)
+    saved = (1 - after / before.replace(0, np.nan)) * 100
     
-    return df.drop(outlier_indices)
\ No newline at end of file
+    return pd.DataFrame({
+        'Column': before.index,
+        'Before Type': before_df.dtypes.astype(str).values,
+        'After Type': after_df.dtypes.reindex(before.index).astype(str).values,
+        'Before (MB)': (before.values / 1024**2).round(3),
+        'After (MB)': (after.values / 1024**2).round(3),
+        'Saved (%)': saved.fillna(0).round(1).values
+    })
\ No newline at end of file
@@ -0,0 +1,181 @@
+# ============================================
+# FILE: utils/dataset_cache.py (NEW)
+# ============================================
+import os
+import json
+import uuid
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+import pandas as pd
+from config.settings import (ENABLE_DATASET_CACHE, DATASET_CACHE_MAX_MB,
+                             DATASET_CACHE_DIR, DATASET_CACHE_DISK_MAX_MB)
+
+HASH_BLOCK_SIZE = 1024 * 1024
+
+logger = logging.getLogger(__name__)
+
+def dataset_cache_key(file, options=None):
+    """Build a cache key from the uploaded bytes and the parser options"""
+    digest = hashlib.blake2b(digest_size=20)
+    file.seek(0)
+    for block in iter(lambda: file.read(HASH_BLOCK_SIZE), b''):
+        digest.update(block)
+    file.seek(0)
+    digest.update(json.dumps(options or {}, sort_keys=True, default=str).encode('utf-8'))
+    return digest.hexdigest()
+
+def dataset_files_key(files, options=None):
+    """Build a cache key from several uploads, in order, and the parser options"""
+    digest = hashlib.blake2b(digest_size=20)
+    for file in files:
+        digest.update(dataset_cache_key(file).encode('ascii'))
+    digest.update(json.dumps(options or {}, sort_keys=True, default=str).encode('utf-8'))
+    return digest.hexdigest()
+
+def frame_nbytes(df):
+    """Memory held by a DataFrame, including object payloads"""
+    return int(df.memory_usage(deep=True, index=True).sum())
+
+class DatasetCache:
+    """Process-wide LRU cache of parsed DataFrames bounded by total bytes
+
+    Datasets kept on disk are pickles, and unpickling runs code: the disk directory must belong to
+    this server alone, never shared with or writable by untrusted users
+    """
+
+    def __init__(self, max_bytes, disk_dir=None, disk_max_bytes=0):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def get(self, key):
+        """Return the cached DataFrame for a key, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+        df = self._read_disk(key)
+        with self._lock:
+            if df is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        self._put_memory(key, df)
+        return df
+
+    def put(self, key, df):
+        """Cache a parsed DataFrame in memory and, if enabled, on disk"""
+        self._put_memory(key, df)
+        # The dataset is parsed either way, so a failed disk write only costs a later re-parse
+        try:
+            self._write_disk(key, df)
+        except Exception:
+            logger.warning("Could not write dataset %s to the disk cache", key, exc_info=True)
+
+    def stats(self):
+        """Summary of the cache contents"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+    def clear(self):
+        """Drop every in-memory entry"""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def _put_memory(self, key, df):
+        nbytes = frame_nbytes(df)
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._total_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (df, nbytes)
+            self._total_bytes += nbytes
+            # Evict least recently used entries until we are back under budget
+            while self._total_bytes > self.max_bytes:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_bytes
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.pkl")
+
+    def _read_disk(self, key):
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            df = pd.read_pickle(path)
+        except Exception:
+            return None
+        # Touch the file so disk eviction stays least-recently-used
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            # Another session evicted it in the meantime; the DataFrame is already read
+            pass
+        return df
+
+    def _write_disk(self, key, df):
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        # Sessions writing the same dataset at once each write their own temporary file
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            # Pickle keeps every dtype (including Arrow strings) exactly as parsed
+            df.to_pickle(tmp_path, compression=None)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._evict_disk()
+
+    def _evict_disk(self):
+        # Other sessions evict from the same directory, so any file may disappear while we look at it
+        files = []
+        for name in os.listdir(self.disk_dir):
+            if name.endswith('.pkl'):
+                try:
+                    stat = os.stat(os.path.join(self.disk_dir, name))
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, os.path.join(self.disk_dir, name)))
+        files.sort()
+        total = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if total <= self.disk_max_bytes:
+                break
+            total -= size
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+# Shared by every session served by this process
+dataset_cache = DatasetCache(
+    DATASET_CACHE_MAX_MB * 1024 * 1024,
+    disk_dir=DATASET_CACHE_DIR,
+    disk_max_bytes=DATASET_CACHE_DISK_MAX_MB * 1024 * 1024
+) if ENABLE_DATASET_CACHE else None
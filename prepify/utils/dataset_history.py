@@ -0,0 +1,275 @@
+# ============================================
+# FILE: utils/dataset_history.py (NEW)
+# ============================================
+import os
+import uuid
+import weakref
+import tempfile
+import numpy as np
+import pandas as pd
+from config.settings import HISTORY_MAX_MB, HISTORY_MAX_DEPTH, HISTORY_SPILL_DIR, HISTORY_CHECKPOINT_EVERY
+from utils.operations import apply_operation, replay, describe_operation
+
+# zstandard is optional - spilled snapshots fall back to fast gzip
+try:
+    import zstandard
+    SPILL_COMPRESSION = {'method': 'zstd', 'level': 3}
+except ImportError:
+    SPILL_COMPRESSION = {'method': 'gzip', 'compresslevel': 1}
+
+def frame_buffers(df):
+    """Map each memory buffer behind a DataFrame to its size, so shared columns are counted once"""
+    buffers = {}
+    for _, series in df.items():
+        values = series.array
+        if isinstance(series.dtype, np.dtype):
+            data = series.to_numpy(copy=False)
+            # Object columns also hold the Python objects their pointers refer to
+            nbytes = int(series.memory_usage(deep=True, index=False)) if series.dtype == object else data.nbytes
+            buffers[('numpy', data.__array_interface__['data'][0])] = nbytes
+        elif hasattr(values, '__arrow_array__') and isinstance(series.dtype, (pd.ArrowDtype, pd.StringDtype)):
+            for chunk in values.__arrow_array__().chunks:
+                for buffer in chunk.buffers():
+                    if buffer is not None:
+                        buffers[('arrow', buffer.address)] = buffer.size
+        elif isinstance(series.dtype, pd.CategoricalDtype):
+            codes = series.cat.codes.to_numpy(copy=False)
+            buffers[('numpy', codes.__array_interface__['data'][0])] = codes.nbytes
+            buffers[('object', id(series.cat.categories))] = series.cat.categories.memory_usage(deep=True)
+        else:
+            # Object and other extension arrays are shared as whole objects between shallow copies
+            buffers[('object', id(values))] = int(series.memory_usage(deep=True, index=False))
+    return buffers
+
+def column_view(series):
+    """Where a column's values lie within its buffers, which same-length slices of one column differ in"""
+    values = series.array
+    if isinstance(series.dtype, np.dtype):
+        return series.to_numpy(copy=False).strides
+    if hasattr(values, '__arrow_array__') and isinstance(series.dtype, (pd.ArrowDtype, pd.StringDtype)):
+        # Arrow slices share their buffers and only differ in each chunk's offset
+        return tuple((chunk.offset, len(chunk)) for chunk in values.__arrow_array__().chunks)
+    return ()
+
+def _spill_dir():
+    """Directory holding spilled history snapshots"""
+    path = HISTORY_SPILL_DIR or os.path.join(tempfile.gettempdir(), 'prepify_history')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def _remove_file(path):
+    if os.path.exists(path):
+        os.remove(path)
+
+class _Snapshot:
+    """A checkpoint of the dataset, held in memory or spilled to a compressed file"""
+
+    def __init__(self, df):
+        self.df = df
+        self.path = None
+        self.disk_bytes = 0
+        self._columns = None
+        self._base_columns = {}
+        self._finalizer = None
+
+    @property
+    def spilled(self):
+        return self.df is None
+
+    def spill(self, base=None):
+        """Write the snapshot to disk and release its memory"""
+        df = self.df
+        self._columns = df.columns
+        self._base_columns = {}
+        if base is not None and df.index.equals(base.index):
+            # Columns still identical to the base are kept as shared references instead of written out
+            base_buffers = frame_buffers(base)
+            self._base_columns = {col: base[col] for col in df.columns if col in base.columns
+                                  and frame_buffers(df[[col]]).keys() <= base_buffers.keys()
+                                  and column_view(df[col]) == column_view(base[col])}
+            df = df.drop(columns=list(self._base_columns))
+
+        path = os.path.join(_spill_dir(), f"{uuid.uuid4().hex}.pkl")
+        # Pickle keeps every dtype exactly, the compression keeps the files small
+        df.to_pickle(path, compression=SPILL_COMPRESSION)
+        self.path = path
+        self.disk_bytes = os.path.getsize(path)
+        self._finalizer = weakref.finalize(self, _remove_file, path)
+        self.df = None
+
+    def load(self):
+        """Bring a spilled snapshot back into memory"""
+        if self.df is None:
+            df = pd.read_pickle(self.path, compression=SPILL_COMPRESSION['method'])
+            if self._base_columns:
+                for col, values in self._base_columns.items():
+                    df[col] = values
+                df = df[self._columns]
+                self._base_columns = {}
+            self.df = df
+            self.discard_file()
+        return self.df
+
+    def discard_file(self):
+        if self._finalizer is not None:
+            self._finalizer()
+            self._finalizer = None
+        self.path = None
+        self.disk_bytes = 0
+
+class DatasetHistory:
+    """Log of the operations applied to the working dataset, with periodic checkpoints for undo and redo"""
+
+    def __init__(self, base=None, max_bytes=HISTORY_MAX_MB * 1024 * 1024, max_depth=HISTORY_MAX_DEPTH,
+                 checkpoint_every=HISTORY_CHECKPOINT_EVERY):
+        self.base = base
+        self.max_bytes = max_bytes
+        self.max_depth = max_depth
+        self.checkpoint_every = checkpoint_every
+        self.operations = []
+        self.position = 0
+        self.evicted = 0
+        # Number of applied operations -> dataset after them
+        self._checkpoints = {}
+        self._memory_bytes = 0
+
+    def __len__(self):
+        """Number of operations that can be undone"""
+        return self.position
+
+    @property
+    def can_redo(self):
+        return self.position < len(self.operations)
+
+    def push(self, df, operation):
+        """Record an operation and the dataset it produced"""
+        # A new operation replaces the steps that could have been redone
+        del self.operations[self.position:]
+        for position in [p for p in self._checkpoints if p > self.position]:
+            self._checkpoints.pop(position).discard_file()
+
+        self.operations.append(operation)
+        self.position += 1
+        self._checkpoint(df)
+        # Beyond the maximum depth the oldest step is folded into the base
+        while len(self.operations) > self.max_depth:
+            self._drop_oldest()
+        self._enforce_budget()
+
+    def undo(self):
+        """Step back one operation and return the dataset as it was before it"""
+        self.position -= 1
+        df = self._state_at(self.position)
+        self._enforce_budget()
+        return df
+
+    def redo(self, df):
+        """Re-apply the next operation to the current dataset"""
+        df = apply_operation(df, self.operations[self.position])
+        self.position += 1
+        self._checkpoint(df)
+        self._enforce_budget()
+        return df
+
+    def labels(self):
+        """Labels of the applied operations, oldest first"""
+        return [describe_operation(operation) for operation in self.operations[:self.position]]
+
+    def clear(self, base=None):
+        """Forget every operation, optionally starting over from a new base frame"""
+        for snapshot in self._checkpoints.values():
+            snapshot.discard_file()
+        self._checkpoints.clear()
+        self.operations.clear()
+        self.position = 0
+        self.evicted = 0
+        self._memory_bytes = 0
+        if base is not None:
+            self.base = base
+
+    def _checkpoint(self, df):
+        """Keep the dataset every few operations so undo only replays a short stretch"""
+        if self.position % self.checkpoint_every == 0 and self.position not in self._checkpoints:
+            # A shallow copy is enough: with copy-on-write, later edits never write into this version
+            self._checkpoints[self.position] = _Snapshot(df.copy(deep=False))
+
+    def _state_at(self, position):
+        """Rebuild the dataset after the given number of operations from the nearest checkpoint"""
+        start = max((p for p in self._checkpoints if p <= position), default=0)
+        df = self._checkpoints[start].load() if start else self.base
+        return replay(df.copy(deep=False), self.operations[start:position])
+
+    def _drop_oldest(self):
+        """Make the dataset after the first operation the new base and forget that operation"""
+        self.base = self._state_at(1)
+        self.operations.pop(0)
+        self.position -= 1
+        first = self._checkpoints.pop(1, None)
+        if first is not None:
+            first.discard_file()
+        self._checkpoints = {p - 1: snapshot for p, snapshot in self._checkpoints.items()}
+        self.evicted += 1
+
+    def _measure(self):
+        """Memory held only by the checkpoints: buffers not shared with the base or the current dataset"""
+        live = frame_buffers(self.base) if self.base is not None else {}
+        current = self._checkpoints.get(self.position)
+        if current is not None and not current.spilled:
+            live.update(frame_buffers(current.df))
+        held = {}
+        for position, snapshot in self._checkpoints.items():
+            if position != self.position and not snapshot.spilled:
+                held.update(frame_buffers(snapshot.df))
+        return sum(size for key, size in held.items() if key not in live)
+
+    def _enforce_budget(self):
+        """Spill the oldest in-memory checkpoints until the history fits its memory budget"""
+        self._memory_bytes = self._measure()
+        for position in sorted(self._checkpoints):
+            if self._memory_bytes <= self.max_bytes:
+                break
+            snapshot = self._checkpoints[position]
+            if position != self.position and not snapshot.spilled:
+                snapshot.spill(self.base)
+                self._memory_bytes = self._measure()
+
+    def spill(self):
+        """Spill every in-memory checkpoint that is not the current dataset"""
+        for position, snapshot in self._checkpoints.items():
+            if position != self.position and not snapshot.spilled:
+                snapshot.spill(self.base)
+        self._memory_bytes = self._measure()
+
+    def hibernate(self):
+        """Spill every checkpoint and hand over the frames still held in memory, for an idle session"""
+        for snapshot in self._checkpoints.values():
+            if not snapshot.spilled:
+                snapshot.spill(self.base)
+        held = {'base': self.base} if self.base is not None else {}
+        # Spilled checkpoints keep the columns they share with the base as references
+        for position, snapshot in self._checkpoints.items():
+            for col, values in snapshot._base_columns.items():
+                held[(position, col)] = values
+            snapshot._base_columns = dict.fromkeys(snapshot._base_columns)
+        self.base = None
+        self._memory_bytes = 0
+        return held
+
+    def wake(self, held):
+        """Take back the frames handed over by hibernate()"""
+        self.base = held.pop('base', None)
+        for (position, col), values in held.items():
+            self._checkpoints[position]._base_columns[col] = values
+        self._memory_bytes = self._measure()
+
+    def stats(self):
+        """Footprint of the history for display"""
+        return {
+            'steps': self.position,
+            'redo': len(self.operations) - self.position,
+            'checkpoints': len(self._checkpoints),
+            'memory_bytes': self._memory_bytes,
+            'disk_bytes': sum(snapshot.disk_bytes for snapshot in self._checkpoints.values()),
+            'spilled': sum(snapshot.spilled for snapshot in self._checkpoints.values()),
+            'evicted': self.evicted
+        }
@@ -0,0 +1,73 @@
+# ============================================
+# FILE: utils/dataset_pool.py (NEW)
+# ============================================
+import weakref
+import threading
+from utils.dataset_history import frame_buffers
+
+class DatasetRef:
+    """A session's hold on a pooled dataset, released when the session lets go of it"""
+
+    def __init__(self, pool, key, df):
+        self.key = key
+        self.df = df
+        self._finalizer = weakref.finalize(self, pool._release, key)
+
+    def release(self):
+        self.df = None
+        self._finalizer()
+
+class DatasetPool:
+    """Process-wide pool holding one read-only copy of each parsed dataset, however many sessions use it"""
+
+    def __init__(self):
+        # A dataset leaves the pool once no session holds a reference to it
+        self._frames = weakref.WeakValueDictionary()
+        self._refs = {}
+        self._nbytes = {}
+        # Reentrant: a reference can be collected, and released, while the pool is locked
+        self._lock = threading.RLock()
+
+    def get(self, key):
+        """Reference to the pooled dataset for a content key, or None"""
+        with self._lock:
+            df = self._frames.get(key)
+            if df is None:
+                return None
+            return self._acquire(key, df)
+
+    def share(self, key, df):
+        """Reference to the pooled dataset for a key, pooling df if there is none yet"""
+        with self._lock:
+            pooled = self._frames.get(key)
+            if pooled is None:
+                self._frames[key] = pooled = df
+            return self._acquire(key, pooled)
+
+    def _acquire(self, key, df):
+        if key not in self._refs:
+            self._refs[key] = 0
+            self._nbytes[key] = sum(frame_buffers(df).values())
+        self._refs[key] += 1
+        # Sessions never write into the pooled frame: with copy-on-write their edits copy the columns they touch
+        return DatasetRef(self, key, df)
+
+    def _release(self, key):
+        with self._lock:
+            self._refs[key] -= 1
+            if self._refs[key] <= 0:
+                del self._refs[key]
+                del self._nbytes[key]
+
+    def stats(self):
+        """Datasets in the pool, the references held to them and the memory sharing saves"""
+        with self._lock:
+            return {
+                'datasets': len(self._refs),
+                'references': sum(self._refs.values()),
+                'bytes': sum(self._nbytes.values()),
+                'saved_bytes': sum(self._nbytes[key] * (refs - 1) for key, refs in self._refs.items())
+            }
+
+# Shared by every session served by this process
+dataset_pool = DatasetPool()
@@ -0,0 +1,134 @@
+# ============================================
+# FILE: utils/dataset_profile.py (NEW)
+# ============================================
+import threading
+import weakref
+from functools import cached_property
+import numpy as np
+import pandas as pd
+from utils.duplicates import DuplicateIndex
+from utils.cardinality import approximate_distinct_counts
+from utils.data_grid import sort_positions
+
+def _column_identity(series):
+    """Cheap identity of the data behind a column, which changes whenever the column is replaced"""
+    if isinstance(series.dtype, np.dtype):
+        return series.to_numpy(copy=False).__array_interface__['data'][0]
+    return id(series.array)
+
+def frame_version(df):
+    """Fingerprint of a frame's current contents, without scanning its values"""
+    return (df.shape, tuple(df.columns), tuple(_column_identity(series) for _, series in df.items()))
+
+class DatasetProfile:
+    """Statistics of one dataset version, computed on first use and shared by every tab"""
+
+    def __init__(self, df):
+        # Weak, so a cached profile never keeps an old version of the data alive
+        self._frame = weakref.ref(df)
+        self.n_rows, self.n_columns = df.shape
+        self.dtypes = df.dtypes
+        self.numeric_columns = df.select_dtypes(include=['number']).columns.tolist()
+        self.categorical_columns = df.select_dtypes(include=['object', 'string', 'category']).columns.tolist()
+        self.datetime_columns = df.select_dtypes(include=['datetime64']).columns.tolist()
+        self.bool_columns = df.select_dtypes(include=['bool']).columns.tolist()
+        # Column subset (None for all columns) -> DuplicateIndex
+        self._duplicates = {}
+        # Relative error -> estimated distinct counts
+        self._distinct = {}
+        # (column, ascending) and row positions of the latest sort; one row position per row, so only one is kept
+        self._sort_order = (None, None)
+
+    @property
+    def _df(self):
+        return self._frame()
+
+    @cached_property
+    def null_counts(self):
+        return self._df.isnull().sum()
+
+    @cached_property
+    def total_nulls(self):
+        return int(self.null_counts.sum())
+
+    @cached_property
+    def non_null_counts(self):
+        return self.n_rows - self.null_counts
+
+    def duplicates(self, subset=None):
+        """Duplicate index of this version over the given columns"""
+        key = tuple(subset) if subset else None
+        if key not in self._duplicates:
+            self._duplicates[key] = DuplicateIndex(self._df, subset)
+        return self._duplicates[key]
+
+    @property
+    def duplicate_count(self):
+        return self.duplicates().count()
+
+    def inherit_rows(self, parent):
+        """Carry over the duplicate indexes of a version this one only removed rows from"""
+        for key, index in parent._duplicates.items():
+            if key not in self._duplicates:
+                restricted = index.restrict(self._df)
+                if restricted is not None:
+                    self._duplicates[key] = restricted
+
+    @cached_property
+    def unique_counts(self):
+        return self._df.nunique()
+
+    def distinct_counts(self, error=None):
+        """Distinct values per column, exact or estimated within a relative error"""
+        if error is None:
+            return self.unique_counts
+        if error not in self._distinct:
+            self._distinct[error] = approximate_distinct_counts(self._df, error)
+        return self._distinct[error]
+
+    def sort_order(self, column, ascending=True):
+        """Row positions of this version sorted by a column"""
+        key = (column, ascending)
+        if self._sort_order[0] != key:
+            self._sort_order = (key, sort_positions(self._df[column], ascending))
+        return self._sort_order[1]
+
+    @cached_property
+    def memory_by_column(self):
+        return self._df.memory_usage(deep=True, index=False)
+
+    @cached_property
+    def memory_bytes(self):
+        return int(self.memory_by_column.sum() + self._df.index.memory_usage(deep=True))
+
+    def missing_summary(self):
+        """Columns with missing values, most missing first"""
+        missing = pd.DataFrame({
+            'Column': self.null_counts.index,
+            'Missing': self.null_counts.values,
+            'Percentage': (self.null_counts.values / self.n_rows * 100).round(2) if self.n_rows else 0.0
+        })
+        return missing[missing['Missing'] > 0].sort_values('Missing', ascending=False)
+
+# id(df) -> (weak reference, version, profile); entries leave with their frame
+_profiles = {}
+_profiles_lock = threading.RLock()
+
+def _forget(frame_id, ref):
+    with _profiles_lock:
+        if frame_id in _profiles and _profiles[frame_id][0] is ref:
+            del _profiles[frame_id]
+
+def get_profile(df):
+    """Profile of a frame, rebuilt only when the frame has changed since it was last profiled"""
+    version = frame_version(df)
+    with _profiles_lock:
+        entry = _profiles.get(id(df))
+        if entry is not None and entry[0]() is df and entry[1] == version:
+            return entry[2]
+
+    profile = DatasetProfile(df)
+    ref = weakref.ref(df, lambda ref, frame_id=id(df): _forget(frame_id, ref))
+    with _profiles_lock:
+        _profiles[id(df)] = (ref, version, profile)
+    return profile
@@ -0,0 +1,173 @@
+# ============================================
+# FILE: utils/dataset_store.py (NEW)
+# ============================================
+import os
+import re
+import uuid
+import weakref
+import tempfile
+import numpy as np
+import pandas as pd
+from config.settings import DISK_DATASET_DIR, ARROW_BLOCK_SIZE_MB
+from utils.data_loader import arrow_available, arrow_to_pandas, read_fraction
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.json as pa_json
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+# Arrow reports the offending column of a failed CSV conversion as "In CSV column #N"
+CSV_COLUMN_ERROR = re.compile(r"In CSV column #(\d+)")
+
+def _dataset_dir():
+    """Directory holding the spilled dataset files"""
+    path = DISK_DATASET_DIR or os.path.join(tempfile.gettempdir(), 'prepify_datasets')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def _remove_file(path):
+    if os.path.exists(path):
+        os.remove(path)
+
+class DiskDataset:
+    """Arrow IPC file on local disk, memory-mapped and read in column and row windows"""
+
+    def __init__(self, path, name):
+        self.path = path
+        self.name = name
+        # Memory mapping keeps the data in the OS page cache instead of the Python heap
+        self._table = pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+        # Remove the file once the owning session lets go of the dataset
+        self._finalizer = weakref.finalize(self, _remove_file, path)
+
+    @property
+    def columns(self):
+        return self._table.column_names
+
+    @property
+    def num_rows(self):
+        return self._table.num_rows
+
+    @property
+    def nbytes(self):
+        return os.path.getsize(self.path)
+
+    def _project(self, columns):
+        return self._table.select(columns) if columns else self._table
+
+    def read(self, columns=None, start=0, stop=None):
+        """Materialize a window of rows for the selected columns"""
+        stop = self.num_rows if stop is None else min(stop, self.num_rows)
+        start = min(max(start, 0), stop)
+        window = self._project(columns).slice(start, stop - start)
+        df = arrow_to_pandas(window, self_destruct=False)
+        df.index = pd.RangeIndex(start, stop)
+        return df
+
+    def take(self, rows, columns=None):
+        """Materialize specific row positions for the selected columns"""
+        rows = np.asarray(rows, dtype='int64')
+        df = arrow_to_pandas(self._project(columns).take(rows), self_destruct=False)
+        df.index = pd.Index(rows)
+        return df
+
+    def sample(self, n, columns=None, seed=42):
+        """Materialize a random sample of rows, kept in file order"""
+        rng = np.random.default_rng(seed)
+        rows = np.sort(rng.choice(self.num_rows, size=min(n, self.num_rows), replace=False))
+        return self.take(rows, columns)
+
+    def delete(self):
+        """Release the memory map and remove the file"""
+        self._table = None
+        self._finalizer()
+
+def _write_batches(path, schema, batches, file, on_progress):
+    """Write record batches to an uncompressed Arrow IPC file, reporting progress"""
+    rows_written = 0
+    with pa.ipc.new_file(path, schema) as writer:
+        for batch in batches:
+            writer.write_batch(batch)
+            rows_written += batch.num_rows
+            if on_progress is not None:
+                on_progress(read_fraction(file), rows_written)
+
+def _spill_csv(file, path, on_progress):
+    """Stream a CSV upload into an Arrow IPC file block by block"""
+    read_options = pa_csv.ReadOptions(use_threads=True, block_size=ARROW_BLOCK_SIZE_MB * 1024 * 1024)
+    column_types = {}
+
+    while True:
+        file.seek(0)
+        convert_options = pa_csv.ConvertOptions(strings_can_be_null=True, column_types=column_types)
+        reader = pa_csv.open_csv(file, read_options=read_options, convert_options=convert_options)
+        try:
+            _write_batches(path, reader.schema, reader, file, on_progress)
+            return
+        except pa.ArrowInvalid as e:
+            # Types are inferred from the first block; widen a column that a later block
+            # disagrees with (integer -> float -> string) and stream the file again
+            match = CSV_COLUMN_ERROR.search(str(e))
+            if match is None:
+                raise
+            field = reader.schema.field(int(match.group(1)))
+            if field.type == pa.string():
+                raise
+            column_types[field.name] = pa.float64() if pa.types.is_integer(field.type) else pa.string()
+
+def _spill_jsonl(file, path, on_progress):
+    """Stream a JSON Lines upload into an Arrow IPC file"""
+    try:
+        reader = pa_json.open_json(file)
+        _write_batches(path, reader.schema, reader, file, on_progress)
+    except pa.ArrowInvalid:
+        # Later records disagree with the inferred schema, read them all in one pass
+        file.seek(0)
+        table = pa_json.read_json(file)
+        _write_batches(path, table.schema, table.to_batches(), file, on_progress)
+
+def _spill_parquet(file, path, on_progress):
+    """Copy a Parquet upload into an Arrow IPC file one row group batch at a time"""
+    parquet_file = pq.ParquetFile(file)
+    # Skip the index columns pandas adds when writing Parquet
+    columns = [name for name in parquet_file.schema_arrow.names if not name.startswith('__index_level_')]
+    batches = parquet_file.iter_batches(columns=columns)
+    schema = pa.schema([parquet_file.schema_arrow.field(name) for name in columns])
+    _write_batches(path, schema, batches, file, on_progress)
+
+def _spill_arrow_ipc(file, path, on_progress):
+    """Rewrite a Feather or Arrow IPC upload as an uncompressed, memory-mappable file"""
+    try:
+        reader = pa.ipc.open_file(file)
+        batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+    except pa.ArrowInvalid:
+        file.seek(0)
+        reader = pa.ipc.open_stream(file)
+        batches = reader
+    _write_batches(path, reader.schema, batches, file, on_progress)
+
+def spill_upload(file, file_extension, on_progress=None):
+    """Convert an upload to a disk-backed dataset without materializing it in memory"""
+    if not arrow_available():
+        raise RuntimeError("Disk-backed datasets require pyarrow")
+
+    spill_functions = {
+        'csv': _spill_csv,
+        'jsonl': _spill_jsonl,
+        'parquet': _spill_parquet,
+        'feather': _spill_arrow_ipc,
+        'arrow': _spill_arrow_ipc
+    }
+    if file_extension not in spill_functions:
+        raise ValueError(f"Disk-backed mode does not support .{file_extension} files")
+
+    path = os.path.join(_dataset_dir(), f"{uuid.uuid4().hex}.arrow")
+    try:
+        spill_functions[file_extension](file, path, on_progress)
+    except Exception:
+        _remove_file(path)
+        raise
+    return DiskDataset(path, getattr(file, 'name', os.path.basename(path)))
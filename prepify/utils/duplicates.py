@@ -0,0 +1,87 @@
+# ============================================
+# FILE: utils/duplicates.py (NEW)
+# ============================================
+import weakref
+import numpy as np
+import pandas as pd
+
+def _hashable_column(series):
+    """Column whose values hash alike whenever DataFrame.duplicated would call them equal"""
+    if pd.api.types.is_float_dtype(series.dtype):
+        # 0.0 and -0.0 compare equal but differ in their bits; adding 0.0 turns -0.0 into 0.0
+        return series.to_numpy(dtype=np.float64, na_value=np.nan) + 0.0
+    if series.dtype == object:
+        # Objects hash by their text, so equal values like 1 and 1.0 would differ; codes of equal values match
+        return pd.factorize(series)[0]
+    return series
+
+def row_hashes(df, subset=None):
+    """64-bit hash of every row over the given columns, or None if a column holds unhashable values"""
+    columns = df[subset] if subset else df
+    try:
+        normalized = pd.DataFrame({i: _hashable_column(series) for i, (_, series) in enumerate(columns.items())},
+                                  index=columns.index)
+        return pd.util.hash_pandas_object(normalized, index=False).to_numpy()
+    except TypeError:
+        return None
+
+class DuplicateIndex:
+    """Row hashes of a frame answering duplicate queries, carried over when rows are removed"""
+
+    def __init__(self, df, subset=None, hashes=None):
+        self.subset = list(subset) if subset else None
+        self._frame = weakref.ref(df)
+        # Equal rows always hash alike and equal hashes only mark candidates that are then compared exactly,
+        # so collisions cannot miscount
+        self.hashes = row_hashes(df, self.subset) if hashes is None else hashes
+        self._masks = {}
+        self._groups = None
+
+    def _columns(self):
+        df = self._frame()
+        return df[self.subset] if self.subset else df
+
+    def restrict(self, df):
+        """Index for a frame holding a subset of this frame's rows, without hashing them again"""
+        parent = self._frame()
+        if self.hashes is None or parent is None or not parent.index.is_unique:
+            return None
+        positions = parent.index.get_indexer(df.index)
+        if (positions < 0).any():
+            return None
+        return DuplicateIndex(df, self.subset, self.hashes[positions])
+
+    def _candidates(self):
+        """Rows whose hash occurs more than once"""
+        if 'candidates' not in self._masks:
+            self._masks['candidates'] = pd.Series(self.hashes).duplicated(keep=False).to_numpy()
+        return self._masks['candidates']
+
+    def mask(self, keep='first'):
+        """Boolean mask of duplicate rows: all but the first, all but the last, or every copy (keep=False)"""
+        if keep not in self._masks:
+            if self.hashes is None:
+                mask = self._columns().duplicated(keep=keep).to_numpy()
+            else:
+                candidates = self._candidates()
+                mask = np.zeros(len(candidates), dtype=bool)
+                if candidates.any():
+                    mask[candidates] = self._columns()[candidates].duplicated(keep=keep).to_numpy()
+            self._masks[keep] = mask
+        return self._masks[keep]
+
+    def count(self, keep='first'):
+        """Number of duplicate rows"""
+        return int(self.mask(keep).sum())
+
+    def groups(self):
+        """Rows that have duplicates, labelled with a group number and the size of their group"""
+        if self._groups is None:
+            rows = self._columns()[self.mask(keep=False)]
+            if rows.empty:
+                self._groups = rows.assign(group=pd.Series(dtype='int64'), copies=pd.Series(dtype='int64'))
+            else:
+                group = rows.groupby(list(rows.columns), dropna=False, sort=False, observed=True).ngroup()
+                copies = group.map(group.value_counts())
+                self._groups = rows.assign(group=group + 1, copies=copies).sort_values('group', kind='stable')
+        return self._groups
@@ -0,0 +1,96 @@
+# ============================================
+# FILE: utils/export_jobs.py (NEW)
+# ============================================
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from config.settings import EXPORT_CACHE_MAX_MB, EXPORT_WORKERS
+from utils.data_grid import sample_positions
+from utils.file_handlers import export_dataframe
+from utils.ingestion import IngestJob, run_job
+
+def export_key(export_format, compression=None, columns=None, sample=None):
+    """Everything an export of one dataset version depends on"""
+    return (export_format, compression, tuple(columns) if columns else None, sample)
+
+class ExportCache:
+    """Finished exports of each dataset version, least recently used evicted beyond a memory budget"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        # (id of the dataset profile, export key) -> ExportFile; entries leave with their profile
+        self._entries = OrderedDict()
+        self._profiles = set()
+        self._nbytes = 0
+        self._lock = threading.RLock()
+
+    def get(self, profile, key):
+        with self._lock:
+            export = self._entries.get((id(profile), key))
+            if export is not None:
+                self._entries.move_to_end((id(profile), key))
+            return export
+
+    def put(self, profile, key, export):
+        if export.size > self.max_bytes:
+            return
+        with self._lock:
+            if id(profile) not in self._profiles:
+                self._profiles.add(id(profile))
+                weakref.finalize(profile, self._forget, id(profile))
+            entry_key = (id(profile), key)
+            if entry_key in self._entries:
+                self._nbytes -= self._entries.pop(entry_key).size
+            self._entries[entry_key] = export
+            self._nbytes += export.size
+            # Evicted files are deleted once no session holds them any more
+            while self._nbytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._nbytes -= evicted.size
+
+    def _forget(self, profile_id):
+        with self._lock:
+            self._profiles.discard(profile_id)
+            for entry_key in [entry_key for entry_key in self._entries if entry_key[0] == profile_id]:
+                self._nbytes -= self._entries.pop(entry_key).size
+
+# Shared by every session served by this process
+export_cache = ExportCache(EXPORT_CACHE_MAX_MB * 1024**2)
+# Separate from the ingestion pool, so long exports never hold up uploads
+_executor = ThreadPoolExecutor(max_workers=EXPORT_WORKERS, thread_name_prefix='prepify-export')
+
+class ExportJob(IngestJob):
+    """Handle on an export being written in a background thread, remembering what it exports"""
+
+    def __init__(self, name, key, profile):
+        super().__init__(name)
+        self.export_key = key
+        # A weak reference, so a running or finished job does not keep an old dataset version alive
+        self.export_profile = weakref.ref(profile)
+
+def build_export(job, df, key, profile):
+    """Write the rows and columns of an export key to a file and cache it for the dataset version"""
+    export_format, compression, columns, sample = key
+    job.set_stage('Selecting rows')
+    if sample:
+        df = df.iloc[sample_positions(len(df), *sample)]
+    if columns:
+        df = df[list(columns)]
+
+    job.set_stage(f'Writing {export_format}')
+    export = export_dataframe(df, export_format, compression, on_progress=job.update)
+    export_cache.put(profile, key, export)
+    return export
+
+def submit_export(df, profile, key):
+    """Build an export on the export pool and return the job handle"""
+    job = ExportJob(f"{key[0]} export", key, profile)
+    _executor.submit(run_job, job, build_export, df, key, profile)
+    return job
+
+def finished_export(job, profile, key):
+    """File of a session's finished export job if it exported this key of this dataset version"""
+    if job is None or job.status != 'done' or job.export_key != key or job.export_profile() is not profile:
+        return None
+    return job.result
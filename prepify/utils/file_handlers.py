@@ -2,18 +2,168 @@
 # FILE: utils/file_handlers.py (Enhanced)
 # ============================================
 import io
+import gzip
+import zipfile
+import tempfile
+import threading
+from contextlib import contextmanager
+import pandas as pd
+from config.settings import EXPORT_BATCH_ROWS, EXPORT_SPOOL_MB
+
+# zstandard is optional and only needed for .zst exports
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Export format -> (file extension, MIME type)
+EXPORT_FORMATS = {
+    'CSV': ('csv', 'text/csv'),
+    'Excel': ('xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+    'JSON': ('json', 'application/json'),
+    'JSON Lines': ('jsonl', 'application/jsonl'),
+    'Parquet': ('parquet', 'application/vnd.apache.parquet'),
+    'Feather': ('feather', 'application/vnd.apache.arrow.file')
+}
+# Formats written row batch by row batch, optionally through a compressor
+TEXT_EXPORT_FORMATS = ['CSV', 'JSON', 'JSON Lines']
+# Compression of text exports -> (file extension, MIME type)
+TEXT_COMPRESSION = {
+    'gzip': ('gz', 'application/gzip'),
+    'zstd': ('zst', 'application/zstd'),
+    'zip': ('zip', 'application/zip')
+}
+
+class ExportFile:
+    """A finished export in a spooled temporary file, held in memory while small and on disk beyond that"""
+
+    def __init__(self):
+        self.file = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_MB * 1024**2)
+        # Downloads of a cached export can read it from several sessions at once
+        self._lock = threading.Lock()
+
+    @property
+    def size(self):
+        with self._lock:
+            return self.file.seek(0, io.SEEK_END)
+
+    def read_bytes(self):
+        """Contents of the export, read only when it is downloaded"""
+        with self._lock:
+            self.file.seek(0)
+            return self.file.read()
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def export_file_name(base_name, export_format, compression=None):
+    """File name of an export, e.g. data.csv.gz; a zip archive is named after the file inside it"""
+    name = f"{base_name}.{EXPORT_FORMATS[export_format][0]}"
+    if export_format not in TEXT_EXPORT_FORMATS or compression in (None, 'none'):
+        return name
+    if compression == 'zip':
+        return f"{base_name}.zip"
+    return f"{name}.{TEXT_COMPRESSION[compression][0]}"
+
+def export_mime(export_format, compression=None):
+    if export_format in TEXT_EXPORT_FORMATS and compression in TEXT_COMPRESSION:
+        return TEXT_COMPRESSION[compression][1]
+    return EXPORT_FORMATS[export_format][1]
+
+@contextmanager
+def _compressed_writer(target, compression, member_name):
+    """Binary stream writing into target through the chosen compressor"""
+    if compression in (None, 'none'):
+        yield target
+    elif compression == 'gzip':
+        with gzip.GzipFile(fileobj=target, mode='wb', compresslevel=6) as out:
+            yield out
+    elif compression == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("Writing .zst files requires the zstandard package (pip install zstandard)")
+        with zstandard.ZstdCompressor(level=3).stream_writer(target, closefd=False) as out:
+            yield out
+    elif compression == 'zip':
+        with zipfile.ZipFile(target, 'w', zipfile.ZIP_DEFLATED) as archive:
+            with archive.open(member_name, 'w', force_zip64=True) as out:
+                yield out
+    else:
+        raise ValueError(f"Unsupported compression: {compression}")
+
+def _write_text(df, out, export_format, on_progress=None):
+    """Write CSV, JSON or JSON Lines one batch of rows at a time, so only one batch is ever held as text"""
+    n_rows = len(df)
+    if export_format == 'JSON':
+        out.write(b'[')
+    # An empty frame still gets its CSV header
+    for start in range(0, max(n_rows, 1), EXPORT_BATCH_ROWS):
+        batch = df.iloc[start:start + EXPORT_BATCH_ROWS]
+        if export_format == 'CSV':
+            text = batch.to_csv(index=False, header=start == 0)
+        elif export_format == 'JSON':
+            # Records of each batch without their enclosing brackets, joined into one array
+            records = batch.to_json(orient='records')[1:-1]
+            text = (',' if start and records else '') + records
+        else:
+            text = batch.to_json(orient='records', lines=True) if len(batch) else ''
+        out.write(text.encode('utf-8'))
+        if on_progress:
+            on_progress(min(start + EXPORT_BATCH_ROWS, n_rows) / n_rows if n_rows else 1.0,
+                        min(start + EXPORT_BATCH_ROWS, n_rows))
+    if export_format == 'JSON':
+        out.write(b']')
+
+def export_dataframe(df, export_format, compression=None, on_progress=None, base_name='exported_data'):
+    """Write a DataFrame to an ExportFile; text formats stream in batches, optionally gzip, zstd or zip compressed"""
+    export = ExportFile()
+    try:
+        if export_format in TEXT_EXPORT_FORMATS:
+            member_name = export_file_name(base_name, export_format)
+            with _compressed_writer(export.file, compression, member_name) as out:
+                _write_text(df, out, export_format, on_progress)
+        else:
+            if export_format == 'Excel':
+                with pd.ExcelWriter(export.file, engine='openpyxl') as writer:
+                    df.to_excel(writer, index=False, sheet_name='Data')
+            elif export_format == 'Parquet':
+                df.to_parquet(export.file, index=False, compression=None if compression in (None, 'none') else compression)
+            else:
+                # Feather cannot store a non-default index, so write a clean RangeIndex
+                df.reset_index(drop=True).to_feather(export.file, compression=compression or 'zstd')
+            if on_progress:
+                on_progress(1.0, len(df))
+    except BaseException:
+        export.close()
+        raise
+    return export
 
 def convert_df_to_csv(df):
     """Convert DataFrame to CSV for download"""
-    return df.to_csv(index=False).encode('utf-8')
+    with export_dataframe(df, 'CSV') as export:
+        return export.read_bytes()
 
 def convert_df_to_excel(df):
     """Convert DataFrame to Excel for download"""
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df.to_excel(writer, index=False, sheet_name='Data')
-    return output.getvalue()
+    with export_dataframe(df, 'Excel') as export:
+        return export.read_bytes()
 
 def convert_df_to_json(df):
     """Convert DataFrame to JSON for download"""
-    return df.to_json(orient='records', indent=2).encode('utf-8')
\ No newline at end of file
+    with export_dataframe(df, 'JSON') as export:
+        return export.read_bytes()
+
+def convert_df_to_parquet(df, compression='snappy'):
+    """Convert DataFrame to Parquet for download"""
+    with export_dataframe(df, 'Parquet', compression) as export:
+        return export.read_bytes()
+
+def convert_df_to_feather(df, compression='zstd'):
+    """Convert DataFrame to Feather (Arrow IPC) for download"""
+    with export_dataframe(df, 'Feather', compression) as export:
+        return export.read_bytes()
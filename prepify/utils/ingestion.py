@@ -0,0 +1,235 @@
+# ============================================
+# FILE: utils/ingestion.py (NEW)
+# ============================================
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from config.settings import (INGEST_WORKERS, PARSER_ENGINE, ARROW_STRING_DTYPE,
+                             CATEGORY_MAX_RATIO, DISK_WORKING_ROWS, PREVIEW_ROWS)
+from utils.data_loader import load_upload
+from utils.data_processing import compact_dtypes, memory_report
+from utils.dataset_cache import dataset_cache, dataset_cache_key, dataset_files_key
+from utils.dataset_pool import dataset_pool
+from utils.dataset_store import spill_upload
+from utils.multi_file import parse_file_bytes, combine_frames, get_process_pool, reset_process_pool
+from utils.memory_governor import memory_governor
+
+class IngestCancelled(Exception):
+    """Raised inside a worker when the user cancels a load"""
+
+class IngestJob:
+    """Handle on a dataset load running in a background thread"""
+
+    def __init__(self, name):
+        self.name = name
+        self.status = 'queued'
+        self.stage = 'Waiting for a free worker'
+        self.progress = 0.0
+        self.rows_read = 0
+        self.preview = None
+        self.result = None
+        self.error = None
+        self.submitted_at = time.time()
+        self._cancel_event = threading.Event()
+
+    @property
+    def finished(self):
+        return self.status in ('done', 'failed', 'cancelled')
+
+    @property
+    def elapsed(self):
+        return time.time() - self.submitted_at
+
+    def cancel(self):
+        """Ask the worker to stop at its next progress update"""
+        self._cancel_event.set()
+
+    def check_cancelled(self):
+        if self._cancel_event.is_set():
+            raise IngestCancelled()
+
+    def update(self, fraction, rows_read):
+        """Progress callback handed to the loaders"""
+        self.check_cancelled()
+        self.progress = fraction
+        self.rows_read = rows_read
+
+    def set_stage(self, stage):
+        self.check_cancelled()
+        self.stage = stage
+
+    def set_preview(self, chunk):
+        self.preview = chunk.head(PREVIEW_ROWS)
+
+# Shared by all sessions so concurrent uploads cannot tie up every server thread
+_executor = ThreadPoolExecutor(max_workers=INGEST_WORKERS, thread_name_prefix='prepify-ingest')
+
+def run_job(job, work, *args, **kwargs):
+    """Run work(job, *args, **kwargs) on the current thread and record how it ended on the job"""
+    job.status = 'running'
+    try:
+        job.check_cancelled()
+        job.result = work(job, *args, **kwargs)
+        job.status = 'done'
+    except IngestCancelled:
+        job.status = 'cancelled'
+    except Exception as e:
+        job.error = e
+        job.status = 'failed'
+
+def submit_job(name, work, *args, memory=None, **kwargs):
+    """Run work(job, *args, **kwargs) on the ingestion pool and return the job handle"""
+    job = IngestJob(name)
+
+    def wait_for_memory(used_bytes, max_bytes):
+        job.set_stage(f"Waiting for server memory ({used_bytes / 1024**2:,.0f} of {max_bytes / 1024**2:,.0f} MB in use)")
+
+    def run():
+        run_job(job, work, *args, **kwargs)
+        if memory is not None and job.status != 'done':
+            memory_governor.release(memory[0])
+
+    def admit():
+        # Jobs queue for memory on their own thread, so a waiting job never holds one of the pool's workers
+        try:
+            job.set_stage('Reserving memory')
+            memory_governor.reserve(*memory, check_cancelled=job.check_cancelled, on_wait=wait_for_memory)
+        except IngestCancelled:
+            memory_governor.release(memory[0])
+            job.status = 'cancelled'
+            return
+        job.stage = 'Waiting for a free worker'
+        _executor.submit(run)
+
+    # memory is a (session usage, bytes) pair: the job waits until the server budget has room
+    if memory is None:
+        _executor.submit(run)
+    else:
+        threading.Thread(target=admit, name='prepify-admission', daemon=True).start()
+    return job
+
+def ingest_upload(job, uploaded_file, source, file_extension, load_columns=None, member=None,
+                  sheet=None, max_rows=None, row_step=1, use_disk=False, compact=False):
+    """Load an upload into a working DataFrame, using the dataset pool, cache and disk store as configured"""
+    result = {'df': None, 'dataset': None, 'dataset_ref': None, 'compaction_report': None, 'schema_report': None}
+
+    dataset_key = None
+    if use_disk:
+        # Spill the upload to a memory-mapped file and work on a window of it
+        job.set_stage('Writing dataset to disk')
+        dataset = spill_upload(source, file_extension, on_progress=job.update)
+        result['dataset'] = dataset
+        job.set_stage('Reading working set')
+        df = dataset.read(columns=load_columns, stop=DISK_WORKING_ROWS)
+    else:
+        # Reuse an earlier parse of the same bytes with the same options
+        job.set_stage('Checking for a shared copy')
+        dataset_key = dataset_cache_key(uploaded_file, {
+            'type': file_extension,
+            'member': member,
+            'sheet': sheet,
+            'columns': load_columns,
+            'max_rows': max_rows,
+            'row_step': row_step,
+            'engine': PARSER_ENGINE,
+            'arrow_strings': ARROW_STRING_DTYPE,
+            'compact': compact
+        })
+        if _share_existing(result, dataset_key):
+            return result
+
+        job.set_stage('Parsing')
+        df = load_upload(source, file_extension, load_columns, on_progress=job.update,
+                         on_preview=job.set_preview, max_rows=max_rows, row_step=row_step, sheet=sheet)
+
+    if compact:
+        job.set_stage('Optimizing memory usage')
+        compact_df = compact_dtypes(df, CATEGORY_MAX_RATIO)
+        result['compaction_report'] = memory_report(df, compact_df)
+        df = compact_df
+
+    if dataset_key is not None:
+        _share_parsed(result, dataset_key, df)
+    else:
+        result['df'] = df
+    return result
+
+def _share_existing(result, dataset_key):
+    """Use the copy another session already holds, or the cached parse, of the same dataset"""
+    ref = dataset_pool.get(dataset_key)
+    if ref is None and dataset_cache is not None:
+        cached_df = dataset_cache.get(dataset_key)
+        if cached_df is not None:
+            ref = dataset_pool.share(dataset_key, cached_df)
+    if ref is None:
+        return False
+    result['dataset_ref'] = ref
+    result['df'] = ref.df
+    return True
+
+def _share_parsed(result, dataset_key, df):
+    """Cache a freshly parsed dataset and put it in the pool for other sessions"""
+    if dataset_cache is not None:
+        dataset_cache.put(dataset_key, df)
+    # Another session may have finished parsing the same bytes first
+    result['dataset_ref'] = dataset_pool.share(dataset_key, df)
+    result['df'] = result['dataset_ref'].df
+
+def ingest_files(job, uploaded_files, source_column=None, compact=False):
+    """Parse several uploads in parallel worker processes and combine them into one dataset"""
+    result = {'df': None, 'dataset': None, 'dataset_ref': None, 'compaction_report': None, 'schema_report': None}
+    names = [uploaded_file.name for uploaded_file in uploaded_files]
+
+    job.set_stage('Checking for a shared copy')
+    dataset_key = dataset_files_key(uploaded_files, {
+        'names': names,
+        'source_column': source_column,
+        'engine': PARSER_ENGINE,
+        'arrow_strings': ARROW_STRING_DTYPE,
+        'compact': compact
+    })
+    if _share_existing(result, dataset_key):
+        return result
+
+    job.set_stage(f'Parsing {len(names)} files')
+    pool = get_process_pool()
+    # Workers get the raw bytes, the parsed frames come back pickled
+    futures = {pool.submit(parse_file_bytes, name, uploaded_file.getvalue()): i
+               for i, (name, uploaded_file) in enumerate(zip(names, uploaded_files))}
+    frames = [None] * len(names)
+    pending = set(futures)
+    try:
+        while pending:
+            # Wake up regularly so a cancel request is noticed while files are still parsing
+            done, pending = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+            for future in done:
+                i = futures[future]
+                try:
+                    frames[i] = future.result()
+                except BrokenProcessPool:
+                    reset_process_pool()
+                    raise RuntimeError("A parser process stopped unexpectedly, please try again")
+                except Exception as e:
+                    raise ValueError(f"{names[i]}: {e}") from e
+                if job.preview is None:
+                    job.set_preview(frames[i])
+            finished = [frame for frame in frames if frame is not None]
+            job.update(len(finished) / len(names), sum(len(frame) for frame in finished))
+    finally:
+        # Stop queued files from being parsed after a failure or cancel
+        for future in pending:
+            future.cancel()
+
+    job.set_stage('Combining files')
+    df, result['schema_report'] = combine_frames(names, frames, source_column)
+    frames.clear()
+
+    if compact:
+        job.set_stage('Optimizing memory usage')
+        compact_df = compact_dtypes(df, CATEGORY_MAX_RATIO)
+        result['compaction_report'] = memory_report(df, compact_df)
+        df = compact_df
+
+    _share_parsed(result, dataset_key, df)
+    return result
@@ -0,0 +1,191 @@
+# ============================================
+# FILE: utils/memory_governor.py (NEW)
+# ============================================
+import os
+import time
+import uuid
+import weakref
+import threading
+from config.settings import (SERVER_MEMORY_MAX_MB, LOAD_MEMORY_FACTOR, COMPRESSED_LOAD_FACTOR,
+                             IDLE_SESSION_SECONDS, MEMORY_WAIT_SECONDS, DISK_WORKING_ROWS, DISK_CELL_BYTES)
+from utils.dataset_history import frame_buffers
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+def process_rss():
+    """Resident memory of this server process in bytes, or None if it cannot be read"""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def estimate_load_bytes(file_size, compressed=False, fraction=1.0):
+    """Rough memory needed to parse an upload of the given size"""
+    factor = LOAD_MEMORY_FACTOR * (COMPRESSED_LOAD_FACTOR if compressed else 1)
+    return int(file_size * factor * fraction)
+
+def estimate_disk_load_bytes(file_size, n_columns, compressed=False):
+    """Rough memory held by a disk-backed load: the upload while it is written out, plus its working set"""
+    working_set = DISK_WORKING_ROWS * max(n_columns, 1) * DISK_CELL_BYTES
+    return file_size + min(working_set, estimate_load_bytes(file_size, compressed))
+
+class SessionMemory:
+    """Dataset memory held by one browser session"""
+
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.last_active = time.time()
+        self.buffers = {}
+        self.history_bytes = 0
+        self.reserved_bytes = 0
+        self.spilled_bytes = 0
+        # Set when memory runs short; the session spills its datasets at its next idle check
+        self.hibernate_requested = False
+        self._frames = ()
+        self._history = None
+
+    @property
+    def idle_seconds(self):
+        return time.time() - self.last_active
+
+    @property
+    def data_bytes(self):
+        return sum(self.buffers.values()) + self.history_bytes
+
+    def touch(self):
+        """Mark the session as active"""
+        self.last_active = time.time()
+        self.hibernate_requested = False
+
+    def hibernated(self, freed_bytes):
+        """Record that the session spilled all of its datasets"""
+        self.buffers = {}
+        self._frames = ()
+        self.history_bytes = 0
+        self.spilled_bytes += freed_bytes
+        self.hibernate_requested = False
+
+    def track(self, frames, history=None):
+        """Record the frames and undo history the session currently holds"""
+        frames = [df for df in frames if df is not None]
+        # Measuring object columns is a full scan, so only remeasure when a frame was replaced
+        if [id(df) for df in frames] != [id(ref()) for ref in self._frames]:
+            buffers = {}
+            for df in frames:
+                buffers.update(frame_buffers(df))
+            self.buffers = buffers
+            self._frames = tuple(weakref.ref(df) for df in frames)
+        self._history = weakref.ref(history) if history is not None else None
+        self.history_bytes = history.stats()['memory_bytes'] if history is not None else 0
+
+    def spill(self):
+        """Move what the session can spare to disk and return the bytes freed"""
+        history = self._history() if self._history is not None else None
+        if history is None:
+            return 0
+        before = self.history_bytes
+        history.spill()
+        self.history_bytes = history.stats()['memory_bytes']
+        freed = before - self.history_bytes
+        self.spilled_bytes += freed
+        return freed
+
+class MemoryGovernor:
+    """Process-wide account of the dataset memory held by every session, enforcing one budget"""
+
+    def __init__(self, max_bytes, idle_seconds=IDLE_SESSION_SECONDS):
+        self.max_bytes = max_bytes
+        self.idle_seconds = idle_seconds
+        # Sessions drop out of the account once Streamlit discards their session state
+        self._sessions = weakref.WeakValueDictionary()
+        self._lock = threading.RLock()
+        self.refused = 0
+
+    def register(self, session_id=None):
+        """Start accounting for a session and return its handle, to be kept in its session state"""
+        usage = SessionMemory(session_id or uuid.uuid4().hex)
+        with self._lock:
+            self._sessions[usage.session_id] = usage
+        return usage
+
+    def sessions(self):
+        with self._lock:
+            return list(self._sessions.values())
+
+    def used_bytes(self, exclude=None):
+        """Bytes held by all sessions, counting buffers shared between sessions once"""
+        buffers = {}
+        extra = 0
+        for usage in self.sessions():
+            if usage is exclude:
+                continue
+            buffers.update(usage.buffers)
+            extra += usage.history_bytes + usage.reserved_bytes
+        return sum(buffers.values()) + extra
+
+    def admit(self, nbytes):
+        """Whether a load of this size could ever fit the budget, counting the ones refused"""
+        if nbytes > self.max_bytes:
+            self.refused += 1
+            return False
+        return True
+
+    def spill_idle(self, nbytes, exclude=None):
+        """Spill the longest idle sessions until nbytes are freed, returning the bytes freed"""
+        freed = 0
+        idle = [usage for usage in self.sessions()
+                if usage is not exclude and usage.idle_seconds >= self.idle_seconds]
+        for usage in sorted(idle, key=lambda usage: usage.last_active):
+            if freed >= nbytes:
+                break
+            freed += usage.spill()
+            # The rest of its memory is released by the session itself at its next idle check
+            usage.hibernate_requested = True
+        return freed
+
+    def try_reserve(self, usage, nbytes):
+        """Reserve memory for a load if it fits the budget now"""
+        with self._lock:
+            # The session's own frames are replaced by the load
+            if self.used_bytes(exclude=usage) + nbytes > self.max_bytes:
+                return False
+            usage.reserved_bytes = nbytes
+            return True
+
+    def reserve(self, usage, nbytes, check_cancelled=None, on_wait=None):
+        """Wait until a load fits the budget, spilling idle sessions to make room"""
+        while not self.try_reserve(usage, nbytes):
+            overflow = self.used_bytes(exclude=usage) + nbytes - self.max_bytes
+            if self.spill_idle(overflow, exclude=usage) >= overflow:
+                continue
+            if on_wait is not None:
+                on_wait(self.used_bytes(exclude=usage), self.max_bytes)
+            if check_cancelled is not None:
+                check_cancelled()
+            time.sleep(MEMORY_WAIT_SECONDS)
+
+    def release(self, usage):
+        """Give back the reservation of a load that did not complete"""
+        usage.reserved_bytes = 0
+
+    def stats(self):
+        """Summary of the account for the operator panel"""
+        sessions = self.sessions()
+        return {
+            'sessions': len(sessions),
+            'used_bytes': self.used_bytes(),
+            'max_bytes': self.max_bytes,
+            'reserved_bytes': sum(usage.reserved_bytes for usage in sessions),
+            'spilled_bytes': sum(usage.spilled_bytes for usage in sessions),
+            'refused': self.refused,
+            'rss_bytes': process_rss()
+        }
+
+# Shared by every session served by this process
+memory_governor = MemoryGovernor(SERVER_MEMORY_MAX_MB * 1024 * 1024)
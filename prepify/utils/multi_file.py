@@ -0,0 +1,141 @@
+# ============================================
+# FILE: utils/multi_file.py (NEW)
+# ============================================
+import io
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from config.settings import PARSE_PROCESSES, PARSER_ENGINE, ARROW_STRING_DTYPE
+from utils.data_loader import detect_file_type, open_upload, load_upload, arrow_available
+
+class _BytesUpload(io.BytesIO):
+    """In-memory stand-in for an uploaded file inside a worker process"""
+
+    def __init__(self, data, name):
+        super().__init__(data)
+        self.name = name
+        self.size = len(data)
+
+def parse_file_bytes(name, data):
+    """Parse one uploaded file from its raw bytes (runs in a worker process)"""
+    file_extension, compression = detect_file_type(name)
+    source = open_upload(_BytesUpload(data, name), file_extension, compression)
+    return load_upload(source, file_extension)
+
+_process_pool = None
+_process_pool_lock = threading.Lock()
+
+def get_process_pool():
+    """Process pool shared by all sessions, created on first use"""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            # Spawned workers are safe to start from the multi-threaded Streamlit server
+            _process_pool = ProcessPoolExecutor(max_workers=min(PARSE_PROCESSES, os.cpu_count() or 1),
+                                                mp_context=multiprocessing.get_context('spawn'))
+        return _process_pool
+
+def reset_process_pool():
+    """Drop a broken pool so the next load starts fresh workers"""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
+
+def _time_zone(dtype):
+    """Time zone of a NumPy, pandas or Arrow timestamp dtype, None for naive timestamps"""
+    return getattr(dtype, 'tz', None) or getattr(getattr(dtype, 'pyarrow_dtype', None), 'tz', None)
+
+def _cast_column(series, dtype):
+    """Cast a column to its combined dtype, reading naive timestamps as UTC when the target has a time zone"""
+    if (isinstance(dtype, pd.DatetimeTZDtype) and pd.api.types.is_datetime64_any_dtype(series.dtype)
+            and _time_zone(series.dtype) is None):
+        series = series.dt.tz_localize('UTC')
+    return series.astype(dtype)
+
+def _common_dtype(dtypes):
+    """Pick one dtype a column can take across every file"""
+    if all(dtype == dtypes[0] for dtype in dtypes):
+        return dtypes[0]
+    if all(pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype) for dtype in dtypes):
+        return np.result_type(*[np.dtype(getattr(dtype, 'numpy_dtype', dtype)) for dtype in dtypes])
+    if all(pd.api.types.is_datetime64_any_dtype(dtype) for dtype in dtypes):
+        # Timestamps with and without a time zone only line up in UTC
+        if any(_time_zone(dtype) is not None for dtype in dtypes):
+            return pd.DatetimeTZDtype('ns', 'UTC')
+        return 'datetime64[ns]'
+    # Mixed kinds end up as text, the way a single file with mixed values would be parsed
+    if PARSER_ENGINE == 'pyarrow' and arrow_available() and ARROW_STRING_DTYPE:
+        return pd.StringDtype('pyarrow')
+    return 'object'
+
+def _target_dtypes(frames):
+    """Combined dtype of every column across the files, in order of first appearance"""
+    columns = list(dict.fromkeys(col for frame in frames for col in frame.columns))
+    targets = {}
+    for col in columns:
+        # Columns that are entirely empty in a file carry no type information
+        typed = [frame[col].dtype for frame in frames if col in frame.columns and frame[col].notna().any()]
+        present = [frame[col].dtype for frame in frames if col in frame.columns]
+        dtype = _common_dtype(typed or present)
+        # Rows from files without the column are missing, which NumPy integers and booleans cannot hold
+        if len(present) < len(frames) and isinstance(dtype, np.dtype) and dtype.kind in 'iub':
+            dtype = np.dtype('float64') if dtype.kind in 'iu' else np.dtype('object')
+        targets[col] = dtype
+    return targets
+
+def schema_report(frames, targets=None):
+    """Summarize how the columns and dtypes of several files line up"""
+    targets = targets or _target_dtypes(frames)
+    rows = []
+    for col, dtype in targets.items():
+        present = [frame[col].dtype for frame in frames if col in frame.columns]
+        types = sorted({str(present_dtype) for present_dtype in present})
+        if len(present) < len(frames):
+            status = 'Missing in some files'
+        elif len(types) > 1:
+            status = 'Types differ'
+        else:
+            status = 'OK'
+        rows.append({
+            'Column': col,
+            'Files': f"{len(present)}/{len(frames)}",
+            'Types': ', '.join(types),
+            'Combined Type': str(dtype),
+            'Status': status
+        })
+    return pd.DataFrame(rows)
+
+def combine_frames(names, frames, source_column=None):
+    """Align the columns and dtypes of several files and stack them into one dataset"""
+    targets = _target_dtypes(frames)
+    report = schema_report(frames, targets)
+
+    aligned = []
+    for frame in frames:
+        casts = [col for col in frame.columns if frame[col].dtype != targets[col]]
+        if casts:
+            # A shallow copy: with copy-on-write only the cast columns are new
+            frame = frame.copy(deep=False)
+            for col in casts:
+                frame[col] = _cast_column(frame[col], targets[col])
+        aligned.append(frame)
+
+    combined = pd.concat(aligned, ignore_index=True, copy=False)
+    aligned.clear()
+    # Columns missing from some files can come out of concat as objects; restore the agreed dtype
+    for col, dtype in targets.items():
+        if combined[col].dtype != dtype:
+            combined[col] = _cast_column(combined[col], dtype)
+
+    if source_column:
+        while source_column in combined.columns:
+            source_column = f"{source_column}_"
+        categories = names if len(set(names)) == len(names) else [f"{i + 1}: {name}" for i, name in enumerate(names)]
+        codes = np.repeat(np.arange(len(frames)), [len(frame) for frame in frames])
+        combined.insert(0, source_column, pd.Categorical.from_codes(codes, categories=categories))
+    return combined, report
@@ -0,0 +1,87 @@
+# ============================================
+# FILE: utils/operations.py (NEW)
+# ============================================
+import json
+import numpy as np
+from utils.data_processing import (convert_column_type, encode_categorical, normalize_data, standardize_data,
+                                   filter_range, filter_values, remove_outliers, cap_outliers,
+                                   replace_outliers_with_median, remove_missing_values, fill_missing_values,
+                                   remove_duplicates, clean_all)
+from utils.dataset_profile import get_profile
+
+LOG_FORMAT_VERSION = 1
+
+# Operations that only drop rows, leaving the values of the remaining rows as they were
+ROW_FILTERS = {'filter_range', 'filter_values', 'remove_outliers', 'remove_missing', 'remove_duplicates'}
+
+def scale_columns(df, columns, method):
+    """Min-max normalize or z-score standardize the given columns"""
+    if "Normalization" in method:
+        return normalize_data(df, columns)
+    return standardize_data(df, columns)
+
+# Operation name -> (function applied as function(df, **params), label template)
+OPERATIONS = {
+    'convert_type': (convert_column_type, "Convert {column} to {new_type}"),
+    'encode': (encode_categorical, "{method} of {column}"),
+    'scale': (scale_columns, "{method} of {columns}"),
+    'filter_range': (filter_range, "Filter {column} to {low} - {high}"),
+    'filter_values': (filter_values, "Filter {column} to selected values"),
+    'remove_outliers': (remove_outliers, "Remove outliers in {column} ({method})"),
+    'cap_outliers': (cap_outliers, "Cap {column} at percentiles"),
+    'replace_outliers': (replace_outliers_with_median, "Replace outliers in {column} with median ({method})"),
+    'remove_missing': (remove_missing_values, "Remove rows with missing values"),
+    'fill_missing': (fill_missing_values, "Fill missing values"),
+    'remove_duplicates': (remove_duplicates, "Remove duplicate rows"),
+    'clean_all': (clean_all, "Fill missing values and remove duplicates")
+}
+
+def make_operation(name, **params):
+    """Describe an operation as a small, JSON-serializable record"""
+    if name not in OPERATIONS:
+        raise ValueError(f"Unknown operation: {name}")
+    return {'op': name, 'params': params}
+
+def apply_operation(df, operation):
+    """Run one recorded operation on a DataFrame"""
+    function, _ = OPERATIONS[operation['op']]
+    result = function(df, **operation['params'])
+    if operation['op'] in ROW_FILTERS:
+        # The row hashes of the remaining rows are unchanged, so duplicate checks need not rehash them
+        get_profile(result).inherit_rows(get_profile(df))
+    return result
+
+def replay(df, operations):
+    """Run a sequence of recorded operations on a DataFrame"""
+    for operation in operations:
+        df = apply_operation(df, operation)
+    return df
+
+def describe_operation(operation):
+    """Human-readable label of an operation"""
+    _, template = OPERATIONS[operation['op']]
+    params = {key: ', '.join(map(str, value)) if isinstance(value, list) else value
+              for key, value in operation['params'].items()}
+    return template.format(**params)
+
+def _to_json(value):
+    """Convert NumPy scalars and other values JSON does not know"""
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+def export_log(operations):
+    """Serialize an operation log so it can be re-applied to another file"""
+    return json.dumps({'version': LOG_FORMAT_VERSION, 'operations': operations}, indent=2, default=_to_json)
+
+def load_log(text):
+    """Parse and validate an exported operation log"""
+    data = json.loads(text)
+    operations = data.get('operations') if isinstance(data, dict) else None
+    if not isinstance(operations, list):
+        raise ValueError("This file is not a PrePify operation log")
+    for operation in operations:
+        if not isinstance(operation, dict) or operation.get('op') not in OPERATIONS \
+                or not isinstance(operation.get('params'), dict):
+            raise ValueError(f"Unsupported operation in log: {operation}")
+    return operations
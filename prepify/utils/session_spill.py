@@ -0,0 +1,195 @@
+# ============================================
+# FILE: utils/session_spill.py (NEW)
+# ============================================
+import os
+import uuid
+import weakref
+import tempfile
+import pandas as pd
+from config.settings import SESSION_SPILL_DIR
+from utils.data_loader import arrow_available
+from utils.dataset_history import frame_buffers, column_view, SPILL_COMPRESSION
+from utils.dataset_pool import dataset_pool
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+# Session state keys holding DataFrames that are spilled when the session goes idle
+SESSION_FRAME_KEYS = ['original_df', 'df', 'cleaned_df']
+
+def _spill_dir():
+    """Directory holding the datasets of idle sessions"""
+    path = SESSION_SPILL_DIR or os.path.join(tempfile.gettempdir(), 'prepify_sessions')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def _remove_files(paths):
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+
+def _column_key(series):
+    """Identify a column by the buffers behind it, so columns shared between frames are written once"""
+    return (str(series.dtype), len(series), tuple(sorted(frame_buffers(series.to_frame()))), column_view(series))
+
+def _to_arrow(df):
+    """Convert a frame to an Arrow table, or None if a column has no Arrow equivalent"""
+    try:
+        return pa.Table.from_pandas(df, preserve_index=True)
+    except (pa.ArrowException, TypeError, ValueError):
+        return None
+
+def _new_path():
+    return os.path.join(_spill_dir(), f"{uuid.uuid4().hex}.spill")
+
+def _write_frame(df):
+    """Write a frame as lz4-compressed Arrow IPC, with any columns Arrow cannot hold in a compressed pickle"""
+    table = _to_arrow(df) if arrow_available() else None
+    arrow_df, pickle_df = df, df.iloc[:, :0]
+    if table is None:
+        # Object columns with mixed types have no Arrow equivalent
+        mixed = [name for name, series in df.items()
+                 if not arrow_available() or _to_arrow(series.to_frame()) is None]
+        arrow_df, pickle_df = df.drop(columns=mixed), df[mixed]
+        table = _to_arrow(arrow_df) if arrow_available() and arrow_df.shape[1] else None
+
+    parts = []
+    if table is not None:
+        path = _new_path()
+        options = pa.ipc.IpcWriteOptions(compression='lz4')
+        with pa.OSFile(path, 'wb') as sink, pa.ipc.new_file(sink, table.schema, options=options) as writer:
+            writer.write_table(table)
+        parts.append((path, 'arrow'))
+    if pickle_df.shape[1] or table is None:
+        path = _new_path()
+        pickle_df.to_pickle(path, compression=SPILL_COMPRESSION)
+        parts.append((path, 'pickle'))
+    return parts
+
+def _read_frame(path, file_format):
+    if file_format == 'arrow':
+        with pa.memory_map(path, 'r') as source:
+            return pa.ipc.open_file(source).read_all().to_pandas()
+    return pd.read_pickle(path, compression=SPILL_COMPRESSION['method'])
+
+class SpilledFrame:
+    """Lazy handle on one frame of an idle session, reloaded with the rest of the session"""
+
+    def __init__(self, frame, shared):
+        self.is_series = isinstance(frame, pd.Series)
+        df = frame.to_frame() if self.is_series else frame
+        self.name = frame.name if self.is_series else None
+        self.labels = df.columns
+        self.dtypes = list(df.dtypes)
+        # Column position -> (key, position) of the same column in a frame written earlier
+        self.shared = shared
+
+        own = [i for i in range(df.shape[1]) if i not in shared]
+        # Positional names survive the round trip whatever the original labels are
+        data = df.iloc[:, own].set_axis([str(i) for i in own], axis=1)
+        self.parts = _write_frame(data)
+        self.disk_bytes = sum(os.path.getsize(path) for path, _ in self.parts)
+        self._finalizer = weakref.finalize(self, _remove_files, [path for path, _ in self.parts])
+
+    def load(self, loaded):
+        """Read the frame back, taking shared columns from the frames already loaded"""
+        frames = [_read_frame(path, file_format) for path, file_format in self.parts]
+        data = frames[0] if len(frames) == 1 else pd.concat(frames, axis=1)
+        columns = []
+        for i, dtype in enumerate(self.dtypes):
+            if i in self.shared:
+                key, position = self.shared[i]
+                source = loaded[key]
+                values = (source.to_frame() if isinstance(source, pd.Series) else source).iloc[:, position]
+                values = values.set_axis(data.index)
+            else:
+                values = data[str(i)]
+            # Arrow brings some extension dtypes back as their closest NumPy or Python equivalent
+            if values.dtype != dtype:
+                values = values.astype(dtype)
+            columns.append(values.rename(i))
+        df = pd.concat(columns, axis=1) if columns else pd.DataFrame(index=data.index)
+        df.columns = self.labels
+        self.discard()
+        return df.iloc[:, 0].rename(self.name) if self.is_series else df
+
+    def discard(self):
+        self._finalizer()
+
+class SessionSpill:
+    """Datasets of an idle session written to local files, each shared column stored once"""
+
+    def __init__(self, frames, pool_key=None):
+        # Content key of the pooled dataset the session's original_df came from
+        self.pool_key = pool_key
+        self.entries = {}
+        written = {}
+        for key, frame in frames.items():
+            df = frame.to_frame() if isinstance(frame, pd.Series) else frame
+            shared = {}
+            for i in range(df.shape[1]):
+                column_key = _column_key(df.iloc[:, i])
+                if column_key in written:
+                    shared[i] = written[column_key]
+                else:
+                    written[column_key] = (key, i)
+            self.entries[key] = SpilledFrame(frame, shared)
+
+    @property
+    def disk_bytes(self):
+        return sum(entry.disk_bytes for entry in self.entries.values())
+
+    def load(self, preloaded=None):
+        """Read every frame back, with shared columns shared again; preloaded frames are not read"""
+        loaded = dict(preloaded or {})
+        for key, entry in self.entries.items():
+            if key in loaded:
+                entry.discard()
+            else:
+                loaded[key] = entry.load(loaded)
+        return loaded
+
+def hibernate_session(state):
+    """Spill the datasets and undo history of an idle session, leaving lazy handles in its state"""
+    frames = {key: state[key] for key in SESSION_FRAME_KEYS if isinstance(state.get(key), pd.DataFrame)}
+    history = state.get('cleaning_history')
+    held = history.hibernate() if history is not None else {}
+    frames.update({('history', key): values for key, values in held.items()})
+    if not frames:
+        return None
+
+    ref = state.get('dataset_ref')
+    try:
+        spill = SessionSpill(frames, ref.key if ref is not None else None)
+    except Exception:
+        if history is not None:
+            history.wake(held)
+        raise
+    for key in SESSION_FRAME_KEYS:
+        if key in frames:
+            state[key] = spill.entries[key]
+    state['dataset_ref'] = None
+    state['session_spill'] = spill
+    return spill
+
+def wake_session(state):
+    """Reload the datasets of a session spilled by hibernate_session()"""
+    spill = state.get('session_spill')
+    if spill is None:
+        return False
+    # A dataset other sessions still share is taken from the pool instead of read back
+    ref = dataset_pool.get(spill.pool_key) if spill.pool_key is not None else None
+    loaded = spill.load({'original_df': ref.df} if ref is not None else None)
+    if spill.pool_key is not None and ref is None:
+        ref = dataset_pool.share(spill.pool_key, loaded['original_df'])
+    state['dataset_ref'] = ref
+    for key in SESSION_FRAME_KEYS:
+        if key in loaded:
+            state[key] = loaded[key]
+    history = state.get('cleaning_history')
+    if history is not None:
+        history.wake({key[1]: values for key, values in loaded.items() if isinstance(key, tuple)})
+    state['session_spill'] = None
+    return True
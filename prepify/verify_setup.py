@@ -29,4 +29,16 @@ try:
     import openpyxl; print(f"✓ openpyxl: {openpyxl.__version__}")
 except: print("✗ openpyxl: MISSING - Run: pip install openpyxl")
 
+try:
+    import zstandard; print(f"✓ zstandard: {zstandard.__version__}")
+except: print("✗ zstandard: MISSING (optional, needed for .zst uploads and exports) - Run: pip install zstandard")
+
+try:
+    import python_calamine; print("✓ python-calamine: installed")
+except: print("✗ python-calamine: MISSING (optional, faster Excel uploads) - Run: pip install python-calamine")
+
+try:
+    import psutil; print("✓ psutil: installed")
+except: print("✗ psutil: MISSING (optional, process memory in the server memory panel) - Run: pip install psutil")
+
 print("\nAll done!")
\ No newline at end of file